@@ -1,5 +1,24 @@
 """API routes module."""
 
+from backend.api.debug import debug_router, start_loop_monitor, stop_loop_monitor
+from backend.api.health import (
+    health_router,
+    start_health_monitor,
+    stop_health_monitor,
+)
+from backend.api.responses import EncodedCache, FastJSONResponse
 from backend.api.routes import initialize_sync_service, router, shutdown_sync_service
 
-__all__ = ["router", "initialize_sync_service", "shutdown_sync_service"]
+__all__ = [
+    "router",
+    "health_router",
+    "start_health_monitor",
+    "stop_health_monitor",
+    "initialize_sync_service",
+    "shutdown_sync_service",
+    "FastJSONResponse",
+    "EncodedCache",
+    "debug_router",
+    "start_loop_monitor",
+    "stop_loop_monitor",
+]
@@ -0,0 +1,99 @@
+"""Runtime diagnostics routes."""
+
+import hmac
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from backend.api.responses import FastJSONResponse
+from backend.config import Settings, get_settings
+from backend.models import HttpPoolStats, LoopLagReport, MemoryReport
+from backend.providers import transport_stats
+from backend.services import LoopMonitor, MemoryTracer, SamplingProfiler
+from backend.services.profiling import DiffAgainst, GroupBy
+
+
+def require_debug_token(
+    x_debug_token: str = Header(default=""),
+    settings: Settings = Depends(get_settings),
+) -> None:
+    """Guard for every debug route: they expose internals or slow the process."""
+    if not settings.debug_token:
+        raise HTTPException(status_code=404, detail="Debug routes are not enabled")
+    if not hmac.compare_digest(x_debug_token.encode(), settings.debug_token.encode()):
+        raise HTTPException(status_code=401, detail="Invalid debug token")
+
+
+debug_router = APIRouter(
+    prefix="/debug",
+    tags=["debug"],
+    default_response_class=FastJSONResponse,
+    dependencies=[Depends(require_debug_token)],
+)
+
+_loop_monitor: LoopMonitor | None = None
+_profiler = SamplingProfiler()
+_memory = MemoryTracer()
+
+
+def get_loop_monitor() -> LoopMonitor:
+    global _loop_monitor
+    if _loop_monitor is None:
+        settings = get_settings()
+        _loop_monitor = LoopMonitor(
+            threshold=settings.loop_lag_threshold, strict=settings.loop_monitor_strict
+        )
+    return _loop_monitor
+
+
+async def start_loop_monitor() -> None:
+    if get_settings().loop_monitor_enabled:
+        await get_loop_monitor().start()
+
+
+async def stop_loop_monitor() -> None:
+    if _loop_monitor:
+        await _loop_monitor.stop()
+
+
+@debug_router.get("/loop", response_model=LoopLagReport)
+async def loop_lag():
+    return FastJSONResponse(get_loop_monitor().report())
+
+
+@debug_router.get("/http", response_model=list[HttpPoolStats])
+async def http_pools():
+    return FastJSONResponse(transport_stats())
+
+
+@debug_router.post("/profile", response_class=PlainTextResponse)
+async def cpu_profile(
+    seconds: float = Query(default=10.0, gt=0, le=120),
+    interval: float = Query(default=0.005, ge=0.001, le=1.0),
+    loop_only: bool = False,
+):
+    """Sample this process's stacks and return them as folded flame graph input."""
+    if _profiler.running:
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    folded, samples = await _profiler.profile(seconds, interval, loop_only)
+    return PlainTextResponse(folded, headers={"X-Profile-Samples": str(samples)})
+
+
+@debug_router.post("/memory/start", response_model=MemoryReport)
+async def memory_start(frames: int = Query(default=10, ge=1, le=100)):
+    return FastJSONResponse(await _memory.start(frames))
+
+
+@debug_router.get("/memory", response_model=MemoryReport)
+async def memory_snapshot(
+    limit: int = Query(default=25, ge=1, le=500),
+    group_by: GroupBy = "lineno",
+    diff: DiffAgainst = "",
+    include: str = "",
+):
+    if not _memory.tracing:
+        raise HTTPException(status_code=409, detail="Allocation tracing is off")
+    return FastJSONResponse(await _memory.snapshot(limit, group_by, diff, include))
+
+
+@debug_router.post("/memory/stop", response_model=MemoryReport)
+async def memory_stop():
+    return FastJSONResponse(_memory.stop())
@@ -0,0 +1,43 @@
+"""Liveness and readiness probe routes."""
+
+import pydantic_core
+from fastapi import APIRouter
+from backend.api.responses import FastJSONResponse
+from backend.api.routes import get_sync_service, get_xm_provider
+from backend.config import get_settings
+from backend.services import HealthMonitor
+
+health_router = APIRouter(tags=["health"], default_response_class=FastJSONResponse)
+
+_health_monitor: HealthMonitor | None = None
+_LIVE_BODY = pydantic_core.to_json({"status": "alive"})
+
+
+def get_health_monitor() -> HealthMonitor:
+    global _health_monitor
+    if _health_monitor is None:
+        settings = get_settings()
+        _health_monitor = HealthMonitor(
+            get_xm_provider(), get_sync_service(settings), settings
+        )
+    return _health_monitor
+
+
+async def start_health_monitor() -> None:
+    await get_health_monitor().start()
+
+
+async def stop_health_monitor() -> None:
+    if _health_monitor:
+        await _health_monitor.stop()
+
+
+@health_router.get("/livez")
+async def livez():
+    return FastJSONResponse(_LIVE_BODY)
+
+
+@health_router.get("/readyz")
+async def readyz():
+    report = get_health_monitor().report()
+    return FastJSONResponse(report, status_code=200 if report.ready else 503)
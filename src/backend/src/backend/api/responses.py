@@ -0,0 +1,37 @@
+"""Fast JSON responses built on pydantic-core serialization."""
+
+from typing import Any
+import pydantic_core
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response that serializes models straight to bytes.
+
+    Routes return this directly so FastAPI skips ``jsonable_encoder``; pydantic
+    models, datetimes and plain containers are all encoded by pydantic-core.
+    Pre-encoded ``bytes`` are passed through untouched.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return pydantic_core.to_json(content)
+
+
+class EncodedCache:
+    """Pre-encoded response body that is rebuilt only when its version changes."""
+
+    def __init__(self):
+        self._version: Any = None
+        self._body: bytes | None = None
+
+    def get(self, version: Any) -> bytes | None:
+        if self._body is not None and self._version == version:
+            return self._body
+        return None
+
+    def set(self, version: Any, content: Any) -> bytes:
+        self._body = pydantic_core.to_json(content)
+        self._version = version
+        return self._body
@@ -1,18 +1,35 @@
 """API routes for the sync service."""
 
+import hmac
 import logging
+import math
+from datetime import timezone
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from backend.api.responses import EncodedCache, FastJSONResponse
 from backend.config import Settings, get_settings
-from backend.models import SyncResult, SyncStatus
-from backend.providers import SpotifyProvider, XMRadioProvider
-from backend.services import SyncService
+from backend.models import SyncResult, SyncStatus, Track
+from backend.providers import SpotifyProvider, XMRadioProvider, close_transports
+from backend.services import (
+    IngestPipeline,
+    RemoteSyncService,
+    SyncService,
+    TenantRegistry,
+    load_tenants,
+)
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api/v1", tags=["sync"])
+router = APIRouter(
+    prefix="/api/v1", tags=["sync"], default_response_class=FastJSONResponse
+)
 
-_sync_service: SyncService | None = None
+_sync_service: SyncService | RemoteSyncService | None = None
 _xm_provider: XMRadioProvider | None = None
 _spotify_provider: SpotifyProvider | None = None
+_tenant_registry: TenantRegistry | None = None
+_ingest_pipeline: IngestPipeline | None = None
+_status_cache = EncodedCache()
+_bearer = HTTPBearer(auto_error=False)
 
 
 def get_xm_provider() -> XMRadioProvider:
@@ -31,48 +48,153 @@ def get_spotify_provider(settings: Settings | None = None) -> SpotifyProvider:
     return _spotify_provider
 
 
-def get_sync_service(settings: Settings = Depends(get_settings)) -> SyncService:
+def get_sync_service(
+    settings: Settings = Depends(get_settings),
+) -> SyncService | RemoteSyncService:
     global _sync_service
     if _sync_service is None:
-        _sync_service = SyncService(
-            get_xm_provider(), get_spotify_provider(settings), settings
-        )
+        if settings.worker_address:
+            # Syncs run in `python -m backend.worker`; this process only relays
+            _sync_service = RemoteSyncService(settings.worker_address)
+        else:
+            _sync_service = SyncService(
+                get_xm_provider(), get_spotify_provider(settings), settings
+            )
     return _sync_service
 
 
+def get_tenant_registry() -> TenantRegistry:
+    if _tenant_registry is None:
+        raise HTTPException(status_code=404, detail="Tenancy is not enabled")
+    return _tenant_registry
+
+
+def get_ingest_pipeline(
+    credentials: HTTPAuthorizationCredentials | None = Depends(_bearer),
+    settings: Settings = Depends(get_settings),
+) -> IngestPipeline:
+    if _ingest_pipeline is None or not settings.ingest_token:
+        raise HTTPException(status_code=404, detail="Ingestion is not enabled")
+    token = credentials.credentials if credentials else ""
+    if not hmac.compare_digest(token.encode(), settings.ingest_token.encode()):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid ingest token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return _ingest_pipeline
+
+
 async def initialize_sync_service() -> None:
     """Initialize sync service at startup (outside request context)."""
-    global _sync_service
     try:
         # Call get_settings() directly instead of using Depends
         settings = get_settings()
-        if _sync_service is None:
-            _sync_service = SyncService(
-                get_xm_provider(), get_spotify_provider(settings), settings
-            )
-        await _sync_service.start()
+        if not settings.worker_address:
+            await get_spotify_provider(settings).start_token_refresh()
+        await get_sync_service(settings).start()
+    except Exception as e:
+        logger.error("Failed to initialize sync service: %s", e)
+    await initialize_ingest()
+    await initialize_tenants()
+
+
+async def initialize_ingest() -> None:
+    global _ingest_pipeline
+    settings = get_settings()
+    if not settings.ingest_token:
+        return
+    _ingest_pipeline = IngestPipeline(
+        get_sync_service(settings).ingest,
+        max_queue=settings.ingest_queue_size,
+        batch_size=settings.ingest_batch_size,
+        batch_window=settings.ingest_batch_window,
+    )
+    await _ingest_pipeline.start()
+
+
+async def initialize_tenants() -> None:
+    global _tenant_registry
+    settings = get_settings()
+    if not settings.tenants_file or settings.worker_address:
+        # With a separate worker, tenants are synced there
+        return
+    try:
+        _tenant_registry = TenantRegistry(
+            load_tenants(settings.tenants_file), get_xm_provider(), settings
+        )
+        await _tenant_registry.start()
     except Exception as e:
-        logger.error(f"Failed to initialize sync service: {e}")
+        logger.error("Failed to initialize tenants: %s", e)
 
 
 async def shutdown_sync_service() -> None:
     global _sync_service, _xm_provider
+    if _ingest_pipeline:
+        await _ingest_pipeline.stop()
+    if _tenant_registry:
+        await _tenant_registry.stop()
     if _sync_service:
         await _sync_service.stop()
+    if _spotify_provider:
+        await _spotify_provider.stop_token_refresh()
     if _xm_provider:
         await _xm_provider.close()
+    await close_transports()
 
 
 @router.get("/status", response_model=SyncStatus)
-async def get_status(service: SyncService = Depends(get_sync_service)) -> SyncStatus:
-    return SyncStatus(**await service.get_status())
+async def get_status(
+    service: SyncService | RemoteSyncService = Depends(get_sync_service),
+):
+    version = service.status_version
+    body = _status_cache.get(version)
+    if body is None:
+        body = _status_cache.set(version, await service.get_status())
+    return FastJSONResponse(body)
 
 
 @router.post("/sync", response_model=SyncResult)
-async def trigger_sync(service: SyncService = Depends(get_sync_service)) -> SyncResult:
+async def trigger_sync(
+    service: SyncService | RemoteSyncService = Depends(get_sync_service),
+):
     if service.is_running:
         raise HTTPException(status_code=409, detail="Sync already in progress")
-    return SyncResult(**await service.sync())
+    result = await service.sync()
+    if "success" not in result:
+        # A scheduled run started first (possibly in the worker)
+        raise HTTPException(status_code=409, detail=result.get("error"))
+    return FastJSONResponse(SyncResult(**result))
+
+
+@router.post("/ingest/now-playing", status_code=202)
+async def ingest_now_playing(
+    events: Track | list[Track],
+    pipeline: IngestPipeline = Depends(get_ingest_pipeline),
+):
+    """Queue plays pushed by a feeder for the configured station.
+
+    Events without a timestamp are left unstamped rather than given the
+    receive time, which would move the station's ``last_seen`` past plays
+    the next poll has yet to report.
+    """
+    tracks = []
+    for track in events if isinstance(events, list) else [events]:
+        stamp = track.timestamp
+        if stamp is not None and stamp.tzinfo is None:
+            track = track.model_copy(
+                update={"timestamp": stamp.replace(tzinfo=timezone.utc)}
+            )
+        tracks.append(track)
+    if not pipeline.offer(tracks):
+        raise HTTPException(
+            status_code=429,
+            detail="Ingest queue is full",
+            headers={"Retry-After": str(math.ceil(pipeline.retry_after))},
+        )
+    return FastJSONResponse(
+        {"accepted": len(tracks), "queued": pipeline.depth}, status_code=202
+    )
 
 
 @router.get("/tracks")
@@ -85,8 +207,38 @@ async def get_xm_tracks(
     tracks = await provider.get_recent_tracks(
         station or settings.xm_station, limit=limit
     )
-    return {
-        "station": station or settings.xm_station,
-        "count": len(tracks),
-        "tracks": [t.model_dump() for t in tracks],
-    }
+    return FastJSONResponse(
+        {
+            "station": station or settings.xm_station,
+            "count": len(tracks),
+            "tracks": tracks,
+        }
+    )
+
+
+@router.get("/tenants")
+async def list_tenants(registry: TenantRegistry = Depends(get_tenant_registry)):
+    return FastJSONResponse(
+        {"tenants": registry.tenant_ids, "active": registry.active_count}
+    )
+
+
+@router.get("/tenants/{tenant_id}/status", response_model=SyncStatus)
+async def get_tenant_status(
+    tenant_id: str, registry: TenantRegistry = Depends(get_tenant_registry)
+):
+    if tenant_id not in registry:
+        raise HTTPException(status_code=404, detail="Unknown tenant")
+    return FastJSONResponse(await registry.get_status(tenant_id))
+
+
+@router.post("/tenants/{tenant_id}/sync", response_model=SyncResult)
+async def trigger_tenant_sync(
+    tenant_id: str, registry: TenantRegistry = Depends(get_tenant_registry)
+):
+    if tenant_id not in registry:
+        raise HTTPException(status_code=404, detail="Unknown tenant")
+    service = await registry.get_service(tenant_id)
+    if service.is_running:
+        raise HTTPException(status_code=409, detail="Sync already in progress")
+    return FastJSONResponse(SyncResult(**await service.sync()))
@@ -0,0 +1,165 @@
+"""Command-line tools for XM Spotify Sync.
+
+Subcommands import what they need when they run, so the CLI starts quickly
+and does not pull in the web stack.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from backend.log import configure_logging
+
+# Modules a one-shot run must never load; checked after the run
+_SERVER_MODULES = ("fastapi", "uvicorn", "apscheduler")
+
+
+def _print_progress(stats) -> None:
+    print(
+        f"\rseen {stats.seen}  cached {stats.cached}  seeded {stats.seeded}  "
+        f"resolved {stats.resolved}  missed {stats.missed}  "
+        f"errors {stats.errors}  {stats.throughput:.1f} tracks/s",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+async def _prewarm(args: argparse.Namespace) -> int:
+    from backend.config import get_settings
+    from backend.providers import SpotifyProvider, XMRadioProvider, close_transports
+    from backend.services.catalog import CatalogIndex
+    from backend.services.match_cache import MatchCache
+    from backend.services.prewarm import Prewarmer, read_track_file
+    from backend.services.resolver import TrackResolver
+
+    settings = get_settings()
+    cache = MatchCache(settings.match_cache_path, settings.match_cache_miss_ttl)
+    catalog = CatalogIndex(settings.catalog_path, settings.catalog_min_score)
+    spotify = SpotifyProvider(settings)
+    xm = XMRadioProvider()
+    prewarmer = Prewarmer(
+        TrackResolver(spotify, cache, catalog),
+        concurrency=args.concurrency,
+        rate=args.rate,
+        progress=_print_progress,
+    )
+    try:
+        for playlist_id in args.playlist:
+            await prewarmer.warm_playlist(spotify, playlist_id)
+        for path in args.file:
+            await prewarmer.run(read_track_file(path))
+        for station in args.station:
+            await prewarmer.warm_station(xm, station, args.pages, args.restart)
+    finally:
+        await xm.close()
+        await spotify.close()
+        await close_transports()
+        print(
+            f"\nDone in {prewarmer.stats.elapsed:.1f}s; "
+            f"cache holds {len(cache)} matches, catalog {len(catalog)} tracks",
+            file=sys.stderr,
+        )
+        cache.close()
+        catalog.close()
+    if not settings.match_cache_path:
+        print("MATCH_CACHE_PATH is not set; results were not kept", file=sys.stderr)
+    return 1 if prewarmer.stats.errors else 0
+
+
+async def _run_once(args: argparse.Namespace) -> int:
+    started = time.perf_counter()
+    import pydantic_core
+    from pydantic import ValidationError
+    from backend.config import get_settings
+    from backend.providers import SpotifyProvider, XMRadioProvider, close_transports
+    from backend.services.sync_service import SyncService
+
+    imported = time.perf_counter()
+    try:
+        settings = get_settings()
+    except ValidationError as e:
+        print(f"Invalid configuration: {e}", file=sys.stderr)
+        return 2
+    configure_logging(
+        settings.log_level, settings.log_format, settings.log_hot_path_rate
+    )
+
+    xm_provider = XMRadioProvider()
+    spotify_provider = SpotifyProvider(settings)
+    service = SyncService(xm_provider, spotify_provider, settings)
+    ready = time.perf_counter()
+    try:
+        result = await service.sync()
+    finally:
+        # Flushes catalog entries learned in this run, however few
+        await service.stop()
+        await xm_provider.close()
+        await spotify_provider.close()
+        await close_transports()
+    finished = time.perf_counter()
+
+    output = {
+        "result": result,
+        "timings_ms": {
+            "import": round((imported - started) * 1000, 1),
+            "setup": round((ready - imported) * 1000, 1),
+            "sync": round((finished - ready) * 1000, 1),
+            "total": round((finished - started) * 1000, 1),
+        },
+        "server_modules_loaded": [m for m in _SERVER_MODULES if m in sys.modules],
+    }
+    print(pydantic_core.to_json(output, indent=2 if args.pretty else None).decode())
+    return 0 if result.get("success") else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="xmsync", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    prewarm = commands.add_parser(
+        "prewarm", help="Resolve track lists into the match cache ahead of syncs"
+    )
+    prewarm.add_argument(
+        "--station", action="append", default=[], help="XM station slug to walk back"
+    )
+    prewarm.add_argument(
+        "--pages", type=int, default=10, help="History pages per station"
+    )
+    prewarm.add_argument(
+        "--playlist", action="append", default=[], help="Spotify playlist ID to seed"
+    )
+    prewarm.add_argument(
+        "--file",
+        action="append",
+        default=[],
+        help="CSV or JSON track list with title and artist",
+    )
+    prewarm.add_argument("--concurrency", type=int, default=8)
+    prewarm.add_argument("--rate", type=float, default=10.0, help="Searches/second")
+    prewarm.add_argument(
+        "--restart", action="store_true", help="Ignore saved station positions"
+    )
+    prewarm.set_defaults(handler=_prewarm)
+
+    run_once = commands.add_parser(
+        "run-once",
+        help="Run a single sync, print the JSON result and exit (0 on success)",
+    )
+    run_once.add_argument("--pretty", action="store_true", help="Indent the JSON")
+    run_once.set_defaults(handler=_run_once)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    configure_logging("WARNING")
+    try:
+        return asyncio.run(args.handler(args))
+    except KeyboardInterrupt:
+        print("Interrupted; rerun to resume", file=sys.stderr)
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
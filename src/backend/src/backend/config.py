@@ -16,22 +16,85 @@ class Settings(BaseSettings):
 
     app_name: str = Field(default="XM Spotify Sync")
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = Field(default="INFO")
+    log_format: Literal["text", "json"] = Field(default="text")
+    log_hot_path_rate: float = Field(default=5.0)
     debug: bool = Field(default=False)
     api_host: str = Field(default="0.0.0.0")
     api_port: int = Field(default=22112)
+    api_workers: int = Field(default=1)
 
     spotify_client_id: str = Field(..., description="Spotify OAuth Client ID")
     spotify_client_secret: str = Field(..., description="Spotify OAuth Client Secret")
     spotify_redirect_uri: str = Field(default="http://localhost:8888/callback")
     spotify_refresh_token: str = Field(default="")
     spotify_playlist_id: str = Field(..., description="Target Spotify playlist ID")
+    spotify_token_cache_path: str = Field(default="")
+    spotify_token_cache_key: str = Field(default="")
+    spotify_token_refresh_margin: int = Field(default=300)
 
     xm_station: str = Field(default="lifewithjohnmayer")
     xm_api_base_url: str = Field(default="https://xmplaylist.com/api")
+    xm_timeout: float = Field(default=10.0)
+    spotify_timeout: float = Field(default=10.0)
+    spotify_page_concurrency: int = Field(default=4)
+
+    retry_attempts: int = Field(default=3)
+    retry_base_delay: float = Field(default=0.5)
+    retry_max_delay: float = Field(default=10.0)
+    circuit_failure_threshold: int = Field(default=5)
+    circuit_reset_timeout: float = Field(default=60.0)
+    hedge_delay: float = Field(default=0.0)
+
+    http_cassette_mode: Literal["off", "record", "replay"] = Field(default="off")
+    http_cassette_path: str = Field(default="")
+    http_replay_speed: float = Field(default=1.0)
+    http2_enabled: bool = Field(default=True)
+    http_max_connections: int = Field(default=20)
+    http_max_keepalive: int = Field(default=10)
+    http_keepalive_expiry: float = Field(default=90.0)
+    dns_cache_ttl: float = Field(default=300.0)
 
     sync_interval: int = Field(default=7200)
+    sync_adaptive: bool = Field(default=False)
+    sync_min_interval: int = Field(default=300)
+    sync_max_interval: int = Field(default=7200)
+    sync_backoff_factor: float = Field(default=2.0)
+    sync_jitter: float = Field(default=0.1)
     sync_enabled: bool = Field(default=True)
     max_tracks_per_sync: int = Field(default=50)
+    sync_deadline: float = Field(default=600.0)
+    sync_journal_path: str = Field(default="")
+    match_cache_path: str = Field(default="")
+    match_cache_miss_ttl: int = Field(default=86400)
+    catalog_path: str = Field(default="")
+    catalog_min_score: float = Field(default=0.85)
+    match_revalidate_calls_per_hour: int = Field(default=20)
+    match_revalidate_interval: int = Field(default=900)
+    match_revalidate_after: int = Field(default=604800)
+    spotify_market: str = Field(default="from_token")
+    playlist_mode: Literal["mirror", "rolling"] = Field(default="mirror")
+    rolling_playlist_size: int = Field(default=200)
+
+    tenants_file: str = Field(default="")
+    tenant_max_concurrency: int = Field(default=4)
+    tenant_idle_ttl: int = Field(default=900)
+    max_active_tenants: int = Field(default=50)
+
+    worker_address: str = Field(default="")
+    state_path: str = Field(default="")
+    state_lease_ttl: float = Field(default=30.0)
+    ingest_token: str = Field(default="")
+    ingest_queue_size: int = Field(default=1000)
+    ingest_batch_size: int = Field(default=50)
+    ingest_batch_window: float = Field(default=2.0)
+
+    health_check_interval: int = Field(default=30)
+    health_check_timeout: float = Field(default=5.0)
+
+    loop_monitor_enabled: bool = Field(default=True)
+    loop_lag_threshold: float = Field(default=0.1)
+    loop_monitor_strict: bool = Field(default=False)
+    debug_token: str = Field(default="")
 
     cors_origins: list[str] = Field(default=["*"])
 
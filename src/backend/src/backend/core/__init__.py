@@ -1,5 +1,6 @@
 """Core interfaces and abstractions."""
 
+from backend.core.fairness import FairShareLimiter
 from backend.core.interfaces import (
     MusicProviderInterface,
     PlaylistManagerInterface,
@@ -7,6 +8,15 @@ from backend.core.interfaces import (
     TrackSearchInterface,
     TrackSourceInterface,
 )
+from backend.core.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceededError,
+    ResiliencePolicy,
+    deadline,
+    deadline_exceeded,
+    time_remaining,
+)
 
 __all__ = [
     "TrackSourceInterface",
@@ -14,4 +24,12 @@ __all__ = [
     "PlaylistManagerInterface",
     "MusicProviderInterface",
     "SyncServiceInterface",
+    "FairShareLimiter",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "DeadlineExceededError",
+    "ResiliencePolicy",
+    "deadline",
+    "deadline_exceeded",
+    "time_remaining",
 ]
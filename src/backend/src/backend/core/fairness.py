@@ -0,0 +1,78 @@
+"""Fair-share concurrency limiting across tenants."""
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+
+
+class FairShareLimiter:
+    """Hands out a fixed number of concurrent slots round-robin across tenants.
+
+    Each tenant queues its own waiters, and a freed slot goes to the next
+    tenant in turn rather than the next waiter overall, so a tenant with
+    hundreds of queued calls only gets every n-th slot while others wait.
+    """
+
+    def __init__(self, capacity: int):
+        self._available = max(capacity, 1)
+        self._waiters: dict[str, deque[asyncio.Future]] = {}
+        self._turns: deque[str] = deque()
+
+    @asynccontextmanager
+    async def slot(self, tenant_id: str):
+        await self._acquire(tenant_id)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def queued(self) -> dict[str, int]:
+        return {tenant: len(queue) for tenant, queue in self._waiters.items()}
+
+    async def _acquire(self, tenant_id: str) -> None:
+        if self._available > 0 and not self._turns:
+            self._available -= 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        queue = self._waiters.setdefault(tenant_id, deque())
+        if not queue:
+            self._turns.append(tenant_id)
+        queue.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted a slot just as we were cancelled; pass it on
+                self._release()
+            else:
+                self._discard(tenant_id, future)
+            raise
+
+    def _discard(self, tenant_id: str, future: asyncio.Future) -> None:
+        queue = self._waiters.get(tenant_id)
+        if queue is None:
+            return
+        try:
+            queue.remove(future)
+        except ValueError:
+            pass
+        if not queue:
+            del self._waiters[tenant_id]
+            try:
+                self._turns.remove(tenant_id)
+            except ValueError:
+                pass
+
+    def _release(self) -> None:
+        while self._turns:
+            tenant_id = self._turns.popleft()
+            queue = self._waiters[tenant_id]
+            future = queue.popleft()
+            if queue:
+                self._turns.append(tenant_id)
+            else:
+                del self._waiters[tenant_id]
+            if not future.done():
+                future.set_result(None)
+                return
+        self._available += 1
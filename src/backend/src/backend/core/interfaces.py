@@ -2,7 +2,8 @@
 
 from abc import ABC, abstractmethod
 from typing import Optional
-from backend.models.track import Track
+from backend.models.playlist import PlaylistSnapshot
+from backend.models.track import SpotifyTrack, Track
 
 
 class TrackSourceInterface(ABC):
@@ -16,6 +17,16 @@ class TrackSearchInterface(ABC):
     async def search_track(self, title: str, artist: str) -> Optional[str]:
         pass
 
+    @abstractmethod
+    async def search_tracks(self, title: str, artist: str) -> list[SpotifyTrack]:
+        pass
+
+    @abstractmethod
+    async def check_tracks(
+        self, track_ids: list[str], market: str = "from_token"
+    ) -> dict[str, Optional[str]]:
+        pass
+
 
 class PlaylistManagerInterface(ABC):
     @abstractmethod
@@ -34,6 +45,19 @@ class PlaylistManagerInterface(ABC):
     ) -> bool:
         pass
 
+    @abstractmethod
+    async def get_playlist_snapshot(self, playlist_id: str) -> PlaylistSnapshot:
+        pass
+
+    @abstractmethod
+    async def remove_playlist_positions(
+        self,
+        playlist_id: str,
+        positions: dict[str, list[int]],
+        snapshot_id: Optional[str] = None,
+    ) -> Optional[str]:
+        pass
+
 
 class MusicProviderInterface(TrackSearchInterface, PlaylistManagerInterface):
     @abstractmethod
@@ -50,6 +74,10 @@ class SyncServiceInterface(ABC):
     async def sync(self) -> dict:
         pass
 
+    @abstractmethod
+    async def ingest(self, tracks: list[Track]) -> dict:
+        pass
+
     @abstractmethod
     async def get_status(self) -> dict:
         pass
@@ -0,0 +1,241 @@
+"""Circuit breakers, retries, hedged requests and deadlines for upstream calls."""
+
+import asyncio
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling upstream while an endpoint's circuit is open."""
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when the current deadline leaves no time for another attempt."""
+
+
+@contextmanager
+def deadline(seconds: Optional[float]):
+    """Bound all resilient calls made inside the block to ``seconds`` in total.
+
+    ``None`` or a non-positive value lifts any enclosing deadline, which lets
+    must-finish work (such as writing already-resolved tracks) run to the end.
+    """
+    expires_at = time.monotonic() + seconds if seconds and seconds > 0 else None
+    token = _deadline.set(expires_at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def time_remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None if there is none."""
+    expires_at = _deadline.get()
+    return None if expires_at is None else expires_at - time.monotonic()
+
+
+def deadline_exceeded() -> bool:
+    remaining = time_remaining()
+    return remaining is not None and remaining <= 0
+
+
+class CircuitBreaker:
+    """Classic closed / open / half-open breaker for a single endpoint."""
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self._reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            # Let a single probe through; its outcome closes or re-opens
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_abandoned(self) -> None:
+        """Forget a call cancelled before it finished, without judging the endpoint.
+
+        A cancelled half-open probe must free the probe slot, or the breaker
+        would refuse every later call.
+        """
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probing = False
+        if self._opened_at is not None or self._failures >= self._failure_threshold:
+            if self._opened_at is None:
+                logger.warning("Circuit '%s' opened", self.name)
+            self._opened_at = time.monotonic()
+
+
+class ResiliencePolicy:
+    """Per-endpoint breakers plus retry, hedging and deadline handling.
+
+    ``is_failure`` decides whether an exception counts against the breaker
+    and may be retried; anything else (such as a 404) is raised straight
+    away. Non-idempotent calls are only retried when ``safe_to_retry`` says
+    the request cannot have been applied (a 429, a refused connection).
+    ``retry_after`` may extract a server-requested delay from an exception,
+    which takes precedence over the computed backoff.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 10.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 60.0,
+        hedge_delay: float = 0.0,
+        is_failure: Callable[[Exception], bool] = lambda e: True,
+        safe_to_retry: Callable[[Exception], bool] = lambda e: False,
+        retry_after: Callable[[Exception], Optional[float]] = lambda e: None,
+    ):
+        self._name = name
+        self._attempts = max(attempts, 1)
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._hedge_delay = hedge_delay
+        self._is_failure = is_failure
+        self._safe_to_retry = safe_to_retry
+        self._retry_after = retry_after
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        if endpoint not in self._breakers:
+            self._breakers[endpoint] = CircuitBreaker(
+                f"{self._name}.{endpoint}",
+                self._failure_threshold,
+                self._reset_timeout,
+            )
+        return self._breakers[endpoint]
+
+    def breaker_states(self) -> dict[str, str]:
+        return {name: b.state for name, b in self._breakers.items()}
+
+    async def call(
+        self,
+        endpoint: str,
+        fn: Callable[[], Awaitable[T]],
+        idempotent: bool = False,
+    ) -> T:
+        """Run ``fn`` under the endpoint's breaker with retries and hedging.
+
+        Only idempotent calls are hedged or retried freely. Backoff sleeps and
+        attempts are cut short by the current deadline.
+        """
+        breaker = self.breaker(endpoint)
+        for attempt in range(1, self._attempts + 1):
+            remaining = time_remaining()
+            if remaining is not None and remaining <= 0:
+                raise DeadlineExceededError(f"{breaker.name}: deadline exceeded")
+            if not breaker.allow():
+                raise CircuitOpenError(f"{breaker.name}: circuit open")
+            scope = asyncio.timeout(remaining)
+            try:
+                async with scope:
+                    if idempotent and self._hedge_delay > 0:
+                        result = await self._hedged(fn)
+                    else:
+                        result = await fn()
+            except TimeoutError as e:
+                if not scope.expired():
+                    raise
+                breaker.record_failure()
+                raise DeadlineExceededError(f"{breaker.name}: deadline exceeded") from e
+            except Exception as e:
+                if not self._is_failure(e):
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                if attempt == self._attempts or not (
+                    idempotent or self._safe_to_retry(e)
+                ):
+                    raise
+                delay = self._backoff(attempt, e)
+                remaining = time_remaining()
+                if remaining is not None and delay >= remaining:
+                    raise
+                logger.warning(
+                    "%s failed (attempt %s/%s), retrying in %.2fs: %s",
+                    breaker.name,
+                    attempt,
+                    self._attempts,
+                    delay,
+                    e,
+                )
+                await asyncio.sleep(delay)
+            except BaseException:
+                # Cancelled (or interrupted) mid-call: neither success nor failure
+                breaker.record_abandoned()
+                raise
+            else:
+                breaker.record_success()
+                return result
+        raise AssertionError("unreachable")
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        # Full jitter: uniform in [0, base * 2^(attempt-1)], capped
+        ceiling = min(self._base_delay * 2 ** (attempt - 1), self._max_delay)
+        delay = random.uniform(0, ceiling)
+        retry_after = self._retry_after(error)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def _hedged(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Start a second attempt if the first is slower than the hedge delay."""
+        tasks = [asyncio.ensure_future(fn())]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self._hedge_delay)
+            if not done:
+                tasks.append(asyncio.ensure_future(fn()))
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+            # Every attempt failed; surface the first one's error
+            return tasks[0].result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
@@ -0,0 +1,154 @@
+"""Logging setup: records are queued and written from a background thread.
+
+Callers only build a ``LogRecord`` and put it on a queue. Message
+formatting, JSON encoding and the write to stderr all happen on the
+listener thread, so a slow terminal or log collector never stalls the
+event loop. Only the standard library is used, so the CLI can configure
+logging without pulling in the web stack.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Attributes every LogRecord has; anything else came in through ``extra``
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_listener: QueueListener | None = None
+_hot_path_rate = 5.0
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with ``extra`` fields kept as keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__(TEXT_FORMAT)
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        return f"{text} ({suppressed} similar suppressed)" if suppressed else text
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Queues records as they are, leaving formatting to the listener thread.
+
+    The stock handler merges arguments into the message before queueing,
+    which is the expensive part; since the queue never leaves the process
+    the record can be passed through untouched. Arguments are therefore
+    rendered slightly later, so avoid logging objects that are mutated
+    straight afterwards.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def configure_logging(
+    level: str = "INFO", fmt: str = "text", hot_path_rate: float = 5.0
+) -> QueueListener:
+    """Route all logging through a queue to a stderr writer thread.
+
+    Safe to call again (for example once settings are loaded); the previous
+    listener is flushed and replaced.
+    """
+    global _listener, _hot_path_rate
+    _hot_path_rate = hot_path_rate
+    if _listener is not None:
+        _listener.stop()
+
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_DeferredQueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener.start()
+    return _listener
+
+
+def _stop_listener() -> None:
+    if _listener is not None:
+        _listener.stop()
+
+
+atexit.register(_stop_listener)
+
+
+class ThrottledLogger(logging.LoggerAdapter):
+    """Rate-limits each message template for per-track logs on hot paths.
+
+    Every distinct ``msg`` may be emitted ``hot_path_rate`` times per second
+    (with an equal burst); the rest are counted and the count is attached
+    to the next record that gets through as ``suppressed``. Disabled levels
+    return before any bookkeeping, so the cost stays flat as volume grows.
+    """
+
+    def __init__(self, logger: logging.Logger):
+        super().__init__(logger, {})
+        self._lock = threading.Lock()
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._suppressed: dict[str, int] = {}
+
+    def _allow(self, msg: str) -> int | None:
+        """Suppressed count to report if ``msg`` may be logged, else None."""
+        rate = _hot_path_rate
+        if rate <= 0:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(msg, (rate, now))
+            tokens = min(rate, tokens + (now - last) * rate)
+            if tokens < 1:
+                self._buckets[msg] = (tokens, now)
+                self._suppressed[msg] = self._suppressed.get(msg, 0) + 1
+                return None
+            self._buckets[msg] = (tokens - 1, now)
+            return self._suppressed.pop(msg, 0)
+
+    def log(self, level: int, msg, *args, **kwargs) -> None:
+        if not self.isEnabledFor(level):
+            return
+        suppressed = self._allow(msg)
+        if suppressed is None:
+            return
+        if suppressed:
+            kwargs["extra"] = {**kwargs.get("extra", {}), "suppressed": suppressed}
+        # Attribute the record to whoever called debug()/info(). One level
+        # skips this method; the adapter's debug()/info() frame lives in the
+        # logging module, which findCaller skips by itself
+        kwargs.setdefault("stacklevel", 2)
+        self.logger.log(level, msg, *args, **kwargs)
+
+
+def throttled(name: str) -> ThrottledLogger:
+    return ThrottledLogger(logging.getLogger(name))
@@ -2,32 +2,52 @@
 
 import logging
 from contextlib import asynccontextmanager
+import pydantic_core
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from backend.api import initialize_sync_service, router, shutdown_sync_service
+from fastapi.middleware.gzip import GZipMiddleware
+from backend.api import (
+    FastJSONResponse,
+    debug_router,
+    health_router,
+    initialize_sync_service,
+    router,
+    shutdown_sync_service,
+    start_health_monitor,
+    start_loop_monitor,
+    stop_health_monitor,
+    stop_loop_monitor,
+)
 from backend.config import get_settings
+from backend.log import configure_logging
 
 settings = get_settings()
-logging.basicConfig(
-    level=getattr(logging, settings.log_level),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+configure_logging(settings.log_level, settings.log_format, settings.log_hot_path_rate)
 logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting XM Spotify Sync service...")
+    await start_loop_monitor()
     try:
         await initialize_sync_service()
     except Exception as e:
-        logger.error(f"Failed to start sync service: {e}")
+        logger.error("Failed to start sync service: %s", e)
+    await start_health_monitor()
     yield
+    await stop_health_monitor()
     await shutdown_sync_service()
+    await stop_loop_monitor()
 
 
-app = FastAPI(title=settings.app_name, version="0.1.0", lifespan=lifespan)
+app = FastAPI(
+    title=settings.app_name,
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
@@ -35,26 +55,44 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Track lists and debug reports compress well for the frontend proxy
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 app.include_router(router)
+app.include_router(health_router)
+app.include_router(debug_router)
+
+# These payloads never change for the lifetime of the process
+_ROOT_BODY = pydantic_core.to_json(
+    {"name": settings.app_name, "version": "0.1.0", "docs": "/docs"}
+)
+_HEALTH_BODY = pydantic_core.to_json({"status": "healthy"})
 
 
 @app.get("/")
 async def root():
-    return {"name": settings.app_name, "version": "0.1.0", "docs": "/docs"}
+    return FastJSONResponse(_ROOT_BODY)
 
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
+    return FastJSONResponse(_HEALTH_BODY)
 
 
 def main():
+    if settings.api_workers > 1 and not (
+        settings.state_path or settings.worker_address
+    ):
+        # Each worker would otherwise keep its own status and run its own syncs
+        raise SystemExit("API_WORKERS > 1 needs STATE_PATH or WORKER_ADDRESS set")
     uvicorn.run(
         "backend.main:app",
         host=settings.api_host,
         port=settings.api_port,
         reload=settings.debug,
+        workers=settings.api_workers,
         log_level=settings.log_level.lower(),
+        # Keep uvicorn's loggers on the queue handler configured above
+        log_config=None,
     )
 
 
@@ -1,5 +1,33 @@
 """Data models."""
 
+from backend.models.diagnostics import (
+    BlockingCall,
+    HttpPoolStats,
+    LoopLagReport,
+    LoopStall,
+    MemoryReport,
+    MemoryStat,
+)
+from backend.models.health import DependencyCheck, ReadinessReport
+from backend.models.playlist import PlaylistSnapshot, PlaylistWrite, SyncPlan
+from backend.models.tenant import TenantConfig
 from backend.models.track import SpotifyTrack, SyncResult, SyncStatus, Track
 
-__all__ = ["Track", "SpotifyTrack", "SyncResult", "SyncStatus"]
+__all__ = [
+    "Track",
+    "SpotifyTrack",
+    "SyncResult",
+    "SyncStatus",
+    "DependencyCheck",
+    "ReadinessReport",
+    "PlaylistSnapshot",
+    "TenantConfig",
+    "LoopStall",
+    "BlockingCall",
+    "LoopLagReport",
+    "HttpPoolStats",
+    "MemoryStat",
+    "MemoryReport",
+    "PlaylistWrite",
+    "SyncPlan",
+]
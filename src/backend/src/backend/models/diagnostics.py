@@ -0,0 +1,60 @@
+"""Runtime diagnostics data models."""
+
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class LoopStall(BaseModel):
+    started_at: datetime
+    duration: float
+    task: Optional[str] = None
+    stack: list[str] = Field(default_factory=list)
+
+
+class BlockingCall(BaseModel):
+    at: datetime
+    event: str
+    detail: str
+    stack: list[str] = Field(default_factory=list)
+
+
+class LoopLagReport(BaseModel):
+    running: bool = False
+    samples: int = 0
+    p50: float = 0.0
+    p90: float = 0.0
+    p99: float = 0.0
+    max: float = 0.0
+    threshold: float = 0.0
+    strict: bool = False
+    stalls: list[LoopStall] = Field(default_factory=list)
+    blocking_calls: list[BlockingCall] = Field(default_factory=list)
+
+
+class HttpPoolStats(BaseModel):
+    host: str
+    requests: int = 0
+    connections: int = 0
+    reuse_ratio: float = 0.0
+    http2_requests: int = 0
+    dns_hits: int = 0
+    dns_misses: int = 0
+
+
+class MemoryStat(BaseModel):
+    location: str
+    size: int
+    count: int
+    size_diff: int = 0
+    count_diff: int = 0
+    traceback: list[str] = Field(default_factory=list)
+
+
+class MemoryReport(BaseModel):
+    tracing: bool = False
+    frames: int = 0
+    current: int = 0
+    peak: int = 0
+    compared_to: Optional[str] = None
+    stats: list[MemoryStat] = Field(default_factory=list)
@@ -0,0 +1,22 @@
+"""Health check data models."""
+
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class DependencyCheck(BaseModel):
+    name: str
+    healthy: bool = False
+    critical: bool = Field(
+        default=True, description="False for upstreams, which do not gate readiness"
+    )
+    detail: Optional[str] = None
+    checked_at: Optional[datetime] = None
+
+
+class ReadinessReport(BaseModel):
+    ready: bool = False
+    stale: bool = True
+    age_seconds: Optional[float] = None
+    checks: list[DependencyCheck] = Field(default_factory=list)
@@ -0,0 +1,29 @@
+"""Playlist data models."""
+
+from datetime import datetime
+from typing import Literal, Optional
+from pydantic import BaseModel, Field
+
+
+class PlaylistSnapshot(BaseModel):
+    snapshot_id: Optional[str] = None
+    track_ids: list[Optional[str]] = Field(
+        default_factory=list, description="Track IDs by position; None for local files"
+    )
+
+
+class PlaylistWrite(BaseModel):
+    """One playlist change, sized to a single Spotify request where possible."""
+
+    kind: Literal["add", "remove", "remove_positions"]
+    track_ids: list[str] = Field(default_factory=list)
+    positions: dict[str, list[int]] = Field(default_factory=dict)
+    snapshot_id: Optional[str] = None
+
+
+class SyncPlan(BaseModel):
+    """The playlist writes one sync decided on, after all tracks were resolved."""
+
+    playlist_id: str
+    created_at: datetime
+    writes: list[PlaylistWrite] = Field(default_factory=list)
@@ -0,0 +1,12 @@
+"""Tenant data models."""
+
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class TenantConfig(BaseModel):
+    id: str = Field(..., description="Tenant identifier used in API paths")
+    spotify_refresh_token: str
+    spotify_playlist_id: str
+    xm_station: Optional[str] = None
+    sync_interval: Optional[int] = None
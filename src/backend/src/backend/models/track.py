@@ -11,6 +11,7 @@ class Track(BaseModel):
     timestamp: Optional[datetime] = Field(None)
     source_id: Optional[str] = Field(None)
     album: Optional[str] = None
+    duration_ms: Optional[int] = None
 
     @property
     def primary_artist(self) -> str:
@@ -28,6 +29,8 @@ class SpotifyTrack(BaseModel):
     track: Track
     spotify_id: str
     spotify_uri: str
+    duration_ms: Optional[int] = None
+    popularity: Optional[int] = None
 
 
 class SyncResult(BaseModel):
@@ -37,6 +40,7 @@ class SyncResult(BaseModel):
     tracks_matched: int = 0
     tracks_added: int = 0
     tracks_skipped: int = 0
+    tracks_dropped: int = 0
     tracks_failed: list[str] = Field(default_factory=list)
     error: Optional[str] = None
 
@@ -1,6 +1,7 @@
 """Music providers."""
 
 from backend.providers.spotify import SpotifyProvider
+from backend.providers.transport import close_transports, transport_stats
 from backend.providers.xm_radio import XMRadioProvider
 
-__all__ = ["XMRadioProvider", "SpotifyProvider"]
+__all__ = ["XMRadioProvider", "SpotifyProvider", "close_transports", "transport_stats"]
@@ -0,0 +1,260 @@
+"""Record and replay upstream HTTP traffic for deterministic test runs.
+
+In ``record`` mode every XM and Spotify exchange is appended to a JSON-lines
+cassette together with its latency. In ``replay`` mode the same providers
+are served from the cassette instead of the network, optionally sleeping
+for the recorded latency scaled by ``http_replay_speed``. Credentials never
+reach the cassette: request headers and bodies are not stored, and token
+values in responses are redacted.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from urllib.parse import urlsplit, urlencode, parse_qsl
+import httpx
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from backend.config import Settings
+
+logger = logging.getLogger(__name__)
+
+_REDACTED_FIELDS = {"access_token", "refresh_token", "id_token"}
+# Bodies are stored decoded, so these no longer describe them
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode for a request the cassette has no answer for."""
+
+
+def _key(method: str, url: str) -> str:
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {parts.netloc}{parts.path}?{query}"
+
+
+def _redact(body: bytes) -> bytes:
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return body
+    if not isinstance(data, dict) or not _REDACTED_FIELDS & data.keys():
+        return body
+    for field in _REDACTED_FIELDS & data.keys():
+        data[field] = "REDACTED"
+    return json.dumps(data).encode()
+
+
+class Cassette:
+    """A JSON-lines file of recorded exchanges, matched by method and URL.
+
+    Repeated requests for the same URL replay their recorded responses in
+    order, so a poll that returned different pages over time replays the
+    same sequence.
+    """
+
+    def __init__(self, path: str, mode: str):
+        self._path = Path(path)
+        self._mode = mode
+        self._lock = threading.Lock()
+        self._entries: dict[str, deque[dict]] = defaultdict(deque)
+        if mode == "replay":
+            with self._path.open() as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]].append(entry)
+            logger.info("Loaded %s exchanges", sum(map(len, self._entries.values())))
+        else:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        headers: dict[str, str],
+        body: bytes,
+        elapsed: float,
+    ) -> None:
+        body = _redact(body)
+        try:
+            content, encoding = body.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            content, encoding = base64.b64encode(body).decode(), "base64"
+        entry = {
+            "key": _key(method, url),
+            "method": method.upper(),
+            "url": url,
+            "status": status,
+            "headers": {
+                k: v for k, v in headers.items() if k.lower() not in _DROPPED_HEADERS
+            },
+            "body": content,
+            "encoding": encoding,
+            "elapsed": round(elapsed, 6),
+        }
+        line = json.dumps(entry) + "\n"
+        with self._lock, self._path.open("a") as f:
+            f.write(line)
+
+    def play(self, method: str, url: str) -> tuple[dict, bytes]:
+        """Pop the next recorded response for a request."""
+        key = _key(method, url)
+        with self._lock:
+            queue = self._entries.get(key)
+            if not queue:
+                raise CassetteMissError(f"No recorded response for {key}")
+            entry = queue.popleft()
+        if entry["encoding"] == "base64":
+            body = base64.b64decode(entry["body"])
+        else:
+            body = entry["body"].encode("utf-8")
+        return entry, body
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, cassette: Cassette, wrapped: httpx.AsyncBaseTransport):
+        self._cassette = cassette
+        self._wrapped = wrapped
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self._wrapped.handle_async_request(request)
+        body = await response.aread()
+        elapsed = time.perf_counter() - started
+        await response.aclose()
+        headers = {
+            k: v
+            for k, v in response.headers.items()
+            if k.lower() not in _DROPPED_HEADERS
+        }
+        self._cassette.record(
+            request.method,
+            str(request.url),
+            response.status_code,
+            headers,
+            body,
+            elapsed,
+        )
+        return httpx.Response(
+            response.status_code, headers=headers, content=body, request=request
+        )
+
+    async def aclose(self) -> None:
+        await self._wrapped.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    def __init__(self, cassette: Cassette, speed: float = 1.0):
+        self._cassette = cassette
+        self._speed = speed
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        entry, body = self._cassette.play(request.method, str(request.url))
+        if self._speed > 0:
+            await asyncio.sleep(entry["elapsed"] / self._speed)
+        return httpx.Response(
+            entry["status"], headers=entry["headers"], content=body, request=request
+        )
+
+
+class RecordingAdapter(BaseAdapter):
+    def __init__(self, cassette: Cassette, wrapped: BaseAdapter):
+        super().__init__()
+        self._cassette = cassette
+        self._wrapped = wrapped
+
+    def send(self, request, **kwargs) -> requests.Response:
+        started = time.perf_counter()
+        response = self._wrapped.send(request, **kwargs)
+        body = response.content
+        self._cassette.record(
+            request.method,
+            request.url,
+            response.status_code,
+            dict(response.headers),
+            body,
+            time.perf_counter() - started,
+        )
+        return response
+
+    def close(self) -> None:
+        self._wrapped.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    def __init__(self, cassette: Cassette, speed: float = 1.0):
+        super().__init__()
+        self._cassette = cassette
+        self._speed = speed
+
+    def send(self, request, **kwargs) -> requests.Response:
+        entry, body = self._cassette.play(request.method, request.url)
+        if self._speed > 0:
+            time.sleep(entry["elapsed"] / self._speed)
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body
+        response.url = request.url
+        response.request = request
+        response.reason = httpx.codes.get_reason_phrase(entry["status"])
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+_cassettes: dict[str, Cassette] = {}
+_cassettes_lock = threading.Lock()
+
+
+def get_cassette(settings: Settings) -> Cassette | None:
+    """The process-wide cassette for the configured mode, or None when off."""
+    if settings.http_cassette_mode == "off":
+        return None
+    if not settings.http_cassette_path:
+        raise ValueError("HTTP_CASSETTE_PATH is required to record or replay")
+    with _cassettes_lock:
+        if settings.http_cassette_path not in _cassettes:
+            _cassettes[settings.http_cassette_path] = Cassette(
+                settings.http_cassette_path, settings.http_cassette_mode
+            )
+            logger.info(
+                "HTTP cassette %s: %s",
+                settings.http_cassette_mode,
+                settings.http_cassette_path,
+            )
+        return _cassettes[settings.http_cassette_path]
+
+
+def wrap_async_transport(
+    settings: Settings, network: httpx.AsyncBaseTransport
+) -> httpx.AsyncBaseTransport:
+    """Put the cassette, if any, in front of an httpx network transport."""
+    cassette = get_cassette(settings)
+    if cassette is None:
+        return network
+    if settings.http_cassette_mode == "replay":
+        return ReplayTransport(cassette, settings.http_replay_speed)
+    return RecordingTransport(cassette, network)
+
+
+def wrap_adapter(settings: Settings, network: BaseAdapter) -> BaseAdapter:
+    """Put the cassette, if any, in front of a ``requests`` network adapter."""
+    cassette = get_cassette(settings)
+    if cassette is None:
+        return network
+    if settings.http_cassette_mode == "replay":
+        return ReplayAdapter(cassette, settings.http_replay_speed)
+    return RecordingAdapter(cassette, network)
@@ -1,74 +1,178 @@
 """Spotify music provider with proper token refresh using spotipy's cache system."""
 
-import json
+import asyncio
 import logging
-import os
-from typing import Optional
+import time
+from collections import deque
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Callable, Optional
+import requests
 import spotipy
+import urllib3
 from spotipy.oauth2 import SpotifyOAuth
-from spotipy.cache_handler import CacheHandler
 from backend.config import Settings, get_settings
+from backend.core.fairness import FairShareLimiter
 from backend.core.interfaces import MusicProviderInterface
+from backend.core.resilience import ResiliencePolicy
+from backend.log import throttled
+from backend.models import PlaylistSnapshot, SpotifyTrack, Track
+from backend.providers.transport import requests_session
+from backend.providers.token_store import (
+    EncryptedFileCacheHandler,
+    MemoryCacheHandler,
+    token_cache_keys,
+)
 
 logger = logging.getLogger(__name__)
+# Per-track messages, rate-limited so volume does not scale log cost
+hot_logger = throttled(__name__)
 
+# Largest page the playlist items endpoint returns
+PAGE_SIZE = 100
 
-class MemoryCacheHandler(CacheHandler):
-    """
-    A cache handler that stores token info in memory and handles refresh tokens properly.
 
-    This solves the token expiration issue by:
-    1. Starting with the refresh_token from environment
-    2. Letting spotipy manage token refresh automatically
-    3. Keeping the token_info in memory (refreshed as needed)
+def _is_failure(error: Exception) -> bool:
+    """Server-side and transport errors count against the circuit; 4xx do not."""
+    if isinstance(error, spotipy.SpotifyException):
+        return error.http_status == 429 or error.http_status >= 500
+    return isinstance(error, requests.exceptions.RequestException)
+
+
+def _connect_failed(error: BaseException) -> bool:
+    """Whether ``error`` came from opening the connection, before any request."""
+    seen: BaseException | None = error
+    for _ in range(8):
+        if seen is None:
+            return False
+        # NewConnectionError (refused, unresolvable) is a ConnectTimeoutError too
+        if isinstance(
+            seen,
+            (
+                requests.exceptions.ConnectTimeout,
+                urllib3.exceptions.ConnectTimeoutError,
+            ),
+        ):
+            return True
+        if isinstance(seen, urllib3.exceptions.MaxRetryError):
+            seen = seen.reason
+        elif seen.args and isinstance(seen.args[0], BaseException):
+            # requests wraps the urllib3 error as its first argument
+            seen = seen.args[0]
+        else:
+            seen = seen.__cause__ or seen.__context__
+    return False
+
+
+def _safe_to_retry(error: Exception) -> bool:
+    """Errors after which a write is known not to have been applied.
+
+    Only a 429, a 503 that names a Retry-After, or a failure to connect
+    qualify. A connection reset or dropped after the request was sent
+    (``ProtocolError``, ``RemoteDisconnected``) may follow an applied write,
+    so retrying it could add tracks twice.
     """
+    if isinstance(error, spotipy.SpotifyException):
+        if error.http_status == 503:
+            return _retry_after(error) is not None
+        return error.http_status == 429
+    return isinstance(error, requests.exceptions.ConnectionError) and _connect_failed(
+        error
+    )
 
-    def __init__(self, initial_refresh_token: str, client_id: str, client_secret: str):
-        self.token_info = None
-        self.initial_refresh_token = initial_refresh_token
-        self.client_id = client_id
-        self.client_secret = client_secret
-
-    def get_cached_token(self):
-        """Return the cached token info, or create initial token from refresh token."""
-        if self.token_info is None and self.initial_refresh_token:
-            # Bootstrap: Create initial token_info structure from refresh token
-            # spotipy will automatically refresh this when needed
-            logger.info("Bootstrapping token from refresh token...")
-            self.token_info = {
-                "refresh_token": self.initial_refresh_token,
-                "access_token": None,  # Will be populated on first refresh
-                "expires_at": 0,  # Force immediate refresh
-                "token_type": "Bearer",
-                "scope": "playlist-read-private playlist-modify-private playlist-modify-public",
-            }
-        return self.token_info
-
-    def save_token_to_cache(self, token_info):
-        """Save the refreshed token info."""
-        logger.debug(
-            f"Saving refreshed token, expires_at: {token_info.get('expires_at')}"
-        )
-        self.token_info = token_info
-        # Keep the original refresh token if the new one isn't provided
-        if not token_info.get("refresh_token") and self.initial_refresh_token:
-            self.token_info["refresh_token"] = self.initial_refresh_token
+
+def _retry_after(error: Exception) -> float | None:
+    if isinstance(error, spotipy.SpotifyException) and error.headers:
+        try:
+            return float(error.headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def _track_ids(items: list[dict]) -> list[str]:
+    """IDs of the real tracks on a page, skipping local files and removed items."""
+    return [
+        track["id"]
+        for item in items
+        if (track := item.get("track")) and track.get("id")
+    ]
+
+
+def _spotify_track(item: dict) -> SpotifyTrack:
+    return SpotifyTrack(
+        track=Track(
+            title=item["name"],
+            artists=[a["name"] for a in item.get("artists", [])],
+            album=(item.get("album") or {}).get("name"),
+        ),
+        spotify_id=item["id"],
+        spotify_uri=item["uri"],
+        duration_ms=item.get("duration_ms"),
+        popularity=item.get("popularity"),
+    )
 
 
 class SpotifyProvider(MusicProviderInterface):
-    def __init__(self, settings: Settings | None = None):
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        limiter: FairShareLimiter | None = None,
+        tenant_id: str = "default",
+    ):
         self._settings = settings or get_settings()
+        self._limiter = limiter
+        self._tenant_id = tenant_id
+        self._page_concurrency = max(self._settings.spotify_page_concurrency, 1)
         self._client: spotipy.Spotify | None = None
         self._auth_manager: SpotifyOAuth | None = None
+        self._session: requests.Session | None = None
+        self._refresh_task: asyncio.Task | None = None
+        self._resilience = ResiliencePolicy(
+            "spotify",
+            attempts=self._settings.retry_attempts,
+            base_delay=self._settings.retry_base_delay,
+            max_delay=self._settings.retry_max_delay,
+            failure_threshold=self._settings.circuit_failure_threshold,
+            reset_timeout=self._settings.circuit_reset_timeout,
+            hedge_delay=self._settings.hedge_delay,
+            is_failure=_is_failure,
+            safe_to_retry=_safe_to_retry,
+            retry_after=_retry_after,
+        )
+
+    def _build_cache_handler(self) -> MemoryCacheHandler:
+        settings = self._settings
+        if not settings.spotify_token_cache_path:
+            return MemoryCacheHandler(
+                initial_refresh_token=settings.spotify_refresh_token,
+                client_id=settings.spotify_client_id,
+                client_secret=settings.spotify_client_secret,
+            )
+        if settings.spotify_token_cache_key:
+            keys = [settings.spotify_token_cache_key.encode()]
+        else:
+            keys = token_cache_keys(
+                settings.spotify_client_secret,
+                f"{settings.spotify_token_cache_path}.salt",
+            )
+        return EncryptedFileCacheHandler(
+            path=settings.spotify_token_cache_path,
+            keys=keys,
+            initial_refresh_token=settings.spotify_refresh_token,
+            client_id=settings.spotify_client_id,
+            client_secret=settings.spotify_client_secret,
+        )
+
+    def _get_session(self) -> requests.Session:
+        # One pooled session per process for the API and the OAuth manager
+        if self._session is None:
+            self._session = requests_session("spotify", self._settings)
+        return self._session
 
     def _get_auth_manager(self) -> SpotifyOAuth:
         if self._auth_manager is None:
             # Use our custom cache handler that properly manages the refresh token
-            cache_handler = MemoryCacheHandler(
-                initial_refresh_token=self._settings.spotify_refresh_token,
-                client_id=self._settings.spotify_client_id,
-                client_secret=self._settings.spotify_client_secret,
-            )
+            cache_handler = self._build_cache_handler()
 
             self._auth_manager = SpotifyOAuth(
                 client_id=self._settings.spotify_client_id,
@@ -77,81 +181,277 @@ class SpotifyProvider(MusicProviderInterface):
                 scope=" ".join(self._settings.spotify_scopes),
                 open_browser=False,
                 cache_handler=cache_handler,
+                requests_session=self._get_session(),
             )
         return self._auth_manager
 
     def _get_client(self) -> spotipy.Spotify:
-        """Get Spotify client - spotipy handles token refresh automatically with auth_manager."""
+        """Get the Spotify client; its auth_manager refreshes the token as needed."""
         if self._client is None:
             auth_manager = self._get_auth_manager()
-            # Using auth_manager instead of auth= lets spotipy handle refresh automatically
-            self._client = spotipy.Spotify(auth_manager=auth_manager)
+            # Using auth_manager instead of auth= lets spotipy handle refresh
+            # automatically.
+            # Retries are left to the resilience policy so they respect breakers.
+            self._client = spotipy.Spotify(
+                auth_manager=auth_manager,
+                requests_session=self._get_session(),
+                requests_timeout=self._settings.spotify_timeout,
+                retries=0,
+                status_retries=0,
+            )
         return self._client
 
+    async def _call(
+        self,
+        endpoint: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        idempotent: bool = True,
+        **kwargs: Any,
+    ) -> Any:
+        """Run a blocking spotipy call in a thread under the resilience policy.
+
+        With a shared limiter each attempt first waits for this tenant's turn.
+        """
+
+        async def attempt() -> Any:
+            if self._limiter is None:
+                return await asyncio.to_thread(fn, *args, **kwargs)
+            async with self._limiter.slot(self._tenant_id):
+                return await asyncio.to_thread(fn, *args, **kwargs)
+
+        return await self._resilience.call(endpoint, attempt, idempotent=idempotent)
+
+    async def close(self) -> None:
+        """Stop background work; the shared connection pool stays open."""
+        await self.stop_token_refresh()
+        self._client = None
+
+    @property
+    def resilience(self) -> ResiliencePolicy:
+        return self._resilience
+
     async def authenticate(self) -> bool:
         try:
             client = self._get_client()
-            user = client.current_user()
-            logger.info(f"Authenticated as: {user.get('display_name', user['id'])}")
+            user = await self._call("me", client.current_user)
+            logger.info("Authenticated as: %s", user.get("display_name", user["id"]))
             return True
         except Exception as e:
-            logger.error(f"Spotify auth failed: {e}")
+            logger.error("Spotify auth failed: %s", e)
             return False
 
     def is_authenticated(self) -> bool:
+        """Whether a valid access token is cached; makes no network call."""
         try:
-            client = self._get_client()
-            client.current_user()
-            return True
+            token_info = self._get_auth_manager().cache_handler.get_cached_token()
         except Exception:
             return False
+        return bool(
+            token_info
+            and token_info.get("access_token")
+            and token_info.get("expires_at", 0) > time.time()
+        )
 
-    async def search_track(self, title: str, artist: str) -> Optional[str]:
+    def refresh_token_if_needed(self) -> float | None:
+        """Refresh the access token if it expires within the refresh margin.
+
+        Returns the token's expiry timestamp, or None if there is no token to
+        refresh. Blocking; run it off the event loop.
+        """
+        auth_manager = self._get_auth_manager()
+        cache_handler = auth_manager.cache_handler
+        margin = self._settings.spotify_token_refresh_margin
+        with cache_handler.locked():
+            token_info = cache_handler.get_cached_token()
+            if not token_info or not token_info.get("refresh_token"):
+                return None
+            if token_info["expires_at"] - time.time() > margin:
+                return token_info["expires_at"]
+            logger.info("Refreshing Spotify access token ahead of expiry")
+            token_info = auth_manager.refresh_access_token(token_info["refresh_token"])
+            return token_info["expires_at"]
+
+    async def start_token_refresh(self) -> None:
+        """Start the background task that keeps the access token fresh."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._token_refresh_loop())
+
+    async def stop_token_refresh(self) -> None:
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+        self._refresh_task = None
+
+    async def _token_refresh_loop(self) -> None:
+        margin = self._settings.spotify_token_refresh_margin
+        while True:
+            try:
+                expires_at = await asyncio.to_thread(self.refresh_token_if_needed)
+            except Exception as e:
+                logger.error("Background token refresh failed: %s", e)
+                await asyncio.sleep(60)
+                continue
+            if expires_at is None:
+                logger.info("No Spotify refresh token configured; refresher idle")
+                return
+            # Wake up just inside the margin, and never spin on a short-lived token
+            await asyncio.sleep(max(expires_at - margin - time.time() + 1, 30))
+
+    async def search_tracks(self, title: str, artist: str) -> list[SpotifyTrack]:
+        """Best candidates for a play, most relevant first."""
         client = self._get_client()
         query = f"track:{title} artist:{artist}"
         try:
-            results = client.search(q=query, type="track", limit=5)
+            results = await self._call(
+                "search", client.search, q=query, type="track", limit=5
+            )
             tracks = results.get("tracks", {}).get("items", [])
             if not tracks:
                 # Try a more lenient search
                 query = f"{title} {artist}"
-                results = client.search(q=query, type="track", limit=5)
+                results = await self._call(
+                    "search", client.search, q=query, type="track", limit=5
+                )
                 tracks = results.get("tracks", {}).get("items", [])
             if tracks:
-                logger.debug(
-                    f"Found track: {tracks[0]['name']} by {tracks[0]['artists'][0]['name']}"
+                hot_logger.debug(
+                    "Found track: %s by %s",
+                    tracks[0]["name"],
+                    tracks[0]["artists"][0]["name"],
                 )
-                return tracks[0]["id"]
-            logger.debug(f"No match found for: {title} - {artist}")
-            return None
+            else:
+                hot_logger.debug("No match found for: %s - %s", title, artist)
+            return [_spotify_track(item) for item in tracks if item]
         except Exception as e:
-            logger.error(f"Error searching Spotify for '{title}' by '{artist}': {e}")
-            return None
+            hot_logger.error(
+                "Error searching Spotify for '%s' by '%s': %s", title, artist, e
+            )
+            raise
 
-    async def get_playlist_tracks(self, playlist_id: str) -> list[str]:
+    async def search_track(self, title: str, artist: str) -> Optional[str]:
+        tracks = await self.search_tracks(title, artist)
+        return tracks[0].spotify_id if tracks else None
+
+    async def _lookup_tracks(
+        self, track_ids: list[str], market: Optional[str] = None
+    ) -> list[Optional[dict]]:
+        """Raw track objects in request order, 50 IDs per request."""
+        client = self._get_client()
+        items: list[Optional[dict]] = []
+        for i in range(0, len(track_ids), 50):
+            results = await self._call(
+                "track_read", client.tracks, track_ids[i : i + 50], market=market
+            )
+            items.extend(results.get("tracks", []))
+        return items
+
+    async def get_tracks(self, track_ids: list[str]) -> list[SpotifyTrack]:
+        """Look up track metadata; unknown IDs are skipped."""
+        return [
+            _spotify_track(item)
+            for item in await self._lookup_tracks(track_ids)
+            if item
+        ]
+
+    async def check_tracks(
+        self, track_ids: list[str], market: str = "from_token"
+    ) -> dict[str, Optional[str]]:
+        """Map each ID to the ID playable in ``market``, or None if unavailable.
+
+        Relinked tracks map to the ID Spotify substitutes for them.
+        """
+        items = await self._lookup_tracks(track_ids, market=market)
+        playable: dict[str, Optional[str]] = {}
+        for track_id, item in zip(track_ids, items):
+            if not item or item.get("is_playable") is False:
+                playable[track_id] = None
+            else:
+                playable[track_id] = item["id"]
+        return playable
+
+    async def _read_pages(
+        self, playlist_id: str, offset: int, total: int, fields: str
+    ) -> AsyncIterator[list[dict]]:
+        """Yield the item pages from ``offset`` on, in order.
+
+        Pages up to ``total`` are requested ``spotify_page_concurrency`` at a
+        time, each new request starting as the oldest one is consumed. If the
+        last page comes back full the playlist has grown since ``total`` was
+        read, so reading continues one page at a time until a short page.
+        """
         client = self._get_client()
+        pending: deque[asyncio.Task] = deque()
+        next_offset = offset
+
+        def schedule() -> None:
+            nonlocal next_offset
+            pending.append(
+                asyncio.create_task(
+                    self._call(
+                        "playlist_read",
+                        client.playlist_items,
+                        playlist_id,
+                        offset=next_offset,
+                        limit=PAGE_SIZE,
+                        fields=fields,
+                    )
+                )
+            )
+            next_offset += PAGE_SIZE
+
+        try:
+            while next_offset < total and len(pending) < self._page_concurrency:
+                schedule()
+            while pending:
+                items = (await pending.popleft()).get("items", [])
+                if next_offset < total or (not pending and len(items) == PAGE_SIZE):
+                    schedule()
+                yield items
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def iter_playlist_tracks(self, playlist_id: str) -> AsyncIterator[list[str]]:
+        """Yield the playlist's track IDs a page at a time, in playlist order.
+
+        The first page gives the total, after which the rest are fetched
+        concurrently; callers can work on early pages while later ones load.
+        """
+        fields = "items(track(id)),total"
+        first = await self._call(
+            "playlist_read",
+            self._get_client().playlist_items,
+            playlist_id,
+            offset=0,
+            limit=PAGE_SIZE,
+            fields=fields,
+        )
+        items = first.get("items", [])
+        yield _track_ids(items)
+        if len(items) < PAGE_SIZE:
+            return
+        total = first.get("total", 0)
+        # Closed with this generator, so a caller stopping early cancels the reads
+        async with aclosing(
+            self._read_pages(playlist_id, PAGE_SIZE, total, fields)
+        ) as pages:
+            async for items in pages:
+                yield _track_ids(items)
+
+    async def get_playlist_tracks(self, playlist_id: str) -> list[str]:
         track_ids = []
         try:
-            offset = 0
-            while True:
-                results = client.playlist_items(
-                    playlist_id,
-                    offset=offset,
-                    limit=100,
-                    fields="items(track(id)),total",
-                )
-                items = results.get("items", [])
-                for item in items:
-                    if track := item.get("track"):
-                        if track_id := track.get("id"):
-                            track_ids.append(track_id)
-                if len(items) < 100:
-                    break
-                offset += 100
-            logger.info(f"Retrieved {len(track_ids)} tracks from playlist")
+            async for page in self.iter_playlist_tracks(playlist_id):
+                track_ids.extend(page)
+            logger.info("Retrieved %s tracks from playlist", len(track_ids))
             return track_ids
         except Exception as e:
-            logger.error(f"Error getting playlist tracks: {e}")
+            logger.error("Error getting playlist tracks: %s", e)
             raise
 
     async def add_tracks_to_playlist(
@@ -164,11 +464,17 @@ class SpotifyProvider(MusicProviderInterface):
             for i in range(0, len(track_ids), 100):
                 batch = track_ids[i : i + 100]
                 uris = [f"spotify:track:{tid}" for tid in batch]
-                client.playlist_add_items(playlist_id, uris)
-            logger.info(f"Added {len(track_ids)} tracks to playlist")
+                await self._call(
+                    "playlist_write",
+                    client.playlist_add_items,
+                    playlist_id,
+                    uris,
+                    idempotent=False,
+                )
+            logger.info("Added %s tracks to playlist", len(track_ids))
             return True
         except Exception as e:
-            logger.error(f"Error adding tracks: {e}")
+            logger.error("Error adding tracks: %s", e)
             return False
 
     async def remove_tracks_from_playlist(
@@ -182,13 +488,85 @@ class SpotifyProvider(MusicProviderInterface):
             for i in range(0, len(track_ids), 100):
                 batch = track_ids[i : i + 100]
                 uris = [f"spotify:track:{tid}" for tid in batch]
-                client.playlist_remove_all_occurrences_of_items(playlist_id, uris)
-            logger.info(f"Removed {len(track_ids)} tracks from playlist")
+                await self._call(
+                    "playlist_write",
+                    client.playlist_remove_all_occurrences_of_items,
+                    playlist_id,
+                    uris,
+                    idempotent=False,
+                )
+            logger.info("Removed %s tracks from playlist", len(track_ids))
             return True
         except Exception as e:
-            logger.error(f"Error removing tracks: {e}")
+            logger.error("Error removing tracks: %s", e)
             return False
 
+    async def get_playlist_snapshot(self, playlist_id: str) -> PlaylistSnapshot:
+        client = self._get_client()
+        try:
+            # The first page comes with the snapshot ID so positions match it
+            playlist = await self._call(
+                "playlist_read",
+                client.playlist,
+                playlist_id,
+                fields="snapshot_id,tracks(items(track(id)),total)",
+            )
+            page = playlist.get("tracks", {})
+            total = page.get("total", 0)
+            track_ids = [
+                (item.get("track") or {}).get("id") for item in page.get("items", [])
+            ]
+            async for items in self._read_pages(
+                playlist_id, len(track_ids), total, "items(track(id))"
+            ):
+                track_ids.extend((item.get("track") or {}).get("id") for item in items)
+            return PlaylistSnapshot(
+                snapshot_id=playlist.get("snapshot_id"), track_ids=track_ids
+            )
+        except Exception as e:
+            logger.error("Error getting playlist snapshot: %s", e)
+            raise
+
+    async def remove_playlist_positions(
+        self,
+        playlist_id: str,
+        positions: dict[str, list[int]],
+        snapshot_id: Optional[str] = None,
+    ) -> Optional[str]:
+        """Remove specific occurrences by position, relative to ``snapshot_id``.
+
+        Batches are applied from the highest positions down so earlier
+        positions stay valid as each batch lands.
+        """
+        if not positions:
+            return snapshot_id
+        client = self._get_client()
+        items = sorted(
+            (
+                {"uri": f"spotify:track:{tid}", "positions": sorted(pos)}
+                for tid, pos in positions.items()
+            ),
+            key=lambda item: item["positions"][-1],
+            reverse=True,
+        )
+        try:
+            # Spotify API allows max 100 tracks per request
+            for i in range(0, len(items), 100):
+                response = await self._call(
+                    "playlist_write",
+                    client.playlist_remove_specific_occurrences_of_items,
+                    playlist_id,
+                    items[i : i + 100],
+                    snapshot_id=snapshot_id,
+                    idempotent=False,
+                )
+                snapshot_id = response.get("snapshot_id", snapshot_id)
+            logger.info("Removed %s tracks by position from playlist", len(items))
+            return snapshot_id
+        except Exception as e:
+            logger.error("Error removing tracks by position: %s", e)
+            raise
+
     def get_auth_url(self) -> str:
         return self._get_auth_manager().get_authorize_url()
 
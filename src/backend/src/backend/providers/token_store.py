@@ -0,0 +1,205 @@
+"""Persistent, encrypted token storage for the Spotify provider."""
+
+import base64
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from spotipy.cache_handler import CacheHandler
+
+logger = logging.getLogger(__name__)
+
+_SALT_BYTES = 16
+
+
+def derive_key(secret: str, salt: bytes) -> bytes:
+    """Derive a Fernet key from a shared secret such as the client secret.
+
+    HKDF suits a secret that is already random, as client secrets are; the
+    salt ties the key to one token file rather than to the secret alone.
+    """
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+    hkdf = HKDF(
+        algorithm=hashes.SHA256(), length=32, salt=salt, info=b"spotify-token-cache"
+    )
+    return base64.urlsafe_b64encode(hkdf.derive(secret.encode()))
+
+
+def load_salt(path: str) -> bytes:
+    """Read the salt stored at ``path``, creating it on first use.
+
+    Replicas sharing a token file may race to create it. Each writes its own
+    candidate and links it into place, so all of them read the first one.
+    """
+    salt_path = Path(path)
+    if not salt_path.exists():
+        salt_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = salt_path.with_name(f"{salt_path.name}.{os.getpid()}.tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(os.urandom(_SALT_BYTES))
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.link(tmp_path, salt_path)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(tmp_path)
+    return salt_path.read_bytes()
+
+
+def token_cache_keys(secret: str, salt_path: str) -> list[bytes]:
+    """Fernet keys for a token file encrypted under ``secret``, newest first.
+
+    Files written by earlier releases used an unsalted SHA-256 of the
+    secret. That key is still accepted for reading, so an existing token
+    carries over and is re-encrypted under the derived key on its next save.
+    """
+    legacy = base64.urlsafe_b64encode(hashlib.sha256(secret.encode()).digest())
+    return [derive_key(secret, load_salt(salt_path)), legacy]
+
+
+class MemoryCacheHandler(CacheHandler):
+    """
+    A cache handler that stores token info in memory and handles refresh tokens
+    properly.
+
+    This solves the token expiration issue by:
+    1. Starting with the refresh_token from environment
+    2. Letting spotipy manage token refresh automatically
+    3. Keeping the token_info in memory (refreshed as needed)
+    """
+
+    def __init__(self, initial_refresh_token: str, client_id: str, client_secret: str):
+        self.token_info = None
+        self.initial_refresh_token = initial_refresh_token
+        self.client_id = client_id
+        self.client_secret = client_secret
+
+    def get_cached_token(self):
+        """Return the cached token info, or create initial token from refresh token."""
+        if self.token_info is None and self.initial_refresh_token:
+            # Bootstrap: Create initial token_info structure from refresh token
+            # spotipy will automatically refresh this when needed
+            logger.info("Bootstrapping token from refresh token...")
+            self.token_info = {
+                "refresh_token": self.initial_refresh_token,
+                "access_token": None,  # Will be populated on first refresh
+                "expires_at": 0,  # Force immediate refresh
+                "token_type": "Bearer",
+                "scope": (
+                    "playlist-read-private playlist-modify-private "
+                    "playlist-modify-public"
+                ),
+            }
+        return self.token_info
+
+    def save_token_to_cache(self, token_info):
+        """Save the refreshed token info."""
+        logger.debug(
+            "Saving refreshed token, expires_at: %s", token_info.get("expires_at")
+        )
+        self.token_info = token_info
+        # Keep the original refresh token if the new one isn't provided
+        if not token_info.get("refresh_token") and self.initial_refresh_token:
+            self.token_info["refresh_token"] = self.initial_refresh_token
+
+    def locked(self):
+        """Exclusive section around refresh; a no-op for a process-local cache."""
+        return nullcontext()
+
+
+class EncryptedFileCacheHandler(MemoryCacheHandler):
+    """
+    A cache handler that persists token info to an encrypted file.
+
+    The file survives restarts, so a fresh process reuses a still-valid access
+    token instead of refreshing. Placing it on a shared volume lets replicas
+    share one token: writes are atomic, refreshes are serialized with an
+    advisory file lock, and a token written by another replica is picked up on
+    the next read.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        keys: list[bytes],
+        initial_refresh_token: str,
+        client_id: str,
+        client_secret: str,
+    ):
+        super().__init__(initial_refresh_token, client_id, client_secret)
+        self._path = Path(path)
+        self._lock_path = self._path.with_name(self._path.name + ".lock")
+        # Imported here so processes without a token file skip cryptography
+        from cryptography.fernet import Fernet, MultiFernet
+
+        # Encrypts with the first key; decrypts with any of them
+        self._fernet = MultiFernet([Fernet(key) for key in keys])
+        self._mtime_ns: int | None = None
+        self._thread_lock = threading.RLock()
+        self._lock_depth = 0
+        self._lock_file = None
+
+    def get_cached_token(self):
+        self._reload()
+        return super().get_cached_token()
+
+    def save_token_to_cache(self, token_info):
+        super().save_token_to_cache(token_info)
+        with self.locked():
+            self._write(self.token_info)
+
+    @contextmanager
+    def locked(self):
+        """Hold the cross-process lock; re-entrant within this process."""
+        with self._thread_lock:
+            if self._lock_depth == 0:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                self._lock_file = open(self._lock_path, "a")
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+                    self._lock_file.close()
+                    self._lock_file = None
+
+    def _reload(self) -> None:
+        try:
+            mtime_ns = self._path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime_ns == self._mtime_ns:
+            return
+        from cryptography.fernet import InvalidToken
+
+        try:
+            token_info = json.loads(self._fernet.decrypt(self._path.read_bytes()))
+        except (InvalidToken, ValueError) as e:
+            logger.warning("Ignoring unreadable token cache %s: %r", self._path, e)
+            self._mtime_ns = mtime_ns
+            return
+        self._mtime_ns = mtime_ns
+        self.token_info = token_info
+
+    def _write(self, token_info: dict) -> None:
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+        data = self._fernet.encrypt(json.dumps(token_info).encode())
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._path)
+        self._mtime_ns = self._path.stat().st_mtime_ns
@@ -0,0 +1,385 @@
+"""Shared, tuned HTTP connection pools for the upstream APIs.
+
+Each upstream gets one pool per process, shared by every provider and
+tenant that talks to it, so connections and TLS sessions outlive a single
+sync. The httpx pools negotiate HTTP/2 where the server offers it; spotipy
+is built on ``requests`` and stays on HTTP/1.1 keep-alive. Both kinds of
+pool resolve hostnames through a TTL cache and count, per host, how many
+requests had to open a new connection. Compressed responses are requested
+by both clients by default and decoded transparently.
+
+Recording and replay (``backend.providers.recording``) wrap these pools
+rather than replacing them, so recorded runs see the same connection reuse.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+import httpcore
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError
+from backend.config import Settings
+from backend.models import HttpPoolStats
+from backend.providers.recording import wrap_adapter, wrap_async_transport
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _HostCounters:
+    requests: int = 0
+    connections: int = 0
+    http2_requests: int = 0
+    dns_hits: int = 0
+    dns_misses: int = 0
+
+
+_counters: dict[str, _HostCounters] = {}
+_counters_lock = threading.Lock()
+
+
+def _count(host: str, **increments: int) -> None:
+    with _counters_lock:
+        counters = _counters.setdefault(host, _HostCounters())
+        for name, value in increments.items():
+            setattr(counters, name, getattr(counters, name) + value)
+
+
+def transport_stats() -> list[HttpPoolStats]:
+    """Per-host request, connection and DNS cache counts since startup."""
+    with _counters_lock:
+        items = sorted(_counters.items())
+        return [
+            HttpPoolStats(
+                host=host,
+                requests=c.requests,
+                connections=c.connections,
+                reuse_ratio=round(1 - min(c.connections / c.requests, 1), 4)
+                if c.requests
+                else 0.0,
+                http2_requests=c.http2_requests,
+                dns_hits=c.dns_hits,
+                dns_misses=c.dns_misses,
+            )
+            for host, c in items
+        ]
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+class DnsCache:
+    """Remembers the addresses a hostname resolved to for ``ttl`` seconds.
+
+    Connections try the addresses in order. One that refuses is moved to
+    the back, so the next connection starts with one that worked; when all
+    of them fail the entry is dropped and the host is looked up again.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self._ttl = ttl
+        self._entries: dict[tuple[str, int], tuple[list[str], float]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, host: str, port: int) -> list[str] | None:
+        with self._lock:
+            entry = self._entries.get((host, port))
+        if entry and entry[1] > time.monotonic():
+            _count(host, dns_hits=1)
+            return list(entry[0])
+        return None
+
+    def _put(self, host: str, port: int, infos: list) -> list[str]:
+        # getaddrinfo may list an address once per protocol; keep its order
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self._entries[(host, port)] = (addresses, time.monotonic() + self._ttl)
+        _count(host, dns_misses=1)
+        return list(addresses)
+
+    def resolve(self, host: str, port: int) -> list[str]:
+        if self._ttl <= 0 or _is_ip(host):
+            return [host]
+        cached = self._get(host, port)
+        if cached:
+            return cached
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        return self._put(host, port, infos)
+
+    async def aresolve(self, host: str, port: int) -> list[str]:
+        if self._ttl <= 0 or _is_ip(host):
+            return [host]
+        cached = self._get(host, port)
+        if cached:
+            return cached
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, port, type=socket.SOCK_STREAM
+        )
+        return self._put(host, port, infos)
+
+    def failed(self, host: str, port: int, address: str) -> None:
+        """Move ``address`` behind the host's other addresses."""
+        with self._lock:
+            entry = self._entries.get((host, port))
+            if entry and address in entry[0] and len(entry[0]) > 1:
+                addresses = [a for a in entry[0] if a != address] + [address]
+                self._entries[(host, port)] = (addresses, entry[1])
+
+    def forget(self, host: str, port: int) -> None:
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+
+_dns: DnsCache | None = None
+
+
+def get_dns_cache(settings: Settings) -> DnsCache:
+    global _dns
+    if _dns is None:
+        _dns = DnsCache(settings.dns_cache_ttl)
+    return _dns
+
+
+class _CachingBackend(httpcore.AsyncNetworkBackend):
+    """httpcore network backend that resolves through the DNS cache.
+
+    Only the TCP connect goes to the cached address; TLS still verifies and
+    sends SNI for the original hostname.
+    """
+
+    def __init__(self, dns: DnsCache):
+        self._dns = dns
+        self._backend = httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self, host, port, timeout=None, local_address=None, socket_options=None
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            addresses = await self._dns.aresolve(host, port)
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+        for address in addresses:
+            try:
+                stream = await self._backend.connect_tcp(
+                    address, port, timeout, local_address, socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout):
+                if address == addresses[-1]:
+                    self._dns.forget(host, port)
+                    raise
+                self._dns.failed(host, port, address)
+                continue
+            _count(host, connections=1)
+            return stream
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class PooledTransport(httpx.AsyncHTTPTransport):
+    """httpx transport with HTTP/2, cached DNS and per-host reuse counters.
+
+    A client given its own transport ignores the proxy environment
+    variables, so they are applied here: hosts that HTTP(S)_PROXY or
+    ALL_PROXY cover, and NO_PROXY does not exempt, go through httpx's own
+    proxy transport and are resolved by the proxy, not the DNS cache.
+
+    Shared between clients, so closing a client leaves the pool open; the
+    pool is released by ``close_transports`` at shutdown.
+    """
+
+    def __init__(self, settings: Settings):
+        limits = httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        )
+        super().__init__(http2=settings.http2_enabled, limits=limits)
+        # httpx has no option for the network backend, so rebuild its pool
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http2=settings.http2_enabled,
+            network_backend=_CachingBackend(get_dns_cache(settings)),
+        )
+        self._proxies = {
+            scheme: httpx.AsyncHTTPTransport(
+                proxy=url, http2=settings.http2_enabled, limits=limits
+            )
+            for scheme, url in urllib.request.getproxies().items()
+            if scheme in ("http", "https", "all")
+        }
+
+    def _proxy_for(self, url: httpx.URL) -> httpx.AsyncHTTPTransport | None:
+        proxy = self._proxies.get(url.scheme) or self._proxies.get("all")
+        if proxy is None or urllib.request.proxy_bypass(url.host):
+            return None
+        return proxy
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        proxy = self._proxy_for(request.url)
+        if proxy is not None:
+            response = await proxy.handle_async_request(request)
+        else:
+            response = await super().handle_async_request(request)
+        http2 = response.extensions.get("http_version") == b"HTTP/2"
+        _count(request.url.host, requests=1, http2_requests=int(http2))
+        return response
+
+    async def aclose(self) -> None:
+        pass
+
+    async def close_pool(self) -> None:
+        for proxy in self._proxies.values():
+            await proxy.aclose()
+        await super().aclose()
+
+
+class _CachedDnsMixin:
+    """urllib3 connection that tries the cached addresses for its host in turn.
+
+    Proxied requests never get here: requests hands them to a ProxyManager
+    with urllib3's own connection classes, and the proxy resolves the host.
+    """
+
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            addresses = _dns.resolve(host, self.port) if _dns else [host]
+        except OSError:
+            # Let urllib3 resolve it again and report the failure its own way
+            addresses = [host]
+        try:
+            for address in addresses:
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                except ConnectTimeoutError:
+                    # NewConnectionError (refused, unreachable) is a subclass
+                    if address == addresses[-1]:
+                        if _dns:
+                            _dns.forget(host, self.port)
+                        raise
+                    if _dns:
+                        _dns.failed(host, self.port, address)
+                    continue
+                _count(self.host, connections=1)
+                return sock
+        finally:
+            self._dns_host = host
+
+
+class _HTTPConnection(_CachedDnsMixin, HTTPConnection):
+    pass
+
+
+class _HTTPSConnection(_CachedDnsMixin, HTTPSConnection):
+    pass
+
+
+class _HTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _HTTPConnection
+
+
+class _HTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _HTTPSConnection
+
+
+class PooledAdapter(HTTPAdapter):
+    """requests adapter with per-host keep-alive pools and cached DNS."""
+
+    def __init__(self, settings: Settings):
+        get_dns_cache(settings)
+        super().__init__(
+            pool_connections=settings.http_max_keepalive,
+            pool_maxsize=settings.http_max_connections,
+        )
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _HTTPConnectionPool,
+            "https": _HTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs) -> requests.Response:
+        response = super().send(request, **kwargs)
+        _count(urlsplit(request.url).hostname or "", requests=1)
+        return response
+
+
+class SharedSession(requests.Session):
+    """``requests`` session that outlives the clients using it.
+
+    spotipy closes the session it is handed when the client is garbage
+    collected; the pool is released by ``close_transports`` instead.
+    """
+
+    def close(self) -> None:
+        pass
+
+    def close_pool(self) -> None:
+        super().close()
+
+
+_transports: dict[str, tuple[asyncio.AbstractEventLoop, PooledTransport]] = {}
+_sessions: dict[str, SharedSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def async_transport(name: str, settings: Settings) -> httpx.AsyncBaseTransport:
+    """The shared transport for upstream ``name`` on the running event loop.
+
+    Connections belong to the loop that opened them, so a new pool is built
+    if the process has moved on to another loop (as the CLI does).
+    """
+    loop = asyncio.get_running_loop()
+    entry = _transports.get(name)
+    if entry is None or entry[0] is not loop:
+        entry = (loop, PooledTransport(settings))
+        _transports[name] = entry
+    return wrap_async_transport(settings, entry[1])
+
+
+def requests_session(name: str, settings: Settings) -> SharedSession:
+    """The shared ``requests`` session for upstream ``name``."""
+    with _sessions_lock:
+        if name not in _sessions:
+            session = SharedSession()
+            adapter = wrap_adapter(settings, PooledAdapter(settings))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[name] = session
+        return _sessions[name]
+
+
+async def close_transports() -> None:
+    """Release every shared pool; they are rebuilt on next use."""
+    for loop, transport in list(_transports.values()):
+        if loop is asyncio.get_running_loop():
+            await transport.close_pool()
+    _transports.clear()
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close_pool()
+        _sessions.clear()
@@ -6,21 +6,61 @@ from typing import Any
 import httpx
 from backend.config import get_settings
 from backend.core.interfaces import TrackSourceInterface
+from backend.core.resilience import ResiliencePolicy
+from backend.log import throttled
 from backend.models import Track
+from backend.providers.transport import async_transport
 
 logger = logging.getLogger(__name__)
+# Per-track messages, rate-limited so volume does not scale log cost
+hot_logger = throttled(__name__)
+
+
+def _is_failure(error: Exception) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+def _retry_after(error: Exception) -> float | None:
+    if isinstance(error, httpx.HTTPStatusError):
+        try:
+            return float(error.response.headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            return None
+    return None
 
 
 class XMRadioProvider(TrackSourceInterface):
     def __init__(self, base_url: str | None = None):
         settings = get_settings()
+        self._settings = settings
         self.base_url = base_url or settings.xm_api_base_url
+        self._timeout = settings.xm_timeout
         self._client: httpx.AsyncClient | None = None
+        self._resilience = ResiliencePolicy(
+            "xm",
+            attempts=settings.retry_attempts,
+            base_delay=settings.retry_base_delay,
+            max_delay=settings.retry_max_delay,
+            failure_threshold=settings.circuit_failure_threshold,
+            reset_timeout=settings.circuit_reset_timeout,
+            hedge_delay=settings.hedge_delay,
+            is_failure=_is_failure,
+            retry_after=_retry_after,
+        )
+
+    @property
+    def resilience(self) -> ResiliencePolicy:
+        return self._resilience
 
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
             self._client = httpx.AsyncClient(
-                timeout=30.0, headers={"Accept": "application/json"}
+                timeout=self._timeout,
+                headers={"Accept": "application/json"},
+                transport=async_transport("xm", self._settings),
             )
         return self._client
 
@@ -28,21 +68,55 @@ class XMRadioProvider(TrackSourceInterface):
         if self._client and not self._client.is_closed:
             await self._client.aclose()
 
+    async def ping(self) -> bool:
+        """Cheap reachability check against the XM API host."""
+        client = await self._get_client()
+        response = await client.head(self.base_url)
+        return response.status_code < 500
+
     async def get_recent_tracks(self, station: str, limit: int = 50) -> list[Track]:
         client = await self._get_client()
         url = f"{self.base_url}/station/{station}"
         try:
-            logger.info(f"Fetching tracks from XM station: {station}")
-            response = await client.get(url)
-            response.raise_for_status()
+            logger.info("Fetching tracks from XM station: %s", station)
+
+            async def fetch() -> httpx.Response:
+                response = await client.get(url)
+                response.raise_for_status()
+                return response
+
+            response = await self._resilience.call("station", fetch, idempotent=True)
             data = response.json()
             tracks = self._parse_tracks(data.get("results", []), limit)
-            logger.info(f"Fetched {len(tracks)} tracks from XM")
+            logger.info("Fetched %s tracks from XM", len(tracks))
             return tracks
         except Exception as e:
-            logger.error(f"Error fetching XM tracks: {e}")
+            logger.error("Error fetching XM tracks: %s", e)
             raise
 
+    async def get_history_page(
+        self, station: str, cursor: str | None = None
+    ) -> tuple[list[Track], str | None]:
+        """One page of a station's play history and the URL of the next, older one.
+
+        Pass the returned cursor back in to continue; it is None on the last page.
+        """
+        client = await self._get_client()
+        url = cursor or f"{self.base_url}/station/{station}"
+
+        async def fetch() -> httpx.Response:
+            response = await client.get(url)
+            response.raise_for_status()
+            return response
+
+        response = await self._resilience.call("station", fetch, idempotent=True)
+        data = response.json()
+        results = data.get("results", [])
+        next_url = data.get("next")
+        if next_url:
+            next_url = str(httpx.URL(url).join(next_url))
+        return self._parse_tracks(results, len(results)), next_url
+
     def _parse_tracks(self, results: list[dict[str, Any]], limit: int) -> list[Track]:
         tracks = []
         for item in results[:limit]:
@@ -62,5 +136,5 @@ class XMRadioProvider(TrackSourceInterface):
                 )
                 tracks.append(track)
             except Exception as e:
-                logger.warning(f"Error parsing track: {e}")
+                hot_logger.warning("Error parsing track: %s", e)
         return tracks
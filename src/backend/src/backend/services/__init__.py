@@ -1,5 +1,38 @@
 """Business logic services."""
 
+from backend.services.catalog import CatalogIndex
+from backend.services.health import HealthMonitor
+from backend.services.ingest import IngestPipeline
+from backend.services.ipc import RemoteSyncService, WorkerServer
+from backend.services.journal import SyncJournal
+from backend.services.loop_monitor import LoopMonitor
+from backend.services.match_cache import MatchCache
+from backend.services.polling import AdaptivePollingPolicy
+from backend.services.prewarm import Prewarmer
+from backend.services.profiling import MemoryTracer, SamplingProfiler
+from backend.services.resolver import TrackResolver
+from backend.services.revalidation import MatchRevalidator
+from backend.services.state import StateStore
 from backend.services.sync_service import SyncService
+from backend.services.tenancy import TenantRegistry, load_tenants
 
-__all__ = ["SyncService"]
+__all__ = [
+    "SyncService",
+    "HealthMonitor",
+    "AdaptivePollingPolicy",
+    "TenantRegistry",
+    "load_tenants",
+    "RemoteSyncService",
+    "WorkerServer",
+    "MatchCache",
+    "TrackResolver",
+    "Prewarmer",
+    "LoopMonitor",
+    "MatchRevalidator",
+    "IngestPipeline",
+    "CatalogIndex",
+    "StateStore",
+    "SamplingProfiler",
+    "MemoryTracer",
+    "SyncJournal",
+]
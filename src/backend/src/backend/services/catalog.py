@@ -0,0 +1,518 @@
+"""Local index of Spotify tracks for resolving spelling variants offline.
+
+Every Spotify track the service sees (search candidates, playlist
+contents) is added to the catalog. A play that misses the exact-key match
+cache is first scored against the catalog by trigram similarity of its
+normalised title and artist, and only searched on Spotify if nothing
+scores above ``min_score``. Similar spelling is not enough on its own:
+titles must carry the same numbers (parts, volumes, sequels), must not
+differ only by a plural, and durations, where both are known, must agree.
+
+On disk the catalog is a single file, memory-mapped read-only, so loading
+it costs nothing up front and its pages are shared between processes::
+
+    header    magic, version, byte order, record/gram/string/posting counts
+    records   fixed-size: Spotify ID, duration, popularity, string offset
+    strings   normalised "title" + "artist" bytes for each record
+    grams     sorted title-trigram hashes, then CSR offsets into postings
+    postings  record numbers per trigram
+
+New tracks are kept in memory until ``flush`` merges them with the file
+currently on disk and atomically replaces it. With no path the merged
+index is kept in memory instead.
+"""
+
+import array
+import asyncio
+import bisect
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import unicodedata
+import zlib
+from collections import Counter
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+from backend.models import SpotifyTrack
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"XMCI"
+# Bumped when normalisation changes; older files are rebuilt
+_VERSION = 2
+_HEADER = struct.Struct("<4sBBHIIII")
+_RECORD = struct.Struct("<22sIBxIHH")
+_ID_SIZE = 22
+
+# Title similarity counts for more than artist similarity in the score
+_TITLE_WEIGHT = 0.7
+# Releases of one recording rarely report lengths further apart than this
+_MAX_DURATION_DIFF_MS = 5000
+
+_BRACKETS = re.compile(r"\s*[\(\[]([^\)\]]*)[\)\]]")
+_DASH_SUFFIX = re.compile(r"\s+-\s+(.*)$")
+_MARKER_WORDS = (
+    r"(?:pts?|parts?|vols?|volumes?|nos?|numbers?|chapters?|books?|acts?"
+    r"|episodes?|movements?)"
+)
+# Part and volume markers tell otherwise identical titles apart
+_MARKER = re.compile(rf"\b{_MARKER_WORDS}\b\.?\s*(?:\d+|[ivxlc]+)\b")
+_ROMAN_MARKED = re.compile(rf"\b{_MARKER_WORDS} ([ivxlc]+)\b")
+_ROMAN_VALUES = {"i": 1, "v": 5, "x": 10, "l": 50, "c": 100}
+_DIGITS = re.compile(r"\d+")
+_FEATURING = re.compile(r"\s+(feat\.?|ft\.?|featuring)\s.*$")
+_APOSTROPHES = re.compile(r"['’`]")
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def _fold(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in text if not unicodedata.combining(c)).casefold()
+
+
+def _keep_markers(match: re.Match) -> str:
+    suffix = match.group(1)
+    return f" {suffix}" if _MARKER.search(suffix) else ""
+
+
+def normalize_title(title: str) -> str:
+    """Title without version suffixes, featured artists, accents or punctuation.
+
+    Bracketed or dashed suffixes are dropped unless they hold a part or
+    volume marker, so "Song (Pt. 2)" stays distinct from "Song (Pt. 1)".
+    """
+    text = _fold(title)
+    text = _BRACKETS.sub(_keep_markers, text)
+    text = _DASH_SUFFIX.sub(_keep_markers, text)
+    text = _FEATURING.sub("", text)
+    text = _APOSTROPHES.sub("", text).replace("&", " and ")
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def normalize_artist(artist: str) -> str:
+    text = _FEATURING.sub("", _fold(artist))
+    text = _APOSTROPHES.sub("", text).replace("&", " and ")
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _dice(a: set[str], b: set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def _gram_hash(gram: str) -> int:
+    return zlib.crc32(gram.encode("utf-8"))
+
+
+def _roman(numeral: str) -> int:
+    total = largest = 0
+    for char in reversed(numeral):
+        value = _ROMAN_VALUES[char]
+        total += value if value >= largest else -value
+        largest = max(largest, value)
+    return total
+
+
+def _numbers(title: str) -> list[int]:
+    """Numbers in a normalised title, with marked roman numerals converted."""
+    numbers = [int(n) for n in _DIGITS.findall(title)]
+    numbers += [_roman(n) for n in _ROMAN_MARKED.findall(title)]
+    return sorted(numbers)
+
+
+def _distinct_titles(a: str, b: str) -> bool:
+    """Whether two similarly spelt normalised titles name different tracks.
+
+    Numbers must match exactly ("Pt. 1" is not "Pt. 2", "Vultures 1" is
+    not "Vultures 2"), and a word that appears only as a plural on one side
+    ("Love Song" and "Love Songs") marks a different title.
+    """
+    if _numbers(a) != _numbers(b):
+        return True
+    words_a, words_b = set(a.split()), set(b.split())
+    only_a, only_b = words_a - words_b, words_b - words_a
+    return any(
+        f"{word}s" in other or f"{word}es" in other
+        for words, other in ((only_a, only_b), (only_b, only_a))
+        for word in words
+    )
+
+
+def _durations_differ(a: int | None, b: int) -> bool:
+    return bool(a and b) and abs(a - b) > _MAX_DURATION_DIFF_MS
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogEntry:
+    track_id: str
+    title: str
+    artist: str
+    duration_ms: int = 0
+    popularity: int = 0
+
+    @classmethod
+    def from_track(cls, track: SpotifyTrack) -> "CatalogEntry":
+        return cls(
+            track_id=track.spotify_id,
+            title=normalize_title(track.track.title),
+            artist=normalize_artist(track.track.primary_artist),
+            duration_ms=track.duration_ms or 0,
+            popularity=track.popularity or 0,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogMatch:
+    entry: CatalogEntry
+    score: float
+
+
+class _Segment:
+    """Read-only view over one encoded index, mapped from a file or in memory."""
+
+    def __init__(self, buffer, mapped: Optional[mmap.mmap] = None):
+        self._mapped = mapped
+        self._view = memoryview(buffer)
+        magic, version, little, _, n, n_grams, strings_len, n_postings = (
+            _HEADER.unpack_from(self._view)
+        )
+        if magic != _MAGIC:
+            raise ValueError("not a catalog file")
+        if version != _VERSION:
+            raise ValueError(f"catalog format {version} is outdated")
+        if bool(little) != (sys.byteorder == "little"):
+            raise ValueError("catalog was written with another byte order")
+        self.size = n
+        self._records_at = _HEADER.size
+        strings_at = self._records_at + n * _RECORD.size
+        self._strings = self._view[strings_at : strings_at + strings_len]
+        grams_at = strings_at + _padded(strings_len)
+        offsets_at = grams_at + n_grams * 4
+        postings_at = offsets_at + (n_grams + 1) * 4
+        self._hashes = self._view[grams_at:offsets_at].cast("I")
+        self._offsets = self._view[offsets_at:postings_at].cast("I")
+        self._postings = self._view[postings_at : postings_at + n_postings * 4].cast(
+            "I"
+        )
+
+    @classmethod
+    def open(cls, path: str) -> Optional["_Segment"]:
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size < _HEADER.size:
+                    return None
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+        try:
+            return cls(mapped, mapped)
+        except ValueError as e:
+            mapped.close()
+            logger.warning("Ignoring catalog %s: %s", path, e)
+            return None
+
+    def entry(self, index: int) -> CatalogEntry:
+        raw_id, duration, popularity, offset, title_len, artist_len = (
+            _RECORD.unpack_from(self._view, self._records_at + index * _RECORD.size)
+        )
+        strings = self._strings[offset : offset + title_len + artist_len].tobytes()
+        return CatalogEntry(
+            track_id=raw_id.rstrip(b"\0").decode("ascii"),
+            title=strings[:title_len].decode("utf-8"),
+            artist=strings[title_len:].decode("utf-8"),
+            duration_ms=duration,
+            popularity=popularity,
+        )
+
+    def __iter__(self) -> Iterator[CatalogEntry]:
+        return (self.entry(i) for i in range(self.size))
+
+    def postings(self, gram_hash: int) -> memoryview:
+        i = bisect.bisect_left(self._hashes, gram_hash)
+        if i == len(self._hashes) or self._hashes[i] != gram_hash:
+            return self._postings[0:0]
+        return self._postings[self._offsets[i] : self._offsets[i + 1]]
+
+    def close(self) -> None:
+        for view in (self._hashes, self._offsets, self._postings, self._strings):
+            view.release()
+        self._view.release()
+        if self._mapped is not None:
+            self._mapped.close()
+
+
+def _padded(length: int) -> int:
+    return (length + 3) & ~3
+
+
+def _encode(entries: list[CatalogEntry]) -> bytes:
+    records = bytearray()
+    strings = bytearray()
+    grams: dict[int, list[int]] = {}
+    for index, entry in enumerate(entries):
+        title = entry.title.encode("utf-8")[:0xFFFF]
+        artist = entry.artist.encode("utf-8")[:0xFFFF]
+        records += _RECORD.pack(
+            entry.track_id.encode("ascii"),
+            min(entry.duration_ms, 0xFFFFFFFF),
+            min(entry.popularity, 255),
+            len(strings),
+            len(title),
+            len(artist),
+        )
+        strings += title + artist
+        for gram in trigrams(entry.title):
+            grams.setdefault(_gram_hash(gram), []).append(index)
+
+    hashes = array.array("I", sorted(grams))
+    offsets = array.array("I", [0])
+    postings = array.array("I")
+    for gram_hash in hashes:
+        postings.extend(grams[gram_hash])
+        offsets.append(len(postings))
+
+    header = _HEADER.pack(
+        _MAGIC,
+        _VERSION,
+        sys.byteorder == "little",
+        0,
+        len(entries),
+        len(hashes),
+        len(strings),
+        len(postings),
+    )
+    strings += b"\0" * (_padded(len(strings)) - len(strings))
+    return b"".join(
+        (
+            header,
+            records,
+            strings,
+            hashes.tobytes(),
+            offsets.tobytes(),
+            postings.tobytes(),
+        )
+    )
+
+
+class CatalogIndex:
+    """Trigram index over Spotify tracks, answering "which track is this?".
+
+    A match needs a combined score (title weighted over artist, each the
+    Dice coefficient of their trigram sets) of at least ``min_score``, and
+    must pass the number, plural and duration checks. Since the score
+    bounds how many title trigrams a match can lack, candidates are
+    collected from the query's rarest trigrams only and then counted
+    against the common ones, which keeps lookups fast as the catalog grows
+    without missing any qualifying track. Ties go to the more popular track.
+
+    Tracks found unplayable are removed with ``remove`` and relinked ones
+    repointed with ``relink``; both take effect at once and reach the file
+    on the next flush.
+    """
+
+    def __init__(self, path: str = "", min_score: float = 0.85, flush_every: int = 500):
+        self._path = path
+        self._min_score = min_score
+        self._flush_every = flush_every
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: dict[str, tuple[CatalogEntry, set[str], set[str]]] = {}
+        self._removed: set[str] = set()
+        self._base: Optional[_Segment] = _Segment.open(path) if path else None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return (self._base.size if self._base else 0) + len(self._pending)
+
+    @property
+    def pending(self) -> int:
+        """Changes not yet flushed: tracks added plus tracks removed."""
+        return len(self._pending) + len(self._removed)
+
+    def add(self, tracks: Iterable[SpotifyTrack]) -> None:
+        for track in tracks:
+            if len(track.spotify_id) > _ID_SIZE:
+                continue
+            entry = CatalogEntry.from_track(track)
+            if entry.title:
+                self._put(entry)
+
+    def _put(self, entry: CatalogEntry) -> None:
+        with self._lock:
+            self._removed.discard(entry.track_id)
+            self._pending[entry.track_id] = (
+                entry,
+                trigrams(entry.title),
+                trigrams(entry.artist),
+            )
+
+    def _find(self, track_id: str) -> Optional[CatalogEntry]:
+        if track_id in self._pending:
+            return self._pending[track_id][0]
+        if self._base is None or track_id in self._removed:
+            return None
+        # Rare (revalidation only), so a scan beats keeping an ID index
+        return next((e for e in self._base if e.track_id == track_id), None)
+
+    def remove(self, track_ids: Iterable[str]) -> None:
+        """Stop matching ``track_ids``, such as tracks no longer playable."""
+        with self._lock:
+            for track_id in track_ids:
+                self._pending.pop(track_id, None)
+                self._removed.add(track_id)
+
+    def relink(self, relinked: dict[str, str]) -> None:
+        """Point entries at the IDs Spotify substitutes for them."""
+        if not relinked:
+            return
+        with self._lock:
+            entries = {old: self._find(old) for old in relinked}
+        self.remove(relinked)
+        for old, entry in entries.items():
+            if entry is not None and len(relinked[old]) <= _ID_SIZE:
+                self._put(replace(entry, track_id=relinked[old]))
+
+    def match(
+        self, title: str, artist: str, duration_ms: int | None = None
+    ) -> Optional[CatalogMatch]:
+        normalized = normalize_title(title)
+        query_title = trigrams(normalized)
+        query_artist = trigrams(normalize_artist(artist))
+        if not normalized:
+            return None
+        best: Optional[CatalogMatch] = None
+
+        def consider(entry: CatalogEntry, title_grams: set, artist_grams: set):
+            nonlocal best
+            score = _TITLE_WEIGHT * _dice(query_title, title_grams) + (
+                1 - _TITLE_WEIGHT
+            ) * _dice(query_artist, artist_grams)
+            if score < self._min_score:
+                return
+            if _distinct_titles(normalized, entry.title) or _durations_differ(
+                duration_ms, entry.duration_ms
+            ):
+                return
+            if (
+                best is None
+                or score > best.score
+                or (score == best.score and entry.popularity > best.entry.popularity)
+            ):
+                best = CatalogMatch(entry, round(score, 4))
+
+        with self._lock:
+            for entry, title_grams, artist_grams in list(self._pending.values()):
+                consider(entry, title_grams, artist_grams)
+            if self._base is not None:
+                for index in self._candidates(self._base, query_title):
+                    entry = self._base.entry(index)
+                    if (
+                        entry.track_id not in self._pending
+                        and entry.track_id not in self._removed
+                    ):
+                        consider(entry, trigrams(entry.title), trigrams(entry.artist))
+        return best
+
+    def _candidates(self, segment: _Segment, query: set[str]) -> list[int]:
+        """Every record sharing enough title trigrams to reach ``min_score``."""
+        # Even a perfect artist score leaves the title needing this much
+        min_dice = max((self._min_score - (1 - _TITLE_WEIGHT)) / _TITLE_WEIGHT, 0.0)
+        # ...and so at least this many of the query's trigrams
+        min_shared = max(math.ceil(min_dice * len(query) / (2 - min_dice)), 1)
+        postings = sorted(
+            (segment.postings(_gram_hash(gram)) for gram in query), key=len
+        )
+        # A track sharing min_shared trigrams must have one of the rarest rest
+        split = len(query) - min_shared + 1
+        counts: Counter[int] = Counter()
+        for posting in postings[:split]:
+            counts.update(posting)
+        candidates = []
+        for index, shared in counts.items():
+            # Postings are in record order, so the common ones are searched
+            for posting in postings[split:]:
+                if shared >= min_shared:
+                    break
+                i = bisect.bisect_left(posting, index)
+                shared += i < len(posting) and posting[i] == index
+            if shared >= min_shared:
+                candidates.append(index)
+        return candidates
+
+    def flush(self) -> None:
+        """Merge pending tracks into the index file (or in-memory index).
+
+        Blocking; call it from a thread when the catalog is large.
+        """
+        with self._flush_lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        with self._lock:
+            pending = dict(self._pending)
+            removed = set(self._removed)
+        if not pending and not removed:
+            return
+        current = _Segment.open(self._path) if self._path else None
+        source = current if self._path else self._base
+        merged: dict[str, CatalogEntry] = {}
+        if source is not None:
+            merged = {entry.track_id: entry for entry in source}
+        if current is not None:
+            current.close()
+        for tid in removed:
+            merged.pop(tid, None)
+        merged.update((tid, entry) for tid, (entry, _, _) in pending.items())
+        encoded = _encode([merged[tid] for tid in sorted(merged)])
+
+        if self._path:
+            directory = Path(self._path).parent
+            directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".catalog-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(encoded)
+                os.replace(tmp, self._path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+            segment = _Segment.open(self._path)
+        else:
+            segment = _Segment(encoded)
+
+        with self._lock:
+            previous, self._base = self._base, segment
+            for tid, item in pending.items():
+                # Tracks re-added while flushing stay pending
+                if self._pending.get(tid) is item:
+                    del self._pending[tid]
+            # The file no longer holds these; later removals stay pending
+            self._removed -= removed
+        if previous is not None:
+            previous.close()
+        logger.info("Catalog holds %s tracks", len(merged))
+
+    async def save_if_due(self) -> None:
+        """Flush in a thread once enough tracks are pending."""
+        if self.pending >= self._flush_every:
+            await asyncio.to_thread(self.flush)
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            if self._base is not None:
+                self._base.close()
+                self._base = None
@@ -0,0 +1,149 @@
+"""Background dependency checks backing the liveness and readiness probes."""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from backend.config import Settings
+from backend.models import DependencyCheck, ReadinessReport
+from backend.core.interfaces import SyncServiceInterface
+from backend.providers import XMRadioProvider
+from backend.services.state import StateStore
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """Refreshes dependency state in the background so probes never block.
+
+    Probes read the last snapshot and report how old it is; a snapshot older
+    than three check intervals is considered stale and fails readiness.
+    Spotify and scheduler state come from the sync service, which may be a
+    ``RemoteSyncService`` when syncs run in a separate worker.
+
+    Only local dependencies (configuration, token store, state database and
+    scheduler) decide readiness. XM and Spotify reachability are reported
+    but not critical: an upstream outage would otherwise take every replica
+    out of the Service while the app itself can still serve.
+    """
+
+    def __init__(
+        self,
+        xm_provider: XMRadioProvider,
+        sync_service: SyncServiceInterface,
+        settings: Settings,
+    ):
+        self._xm_provider = xm_provider
+        self._sync_service = sync_service
+        self._settings = settings
+        self._state = StateStore(settings.state_path) if settings.state_path else None
+        self._checks: list[DependencyCheck] = []
+        self._checked_at: float | None = None
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error("Health check refresh failed: %s", e)
+            await asyncio.sleep(self._settings.health_check_interval)
+
+    async def refresh(self) -> None:
+        self._checks = list(
+            await asyncio.gather(
+                self._check("config", self._check_config()),
+                self._check("token_store", self._check_token_store()),
+                self._check("state", self._check_state()),
+                self._check("scheduler", self._check_scheduler()),
+                self._check("xm", self._check_xm(), critical=False),
+                self._check("spotify", self._check_spotify(), critical=False),
+            )
+        )
+        self._checked_at = time.monotonic()
+
+    async def _check(self, name: str, probe, critical: bool = True) -> DependencyCheck:
+        try:
+            async with asyncio.timeout(self._settings.health_check_timeout):
+                healthy, detail = await probe
+        except TimeoutError:
+            healthy, detail = False, "timed out"
+        except Exception as e:
+            healthy, detail = False, str(e)
+        return DependencyCheck(
+            name=name,
+            healthy=healthy,
+            critical=critical,
+            detail=detail,
+            checked_at=datetime.utcnow(),
+        )
+
+    async def _check_config(self) -> tuple[bool, str | None]:
+        settings = self._settings
+        if settings.worker_address:
+            return True, "syncs run in the worker"
+        if not (settings.spotify_refresh_token or settings.spotify_token_cache_path):
+            return False, "no refresh token or token cache configured"
+        return True, None
+
+    async def _check_token_store(self) -> tuple[bool, str | None]:
+        path = self._settings.spotify_token_cache_path
+        if not path or self._settings.worker_address:
+            return True, "in memory"
+        directory = Path(path).absolute().parent
+        # The store creates missing directories, so check the nearest one there is
+        while not directory.exists() and directory != directory.parent:
+            directory = directory.parent
+        if not os.access(directory, os.W_OK):
+            return False, f"{directory} is not writable"
+        return True, None
+
+    async def _check_state(self) -> tuple[bool, str | None]:
+        if self._state is None:
+            return True, "in memory"
+        await asyncio.to_thread(self._state.version, "status")
+        return True, None
+
+    async def _check_xm(self) -> tuple[bool, str | None]:
+        reachable = await self._xm_provider.ping()
+        return reachable, None if reachable else "server error"
+
+    async def _check_spotify(self) -> tuple[bool, str | None]:
+        # Refreshes the cached worker state when syncs run out of process
+        await self._sync_service.get_status()
+        valid = self._sync_service.spotify_authenticated
+        return valid, None if valid else "no valid access token"
+
+    async def _check_scheduler(self) -> tuple[bool, str | None]:
+        if not self._settings.sync_enabled:
+            return True, "sync disabled"
+        await self._sync_service.get_status()
+        running = self._sync_service.scheduler_running
+        return running, None if running else "scheduler not running"
+
+    def report(self) -> ReadinessReport:
+        if self._checked_at is None:
+            return ReadinessReport(ready=False, stale=True)
+        age = time.monotonic() - self._checked_at
+        stale = age > 3 * self._settings.health_check_interval
+        return ReadinessReport(
+            ready=not stale and all(c.healthy for c in self._checks if c.critical),
+            stale=stale,
+            age_seconds=round(age, 3),
+            checks=self._checks,
+        )
@@ -0,0 +1,115 @@
+"""Push-based now-playing ingestion, micro-batched into playlist updates."""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable
+from backend.models import Track
+
+logger = logging.getLogger(__name__)
+
+
+class IngestPipeline:
+    """Bounded queue of pushed plays, drained in batches into ``sink``.
+
+    ``offer`` never waits: when the queue cannot take a whole request it is
+    refused, and the endpoint turns that into a 429 so feeders back off.
+    The drain task collects plays for up to ``batch_window`` seconds (or
+    ``batch_size`` plays) after the first one arrives and applies them in
+    one playlist update. A batch that meets a sync already in progress is
+    held and retried rather than dropped, which leaves the queue to absorb
+    new events, and eventually refuse them, in the meantime.
+    """
+
+    def __init__(
+        self,
+        sink: Callable[[list[Track]], Awaitable[dict]],
+        max_queue: int = 1000,
+        batch_size: int = 50,
+        batch_window: float = 2.0,
+    ):
+        self._sink = sink
+        self._queue: asyncio.Queue[Track] = asyncio.Queue(maxsize=max_queue)
+        self._batch_size = max(batch_size, 1)
+        self._batch_window = batch_window
+        self._batch: list[Track] = []
+        self._task: asyncio.Task | None = None
+        self._applying: asyncio.Task | None = None
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds a refused feeder should wait before trying again."""
+        return max(self._batch_window, 1.0)
+
+    def offer(self, tracks: list[Track]) -> bool:
+        """Queue all of ``tracks``, or none of them if there is not room."""
+        if self._queue.maxsize - self._queue.qsize() < len(tracks):
+            return False
+        for track in tracks:
+            self._queue.put_nowait(track)
+        return True
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain())
+
+    async def stop(self) -> None:
+        """Stop draining, applying whatever is already queued first."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._applying:
+            # Shielded from the cancel above; let the update in flight land
+            await self._applying
+        while not self._queue.empty():
+            self._batch.append(self._queue.get_nowait())
+        batch, self._batch = self._batch, []
+        for i in range(0, len(batch), self._batch_size):
+            await self._apply(batch[i : i + self._batch_size])
+
+    async def _drain(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch.append(await self._queue.get())
+            closes_at = loop.time() + self._batch_window
+            while len(self._batch) < self._batch_size:
+                remaining = closes_at - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    track = await asyncio.wait_for(self._queue.get(), remaining)
+                except TimeoutError:
+                    break
+                self._batch.append(track)
+            batch, self._batch = self._batch, []
+            self._applying = asyncio.create_task(self._apply(batch))
+            await asyncio.shield(self._applying)
+
+    async def _apply(self, batch: list[Track]) -> None:
+        while True:
+            try:
+                result = await self._sink(batch)
+            except Exception as e:
+                logger.error("Dropping %s ingested plays: %s", len(batch), e)
+                return
+            if "success" in result:
+                break
+            # Another sync holds the playlist; keep the batch and try again
+            await asyncio.sleep(self.retry_after)
+        if result["success"]:
+            logger.info(
+                "Ingested %s plays: %s added",
+                len(batch),
+                result.get("tracks_added", 0),
+            )
+        else:
+            logger.error(
+                "Dropping %s ingested plays: %s", len(batch), result.get("error")
+            )
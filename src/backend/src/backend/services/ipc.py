@@ -0,0 +1,169 @@
+"""Local IPC between the API process and a standalone sync worker.
+
+The protocol is one JSON object per line over a Unix socket (or TCP for
+containers that cannot share a socket file): the client sends
+``{"op": ...}`` and the worker answers ``{"ok": true, "result": ...}`` or
+``{"ok": false, "error": ...}``. No broker is involved.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any
+import pydantic_core
+from backend.core.interfaces import SyncServiceInterface
+from backend.models import Track
+
+logger = logging.getLogger(__name__)
+
+
+def parse_address(address: str) -> tuple[str | None, int | None, str | None]:
+    """Split ``host:port`` into a TCP pair, or treat anything else as a socket path."""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and not address.startswith(("/", ".")):
+        return host or "127.0.0.1", int(port), None
+    return None, None, address
+
+
+class WorkerServer:
+    """Serves status, sync triggers and pushed plays for a local SyncService."""
+
+    def __init__(self, service, address: str):
+        self._service = service
+        self._address = address
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> None:
+        host, port, path = parse_address(self._address)
+        if path:
+            if os.path.exists(path):
+                os.unlink(path)
+            self._server = await asyncio.start_unix_server(self._handle, path=path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+        logger.info("Worker listening on %s", self._address)
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        _, _, path = parse_address(self._address)
+        if path and os.path.exists(path):
+            os.unlink(path)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    response = {"ok": True, "result": await self._dispatch(request)}
+                except Exception as e:
+                    response = {"ok": False, "error": str(e)}
+                writer.write(pydantic_core.to_json(response) + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, request: dict) -> Any:
+        op = request.get("op")
+        if op == "status":
+            return {
+                "status": await self._service.get_status(),
+                "scheduler_running": self._service.scheduler_running,
+                "spotify_authenticated": self._service.spotify_authenticated,
+            }
+        if op == "sync":
+            return await self._service.sync()
+        if op == "ingest":
+            tracks = [Track.model_validate(t) for t in request.get("tracks", [])]
+            return await self._service.ingest(tracks)
+        raise ValueError(f"Unknown op: {op}")
+
+
+class RemoteSyncService(SyncServiceInterface):
+    """SyncService stand-in for the API process that talks to the worker.
+
+    Status answers are reused for ``status_ttl`` seconds so probes and the
+    status endpoint do not turn into a round trip per request.
+    """
+
+    def __init__(self, address: str, status_ttl: float = 1.0, timeout: float = 5.0):
+        self._address = address
+        self._status_ttl = status_ttl
+        self._timeout = timeout
+        self._status: dict = {}
+        self._fetched_at: float | None = None
+        self._scheduler_running = False
+        self._spotify_authenticated = False
+        self._is_running = False
+
+    async def _request(self, op: str, timeout: float | None, **params: Any) -> Any:
+        host, port, path = parse_address(self._address)
+        async with asyncio.timeout(timeout):
+            if path:
+                reader, writer = await asyncio.open_unix_connection(path)
+            else:
+                reader, writer = await asyncio.open_connection(host, port)
+            try:
+                writer.write(pydantic_core.to_json({"op": op, **params}) + b"\n")
+                await writer.drain()
+                response = json.loads(await reader.readline())
+            finally:
+                writer.close()
+        if not response.get("ok"):
+            raise RuntimeError(f"Worker error: {response.get('error')}")
+        return response["result"]
+
+    async def start(self) -> None:
+        logger.info("Using sync worker at %s", self._address)
+
+    async def stop(self) -> None:
+        pass
+
+    async def sync(self) -> dict:
+        self._is_running = True
+        try:
+            return await self._request("sync", timeout=None)
+        finally:
+            self._is_running = False
+            self._fetched_at = None
+
+    async def ingest(self, tracks: list[Track]) -> dict:
+        try:
+            return await self._request("ingest", timeout=None, tracks=tracks)
+        finally:
+            self._fetched_at = None
+
+    async def get_status(self) -> dict:
+        now = time.monotonic()
+        if self._fetched_at is None or now - self._fetched_at >= self._status_ttl:
+            result = await self._request("status", timeout=self._timeout)
+            self._status = result["status"]
+            self._scheduler_running = result["scheduler_running"]
+            self._spotify_authenticated = result["spotify_authenticated"]
+            self._fetched_at = now
+        return self._status
+
+    @property
+    def is_running(self) -> bool:
+        return self._is_running or bool(self._status.get("is_running"))
+
+    @property
+    def scheduler_running(self) -> bool:
+        return self._scheduler_running
+
+    @property
+    def spotify_authenticated(self) -> bool:
+        return self._spotify_authenticated
+
+    @property
+    def status_version(self) -> int:
+        # Changes every status_ttl, matching how long fetched status is reused
+        return int(time.monotonic() / self._status_ttl)
@@ -0,0 +1,109 @@
+"""Write-ahead journal of a sync's playlist writes, for resuming after a crash."""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+import pydantic_core
+from pydantic import ValidationError
+from backend.models import SyncPlan
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingPlan:
+    plan: SyncPlan
+    applied: set[int] = field(default_factory=set)
+    replays: int = 0
+
+    @property
+    def remaining(self) -> list[int]:
+        return [i for i in range(len(self.plan.writes)) if i not in self.applied]
+
+
+class SyncJournal:
+    """Records a sync's plan before any write, then each write as it lands.
+
+    The file holds the plan on its first line, written atomically, followed
+    by one line per applied write and per replay attempt. Every line is
+    fsynced before the next playlist call, so after a crash the file names
+    exactly the writes still to make, and the resolved track IDs they need.
+    A write that reached Spotify just before the crash may be applied
+    again. The journal is removed once the plan is complete. With no path,
+    nothing is journaled.
+    """
+
+    def __init__(self, path: str = ""):
+        self._path = Path(path) if path else None
+
+    @property
+    def enabled(self) -> bool:
+        return self._path is not None
+
+    async def begin(self, plan: SyncPlan) -> None:
+        if self._path:
+            line = pydantic_core.to_json({"plan": plan}) + b"\n"
+            await asyncio.to_thread(self._write_plan, line)
+
+    async def applied(self, index: int) -> None:
+        if self._path:
+            await asyncio.to_thread(self._append, {"applied": index})
+
+    async def replaying(self) -> None:
+        if self._path:
+            await asyncio.to_thread(self._append, {"replay": True})
+
+    async def finish(self) -> None:
+        if self._path:
+            await asyncio.to_thread(self._path.unlink, missing_ok=True)
+
+    async def pending(self) -> Optional[PendingPlan]:
+        """The unfinished plan on disk, or None if the last sync completed."""
+        if self._path is None or not self._path.exists():
+            return None
+        return await asyncio.to_thread(self._read)
+
+    def _write_plan(self, line: bytes) -> None:
+        directory = self._path.parent
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".journal-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self._path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _append(self, record: dict) -> None:
+        with open(self._path, "ab") as f:
+            f.write(json.dumps(record).encode() + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _read(self) -> Optional[PendingPlan]:
+        lines = self._path.read_bytes().splitlines()
+        try:
+            pending = PendingPlan(SyncPlan.model_validate(json.loads(lines[0])["plan"]))
+        except (IndexError, KeyError, ValueError, ValidationError) as e:
+            logger.error("Discarding unreadable sync journal %s: %s", self._path, e)
+            self._path.unlink(missing_ok=True)
+            return None
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A record torn by the crash; the write it marks is redone
+                continue
+            if "applied" in record:
+                pending.applied.add(record["applied"])
+            elif "replay" in record:
+                pending.replays += 1
+        return pending
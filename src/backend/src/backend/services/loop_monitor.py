@@ -0,0 +1,207 @@
+"""Event-loop lag monitoring with attribution of what blocked the loop."""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timedelta
+from backend.log import throttled
+from backend.models import BlockingCall, LoopLagReport, LoopStall
+
+logger = logging.getLogger(__name__)
+hot_logger = throttled(__name__)
+
+# Audit events that mean a blocking network call when raised on the loop thread
+_BLOCKING_EVENTS = {
+    "socket.connect",
+    "socket.getaddrinfo",
+    "socket.gethostbyname",
+    "socket.gethostbyaddr",
+}
+_STACK_DEPTH = 30
+
+_strict_monitor: "LoopMonitor | None" = None
+_audit_hook_installed = False
+
+
+def _audit(event: str, args: tuple) -> None:
+    monitor = _strict_monitor
+    if monitor is None or event not in _BLOCKING_EVENTS:
+        return
+    try:
+        monitor._on_blocking_event(event, args)
+    except Exception:
+        # An audit hook must never break the call it observes
+        pass
+
+
+class LoopMonitor:
+    """Measures how late the event loop wakes up and explains long stalls.
+
+    A ticker task sleeps for ``interval`` and records how much later than
+    that it woke up. A watchdog thread notices when the ticker has not run
+    for more than ``threshold`` and samples the loop thread's stack and
+    current task while the stall is still in progress, which names the
+    blocking call rather than whatever ran after it.
+
+    In strict mode an audit hook also flags blocking network calls (connects
+    on blocking sockets, DNS lookups) made from the loop thread, even when
+    they finish too quickly to register as lag. Audit hooks cannot be
+    removed, so enable it for debugging only.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.1,
+        interval: float | None = None,
+        history: int = 2400,
+        max_events: int = 20,
+        strict: bool = False,
+    ):
+        self._threshold = threshold
+        self._interval = interval or max(threshold / 2, 0.005)
+        self._samples: deque[float] = deque(maxlen=history)
+        self._stalls: deque[LoopStall] = deque(maxlen=max_events)
+        self._blocking_calls: deque[BlockingCall] = deque(maxlen=max_events)
+        self._strict = strict
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: int | None = None
+        self._heartbeat = time.monotonic()
+        self._pending: LoopStall | None = None
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        global _strict_monitor, _audit_hook_installed
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._tick())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        if self._strict:
+            if not _audit_hook_installed:
+                sys.addaudithook(_audit)
+                _audit_hook_installed = True
+            _strict_monitor = self
+            logger.warning("Strict loop monitoring on: blocking socket calls logged")
+
+    async def stop(self) -> None:
+        global _strict_monitor
+        if _strict_monitor is self:
+            _strict_monitor = None
+        self._stopping.set()
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        if self._watchdog:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+    async def _tick(self) -> None:
+        while True:
+            started = time.monotonic()
+            self._heartbeat = started
+            await asyncio.sleep(self._interval)
+            lag = max(time.monotonic() - started - self._interval, 0.0)
+            self._samples.append(lag)
+            with self._lock:
+                stall, self._pending = self._pending, None
+            if stall is not None:
+                stall.duration = round(lag, 4)
+                self._stalls.append(stall)
+                logger.warning(
+                    "Event loop blocked for %.0fms in %s",
+                    lag * 1000,
+                    stall.task or "unknown task",
+                )
+
+    def _watch(self) -> None:
+        while not self._stopping.wait(self._interval):
+            behind = time.monotonic() - self._heartbeat - self._interval
+            if behind <= self._threshold:
+                continue
+            with self._lock:
+                if self._pending is None:
+                    self._pending = self._capture(behind)
+
+    def _capture(self, behind: float) -> LoopStall:
+        frame = sys._current_frames().get(self._loop_thread)
+        stack = traceback.format_stack(frame)[-_STACK_DEPTH:] if frame else []
+        return LoopStall(
+            started_at=datetime.utcnow() - timedelta(seconds=behind),
+            duration=round(behind, 4),
+            task=self._current_task_name(),
+            stack=[line.rstrip() for line in stack],
+        )
+
+    def _current_task_name(self) -> str | None:
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            return None
+        if task is None:
+            return None
+        coro = task.get_coro()
+        return f"{task.get_name()} ({getattr(coro, '__qualname__', coro)})"
+
+    def _on_blocking_event(self, event: str, args: tuple) -> None:
+        if threading.get_ident() != self._loop_thread:
+            return
+        if event == "socket.connect":
+            sock, address = args
+            if sock.gettimeout() == 0.0:
+                # Non-blocking, as used by asyncio itself
+                return
+            detail = str(address)
+        else:
+            detail = str(args[0])
+        stack = traceback.format_stack()[-_STACK_DEPTH:-2]
+        self._blocking_calls.append(
+            BlockingCall(
+                at=datetime.utcnow(),
+                event=event,
+                detail=detail,
+                stack=[line.rstrip() for line in stack],
+            )
+        )
+        hot_logger.warning("Blocking %s(%s) on the event loop thread", event, detail)
+
+    def report(self) -> LoopLagReport:
+        samples = sorted(self._samples)
+
+        def percentile(q: float) -> float:
+            if not samples:
+                return 0.0
+            return round(samples[min(int(q * len(samples)), len(samples) - 1)], 4)
+
+        return LoopLagReport(
+            running=self.running,
+            samples=len(samples),
+            p50=percentile(0.5),
+            p90=percentile(0.9),
+            p99=percentile(0.99),
+            max=round(samples[-1], 4) if samples else 0.0,
+            threshold=self._threshold,
+            strict=self._strict,
+            stalls=list(self._stalls),
+            blocking_calls=list(self._blocking_calls),
+        )
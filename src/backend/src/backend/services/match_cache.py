@@ -0,0 +1,136 @@
+"""Persistent cache of XM track to Spotify ID matches."""
+
+import re
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    key TEXT PRIMARY KEY,
+    track_id TEXT,
+    resolved_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS matches_track_id ON matches (track_id);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_SPACES = re.compile(r"\s+")
+
+
+def match_key(title: str, artist: str) -> str:
+    """Normalised lookup key, so case and spacing differences share an entry."""
+    return "\x1f".join(_SPACES.sub(" ", s).strip().casefold() for s in (artist, title))
+
+
+class MatchCache:
+    """SQLite-backed map of (title, artist) to a Spotify track ID.
+
+    Misses are cached too, as a NULL ID, so tracks Spotify does not carry are
+    not searched on every sync; they expire after ``miss_ttl`` seconds so new
+    releases are eventually picked up. An empty ``path`` keeps the cache in
+    memory for the life of the process. Lookups take well under a millisecond
+    and are made directly from the event loop. ``resolved_at`` is when a
+    match was last confirmed, by a search or by revalidation.
+    """
+
+    def __init__(self, path: str = "", miss_ttl: float = 86400):
+        self._miss_ttl = miss_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        if path:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def lookup(self, title: str, artist: str) -> tuple[bool, Optional[str]]:
+        """Return ``(found, track_id)``; a found entry with no ID is a known miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT track_id, resolved_at FROM matches WHERE key = ?",
+                (match_key(title, artist),),
+            ).fetchone()
+        if row is None:
+            return False, None
+        track_id, resolved_at = row
+        if track_id is None and time.time() - resolved_at > self._miss_ttl:
+            return False, None
+        return True, track_id
+
+    def __contains__(self, item: tuple[str, str]) -> bool:
+        return self.lookup(*item)[0]
+
+    def put(self, title: str, artist: str, track_id: Optional[str]) -> None:
+        self.put_many([(title, artist, track_id)])
+
+    def put_many(self, matches: Iterable[tuple[str, str, Optional[str]]]) -> None:
+        now = time.time()
+        rows = [(match_key(t, a), tid, now) for t, a, tid in matches]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO matches VALUES (?, ?, ?)", rows
+            )
+
+    def stale_ids(self, older_than: float, limit: int) -> list[str]:
+        """Matched IDs last confirmed before ``older_than``, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT track_id FROM matches WHERE track_id IS NOT NULL "
+                "GROUP BY track_id HAVING MAX(resolved_at) < ? "
+                "ORDER BY MAX(resolved_at) LIMIT ?",
+                (older_than, limit),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def confirm(self, track_ids: Iterable[str]) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE matches SET resolved_at = ? WHERE track_id = ?",
+                [(now, tid) for tid in track_ids],
+            )
+
+    def relink(self, relinked: dict[str, str]) -> None:
+        """Point matches at the IDs Spotify now serves in their place."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE matches SET track_id = ?, resolved_at = ? WHERE track_id = ?",
+                [(new, now, old) for old, new in relinked.items()],
+            )
+
+    def evict_ids(self, track_ids: Iterable[str]) -> None:
+        """Drop matches to these IDs so the tracks are searched again."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM matches WHERE track_id = ?",
+                [(tid,) for tid in track_ids],
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+
+    def get_meta(self, name: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE name = ?", (name,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, name: str, value: Optional[str]) -> None:
+        with self._lock, self._conn:
+            if value is None:
+                self._conn.execute("DELETE FROM meta WHERE name = ?", (name,))
+            else:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES (?, ?)", (name, value)
+                )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
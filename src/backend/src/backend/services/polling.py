@@ -0,0 +1,91 @@
+"""Adaptive polling policy driven by each station's observed play rate."""
+
+import random
+import time
+
+
+class StationRate:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.rate: float | None = None
+        self.last_fetch: float | None = None
+
+
+class AdaptivePollingPolicy:
+    """Learns a station's new-play rate and picks the delay until the next poll.
+
+    The rate is an exponentially weighted moving average of new plays per
+    second across fetches. While plays keep arriving the interval tightens to
+    the time the station needs to produce ``target_plays`` new tracks, so the
+    fetch window never overflows; when a fetch finds nothing new the interval
+    backs off exponentially. Intervals stay within ``[min_interval,
+    max_interval]`` and every delay is jittered so stations polled by the same
+    process drift apart instead of firing together.
+    """
+
+    def __init__(
+        self,
+        initial_interval: float,
+        min_interval: float,
+        max_interval: float,
+        target_plays: int,
+        backoff_factor: float = 2.0,
+        jitter: float = 0.1,
+        smoothing: float = 0.3,
+    ):
+        self._min = min_interval
+        self._max = max(max_interval, min_interval)
+        self._initial = min(max(initial_interval, self._min), self._max)
+        self._target_plays = max(target_plays, 1)
+        self._backoff = backoff_factor
+        self._jitter = jitter
+        self._smoothing = smoothing
+        self._stations: dict[str, StationRate] = {}
+
+    def _state(self, station: str) -> StationRate:
+        if station not in self._stations:
+            self._stations[station] = StationRate(self._initial)
+        return self._stations[station]
+
+    def record(
+        self,
+        station: str,
+        new_plays: int,
+        window_full: bool = False,
+        now: float | None = None,
+    ) -> None:
+        """Feed the number of new plays seen by a fetch of ``station``.
+
+        ``window_full`` marks a fetch where every returned track was new, so
+        plays were probably missed and the measured rate is a lower bound.
+        """
+        now = time.monotonic() if now is None else now
+        state = self._state(station)
+        previous, state.last_fetch = state.last_fetch, now
+        if previous is None or now <= previous:
+            # Nothing to measure a rate against yet
+            return
+        sample = new_plays / (now - previous)
+        if state.rate is None:
+            state.rate = sample
+        else:
+            state.rate = self._smoothing * sample + (1 - self._smoothing) * state.rate
+
+        if window_full:
+            interval = min(
+                state.interval / self._backoff, self._target_plays / state.rate
+            )
+        elif new_plays > 0 and state.rate:
+            interval = self._target_plays / state.rate
+        else:
+            interval = state.interval * self._backoff
+        state.interval = min(max(interval, self._min), self._max)
+
+    def interval(self, station: str) -> float:
+        """Current learned interval for ``station``, without jitter."""
+        return self._state(station).interval
+
+    def next_delay(self, station: str) -> float:
+        """Seconds until ``station`` should be polled again, jittered."""
+        spread = 1 + random.uniform(-self._jitter, self._jitter)
+        return min(max(self._state(station).interval * spread, self._min), self._max)
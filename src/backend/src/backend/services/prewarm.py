@@ -0,0 +1,195 @@
+"""Bulk pre-warming of the match cache from history, playlists and files."""
+
+import asyncio
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+from backend.log import throttled
+from backend.models import Track
+from backend.providers import SpotifyProvider, XMRadioProvider
+from backend.services.match_cache import match_key
+from backend.services.resolver import TrackResolver
+
+# Per-track messages, rate-limited so volume does not scale log cost
+hot_logger = throttled(__name__)
+
+
+@dataclass
+class PrewarmStats:
+    seen: int = 0
+    cached: int = 0
+    resolved: int = 0
+    missed: int = 0
+    errors: int = 0
+    seeded: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def throughput(self) -> float:
+        """Tracks searched per second."""
+        done = self.resolved + self.missed + self.errors
+        return done / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class Prewarmer:
+    """Resolves batches of tracks into the match cache in parallel.
+
+    At most ``concurrency`` searches are in flight, and new ones start no
+    faster than ``rate`` per second. A failed search (throttling, an open
+    circuit) pauses every worker with an exponential backoff, so the run
+    slows down instead of burning through the list. Tracks already in the
+    cache are skipped, which makes an interrupted run resumable.
+    """
+
+    def __init__(
+        self,
+        resolver: TrackResolver,
+        concurrency: int = 8,
+        rate: float = 10.0,
+        max_backoff: float = 60.0,
+        progress: Optional[Callable[[PrewarmStats], None]] = None,
+    ):
+        self._resolver = resolver
+        self._cache = resolver.cache
+        self._concurrency = max(concurrency, 1)
+        self._interval = 1 / rate if rate > 0 else 0.0
+        self._max_backoff = max_backoff
+        self._progress = progress
+        self._next_start = 0.0
+        self._paused_until = 0.0
+        self._backoff = 0.0
+        self._last_report = 0.0
+        self._pending: set[str] = set()
+        self.stats = PrewarmStats()
+
+    async def _pace(self) -> None:
+        while True:
+            now = time.monotonic()
+            wait = max(self._next_start, self._paused_until) - now
+            if wait <= 0:
+                self._next_start = now + self._interval
+                return
+            await asyncio.sleep(wait)
+
+    async def _resolve(self, track: Track) -> None:
+        await self._pace()
+        track_id = await self._resolver.resolve(track)
+        if track_id:
+            self.stats.resolved += 1
+        elif (track.title, track.primary_artist) in self._cache:
+            self.stats.missed += 1
+        else:
+            self.stats.errors += 1
+            self._backoff = min(max(self._backoff * 2, 1.0), self._max_backoff)
+            self._paused_until = time.monotonic() + self._backoff
+            hot_logger.warning("Search failed; pausing for %.1fs", self._backoff)
+            return
+        self._backoff = 0.0
+
+    async def run(self, tracks: Iterable[Track]) -> None:
+        """Resolve every track not already cached."""
+        queue: asyncio.Queue[Track] = asyncio.Queue()
+        for track in tracks:
+            self.stats.seen += 1
+            key = match_key(track.title, track.primary_artist)
+            if (
+                key in self._pending
+                or (track.title, track.primary_artist) in self._cache
+            ):
+                self.stats.cached += 1
+                continue
+            self._pending.add(key)
+            queue.put_nowait(track)
+
+        async def worker() -> None:
+            while not queue.empty():
+                track = queue.get_nowait()
+                try:
+                    await self._resolve(track)
+                finally:
+                    self._pending.discard(match_key(track.title, track.primary_artist))
+                    self._report()
+
+        await asyncio.gather(
+            *(worker() for _ in range(min(self._concurrency, queue.qsize())))
+        )
+        await self._resolver.catalog.save_if_due()
+        self._report(force=True)
+
+    def _report(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if self._progress and (force or now - self._last_report >= 1.0):
+            self._last_report = now
+            self._progress(self.stats)
+
+    async def warm_station(
+        self,
+        xm_provider: XMRadioProvider,
+        station: str,
+        pages: int,
+        restart: bool = False,
+    ) -> None:
+        """Walk back through ``pages`` pages of history, resuming where a
+        previous run stopped unless ``restart`` is set."""
+        cursor_key = f"prewarm:xm:{station}"
+        cursor = None if restart else self._cache.get_meta(cursor_key)
+        complete = True
+        for _ in range(pages):
+            tracks, next_cursor = await xm_provider.get_history_page(station, cursor)
+            errors = self.stats.errors
+            await self.run(tracks)
+            # Only move the saved cursor past pages that are fully cached
+            complete = complete and self.stats.errors == errors
+            if complete:
+                self._cache.set_meta(cursor_key, next_cursor)
+            if not next_cursor:
+                break
+            cursor = next_cursor
+
+    async def warm_playlist(
+        self, spotify_provider: SpotifyProvider, playlist_id: str
+    ) -> None:
+        """Seed matches from an existing playlist's own track metadata.
+
+        Each page is looked up as soon as it arrives while later pages load.
+        """
+        seen: set[str] = set()
+        async for page in spotify_provider.iter_playlist_tracks(playlist_id):
+            new_ids = [tid for tid in dict.fromkeys(page) if tid not in seen]
+            seen.update(new_ids)
+            tracks = await spotify_provider.get_tracks(new_ids)
+            self._cache.put_many(
+                (t.track.title, t.track.primary_artist, t.spotify_id) for t in tracks
+            )
+            self._resolver.catalog.add(tracks)
+            await self._resolver.catalog.save_if_due()
+            self.stats.seen += len(page)
+            self.stats.seeded += len(tracks)
+            self._report()
+        self._report(force=True)
+
+
+def read_track_file(path: str) -> list[Track]:
+    """Tracks from a CSV (``title`` and ``artist`` columns) or a JSON list."""
+    file = Path(path)
+    if file.suffix.lower() == ".json":
+        rows = json.loads(file.read_text())
+    else:
+        with file.open(newline="") as f:
+            rows = list(csv.DictReader(f))
+    tracks = []
+    for row in rows:
+        artists = row.get("artists") or row.get("artist") or []
+        if isinstance(artists, str):
+            # Artist names can contain commas, so a string is kept whole
+            artists = [artists]
+        if row.get("title") and artists:
+            tracks.append(Track(title=row["title"], artists=artists))
+    return tracks
@@ -0,0 +1,203 @@
+"""On-demand CPU sampling and allocation tracing for the running process."""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Literal
+from backend.models import MemoryReport, MemoryStat
+
+logger = logging.getLogger(__name__)
+
+_STACK_DEPTH = 64
+
+GroupBy = Literal["lineno", "filename", "traceback"]
+DiffAgainst = Literal["", "start", "last"]
+
+
+def _location(filename: str, lineno: int | None = None) -> str:
+    # The last two path parts name the module without the install prefix
+    short = "/".join(filename.replace(os.sep, "/").split("/")[-2:])
+    return f"{short}:{lineno}" if lineno is not None else short
+
+
+def _fold(frame, depth: int = _STACK_DEPTH) -> list[str]:
+    """Frame labels from the outermost call inwards."""
+    labels = []
+    while frame is not None and len(labels) < depth:
+        code = frame.f_code
+        label = (
+            f"{code.co_qualname} ({_location(code.co_filename, code.co_firstlineno)})"
+        )
+        labels.append(label.replace(";", ":"))
+        frame = frame.f_back
+    return labels[::-1]
+
+
+class SamplingProfiler:
+    """Statistical CPU profiler that samples thread stacks from a side thread.
+
+    Every ``interval`` the sampler records each thread's current stack
+    through ``sys._current_frames``; nothing is instrumented, so the cost
+    is one stack walk per thread per sample and the process runs normally
+    in between. Output is in the folded format (``a;b;c count`` per line)
+    read by flamegraph.pl, speedscope and most flame graph viewers. Time
+    the loop spends waiting shows up under the selector's ``select``.
+    """
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    async def profile(
+        self, seconds: float, interval: float = 0.005, loop_only: bool = False
+    ) -> tuple[str, int]:
+        """Sample for ``seconds``; return the folded stacks and the sample count."""
+        only = threading.get_ident() if loop_only else None
+        async with self._lock:
+            logger.info("Profiling for %ss at %sms intervals", seconds, interval * 1000)
+            stacks, samples = await asyncio.to_thread(
+                self._sample, seconds, interval, only
+            )
+        lines = [f"{stack} {count}" for stack, count in stacks.most_common()]
+        return "\n".join(lines) + "\n" if lines else "", samples
+
+    @staticmethod
+    def _sample(
+        seconds: float, interval: float, only: int | None
+    ) -> tuple[Counter[str], int]:
+        me = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        stacks: Counter[str] = Counter()
+        samples = 0
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            for ident, frame in sys._current_frames().items():
+                if ident == me or (only is not None and ident != only):
+                    continue
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                thread = names.get(ident, f"thread-{ident}")
+                stacks[";".join([thread, *_fold(frame)])] += 1
+            samples += 1
+            time.sleep(interval)
+        return stacks, samples
+
+
+class MemoryTracer:
+    """tracemalloc session with snapshots that can be diffed.
+
+    Tracing slows every allocation, so it only runs between ``start`` and
+    ``stop``. Each report can be compared with the snapshot taken at start
+    or with the previous report's, which is how a leak or a hot allocation
+    site under load stands out.
+    """
+
+    def __init__(self):
+        self._start: tracemalloc.Snapshot | None = None
+        self._last: tracemalloc.Snapshot | None = None
+        self._started_here = False
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    async def start(self, frames: int = 10) -> MemoryReport:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            self._started_here = True
+            logger.warning("Allocation tracing on (%s frames)", frames)
+        self._start = self._last = await asyncio.to_thread(self._take)
+        return self._report([], None)
+
+    def stop(self) -> MemoryReport:
+        """Stop tracing; the report carries the final current and peak sizes."""
+        report = self._report([], None)
+        if self._started_here:
+            tracemalloc.stop()
+            report.tracing = False
+            self._started_here = False
+            logger.info("Allocation tracing off")
+        self._start = self._last = None
+        return report
+
+    async def snapshot(
+        self,
+        limit: int = 25,
+        group_by: GroupBy = "lineno",
+        diff: DiffAgainst = "",
+        include: str = "",
+    ) -> MemoryReport:
+        """Top allocation sites, optionally as growth since an earlier snapshot."""
+        snapshot = await asyncio.to_thread(self._take)
+        base = {"start": self._start, "last": self._last}.get(diff)
+        self._last = snapshot
+        if include:
+            pattern = [tracemalloc.Filter(True, f"*{include}*", all_frames=True)]
+            snapshot = snapshot.filter_traces(pattern)
+            base = base.filter_traces(pattern) if base else None
+        if base is not None:
+            stats = [
+                MemoryStat(
+                    location=self._where(stat.traceback, group_by),
+                    size=stat.size,
+                    count=stat.count,
+                    size_diff=stat.size_diff,
+                    count_diff=stat.count_diff,
+                    traceback=self._frames(stat.traceback, group_by),
+                )
+                for stat in snapshot.compare_to(base, group_by)[:limit]
+            ]
+        else:
+            stats = [
+                MemoryStat(
+                    location=self._where(stat.traceback, group_by),
+                    size=stat.size,
+                    count=stat.count,
+                    traceback=self._frames(stat.traceback, group_by),
+                )
+                for stat in snapshot.statistics(group_by)[:limit]
+            ]
+        return self._report(stats, diff or None)
+
+    @staticmethod
+    def _take() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<unknown>"),
+            ]
+        )
+
+    @staticmethod
+    def _where(traceback: tracemalloc.Traceback, group_by: GroupBy) -> str:
+        # Frames run oldest first, so the allocation site is the last one
+        frame = traceback[-1]
+        return _location(
+            frame.filename, None if group_by == "filename" else frame.lineno
+        )
+
+    @staticmethod
+    def _frames(traceback: tracemalloc.Traceback, group_by: GroupBy) -> list[str]:
+        if group_by != "traceback":
+            return []
+        return [_location(f.filename, f.lineno) for f in traceback]
+
+    def _report(self, stats: list[MemoryStat], compared_to: str | None) -> MemoryReport:
+        current, peak = tracemalloc.get_traced_memory()
+        return MemoryReport(
+            tracing=tracemalloc.is_tracing(),
+            frames=tracemalloc.get_traceback_limit(),
+            current=current,
+            peak=peak,
+            compared_to=compared_to,
+            stats=stats,
+        )
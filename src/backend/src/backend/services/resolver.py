@@ -0,0 +1,63 @@
+"""Resolution of XM tracks to Spotify IDs through the match cache."""
+
+from typing import Optional
+from backend.core.interfaces import TrackSearchInterface
+from backend.log import throttled
+from backend.models import Track
+from backend.services.catalog import CatalogIndex
+from backend.services.match_cache import MatchCache
+
+hot_logger = throttled(__name__)
+
+
+class TrackResolver:
+    """Answers from the match cache, then the local catalog, then a search.
+
+    Search results, including misses, are written back to the cache.
+    Catalog matches are not: they are inferred rather than confirmed by a
+    search, and are cheap to recompute, so a catalog entry later removed or
+    repointed by revalidation takes effect on the next play. Every search
+    candidate is added to the catalog, so later spelling variants of the
+    same track resolve without an API call. A search that fails outright
+    (rather than finding nothing) is not cached.
+    """
+
+    def __init__(
+        self,
+        searcher: TrackSearchInterface,
+        cache: MatchCache,
+        catalog: CatalogIndex | None = None,
+    ):
+        self._searcher = searcher
+        self._cache = cache
+        self._catalog = catalog if catalog is not None else CatalogIndex()
+
+    @property
+    def cache(self) -> MatchCache:
+        return self._cache
+
+    @property
+    def catalog(self) -> CatalogIndex:
+        return self._catalog
+
+    async def resolve(self, track: Track) -> Optional[str]:
+        found, track_id = self._cache.lookup(track.title, track.primary_artist)
+        if found:
+            return track_id
+        match = self._catalog.match(
+            track.title, track.primary_artist, track.duration_ms
+        )
+        if match:
+            hot_logger.debug("Catalog match for %s (score %.2f)", track, match.score)
+            return match.entry.track_id
+        try:
+            candidates = await self._searcher.search_tracks(
+                track.title, track.primary_artist
+            )
+        except Exception:
+            # Logged by the provider; left uncached so the next sync retries
+            return None
+        self._catalog.add(candidates)
+        track_id = candidates[0].spotify_id if candidates else None
+        self._cache.put(track.title, track.primary_artist, track_id)
+        return track_id
@@ -0,0 +1,85 @@
+"""Background revalidation of cached Spotify IDs."""
+
+import logging
+import time
+from collections import deque
+from backend.core.interfaces import TrackSearchInterface
+from backend.services.catalog import CatalogIndex
+from backend.services.match_cache import MatchCache
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50
+
+
+class MatchRevalidator:
+    """Rechecks cached matches in batches of 50 IDs per lookup call.
+
+    Matches not confirmed for ``max_age`` seconds are looked up, oldest
+    first, in the configured market. Playable IDs are confirmed, relinked
+    ones are repointed at the ID Spotify substitutes, and unavailable ones
+    are evicted so the track is searched again on its next play. The
+    catalog, when given, is updated in the same step, so it cannot hand an
+    evicted ID back. At most ``calls_per_hour`` lookups are made in any
+    rolling hour, and each run spends at most ``calls_per_run`` of them so
+    the budget is spread out.
+    """
+
+    def __init__(
+        self,
+        searcher: TrackSearchInterface,
+        cache: MatchCache,
+        calls_per_hour: int,
+        calls_per_run: int,
+        max_age: float,
+        market: str = "from_token",
+        catalog: CatalogIndex | None = None,
+    ):
+        self._searcher = searcher
+        self._cache = cache
+        self._catalog = catalog
+        self._calls_per_hour = calls_per_hour
+        self._calls_per_run = max(calls_per_run, 1)
+        self._max_age = max_age
+        self._market = market
+        self._calls: deque[float] = deque()
+
+    def budget_left(self) -> int:
+        cutoff = time.monotonic() - 3600
+        while self._calls and self._calls[0] < cutoff:
+            self._calls.popleft()
+        return max(self._calls_per_hour - len(self._calls), 0)
+
+    async def run(self) -> dict[str, int]:
+        stats = {"checked": 0, "confirmed": 0, "relinked": 0, "evicted": 0}
+        for _ in range(self._calls_per_run):
+            if not self.budget_left():
+                break
+            track_ids = self._cache.stale_ids(time.time() - self._max_age, BATCH_SIZE)
+            if not track_ids:
+                break
+            self._calls.append(time.monotonic())
+            playable = await self._searcher.check_tracks(track_ids, self._market)
+
+            confirmed = [tid for tid, new in playable.items() if new == tid]
+            relinked = {tid: new for tid, new in playable.items() if new and new != tid}
+            dead = [tid for tid, new in playable.items() if new is None]
+            self._cache.confirm(confirmed)
+            self._cache.relink(relinked)
+            self._cache.evict_ids(dead)
+            if self._catalog is not None:
+                self._catalog.relink(relinked)
+                self._catalog.remove(dead)
+
+            stats["checked"] += len(track_ids)
+            stats["confirmed"] += len(confirmed)
+            stats["relinked"] += len(relinked)
+            stats["evicted"] += len(dead)
+        if stats["checked"]:
+            logger.info(
+                "Revalidated %d cached matches: %d relinked, %d evicted",
+                stats["checked"],
+                stats["relinked"],
+                stats["evicted"],
+            )
+        return stats
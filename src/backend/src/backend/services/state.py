@@ -0,0 +1,224 @@
+"""Sync state shared between processes serving the same playlists."""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class LeaseLostError(Exception):
+    """Raised when work guarded by a lease finds another holder has taken it."""
+
+
+class StateStore:
+    """Versioned JSON documents and expiring leases in SQLite.
+
+    Status, play history and job locks live here instead of on the
+    SyncService, so every API worker answers from, and coordinates through,
+    the same state. An empty ``path`` keeps the store in memory, which is
+    only shared within the process. With a file path, any number of
+    processes on the host can open it.
+
+    Writes may wait up to ``busy_timeout`` for another process to release
+    the database, so they are coroutines that run the SQLite calls in a
+    worker thread, as the sync journal does. Reads stay synchronous for
+    the status endpoints: with a file they use their own connection, and
+    WAL mode lets them proceed while another connection writes.
+    """
+
+    def __init__(self, path: str = "", busy_timeout: float = 5.0):
+        self._lock = threading.Lock()
+        self._conn = self._connect(path, busy_timeout)
+        if path:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # An in-memory database exists only on the connection that made it
+        self._read_lock = threading.Lock() if path else self._lock
+        self._reader = self._connect(path, busy_timeout) if path else self._conn
+
+    @staticmethod
+    def _connect(path: str, busy_timeout: float) -> sqlite3.Connection:
+        return sqlite3.connect(
+            path or ":memory:",
+            timeout=busy_timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+
+    def _read(self, sql: str, params: tuple) -> Optional[tuple]:
+        with self._read_lock:
+            return self._reader.execute(sql, params).fetchone()
+
+    def get(self, key: str) -> tuple[int, Optional[dict]]:
+        """Return ``(version, value)``; a missing document is ``(0, None)``."""
+        row = self._read("SELECT version, value FROM documents WHERE key = ?", (key,))
+        if row is None:
+            return 0, None
+        return row[0], json.loads(row[1])
+
+    def version(self, key: str) -> int:
+        """Counter bumped on every write to ``key``, for response caching."""
+        row = self._read("SELECT version FROM documents WHERE key = ?", (key,))
+        return row[0] if row else 0
+
+    async def update(self, key: str, apply: Callable[[dict], dict]) -> int:
+        """Replace ``key`` with ``apply(current)`` atomically; return the new version.
+
+        The write lock is taken before the read, so concurrent updates from
+        other processes are applied one after another, not lost. ``apply``
+        runs in the worker thread.
+        """
+        return await asyncio.to_thread(self._update, key, apply)
+
+    def _update(self, key: str, apply: Callable[[dict], dict]) -> int:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT version, value FROM documents WHERE key = ?", (key,)
+                ).fetchone()
+                version = row[0] + 1 if row else 1
+                value = apply(json.loads(row[1]) if row else {})
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO documents VALUES (?, ?, ?)",
+                    (key, json.dumps(value), version),
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return version
+
+    async def acquire(self, name: str, owner: str, ttl: float) -> bool:
+        """Take or renew lease ``name`` for ``ttl`` seconds.
+
+        Succeeds when the lease is free, expired or already ``owner``'s.
+        """
+        return await asyncio.to_thread(self._acquire, name, owner, ttl)
+
+    def _acquire(self, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO leases VALUES (?, ?, ?) ON CONFLICT (name) DO UPDATE "
+                "SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE leases.owner = excluded.owner OR leases.expires_at < ?",
+                (name, owner, now + ttl, now),
+            )
+        return cursor.rowcount == 1
+
+    async def release(self, name: str, owner: str) -> None:
+        await asyncio.to_thread(self._release, name, owner)
+
+    def _release(self, name: str, owner: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner)
+            )
+
+    def holder(self, name: str) -> Optional[str]:
+        """Current owner of lease ``name``, or None if it is free or expired."""
+        row = self._read(
+            "SELECT owner FROM leases WHERE name = ? AND expires_at >= ?",
+            (name, time.time()),
+        )
+        return row[0] if row else None
+
+    def close(self) -> None:
+        with self._read_lock:
+            if self._reader is not self._conn:
+                self._reader.close()
+        with self._lock:
+            self._conn.close()
+
+
+class Lease:
+    """One holder's claim on a named lease, such as a job lock.
+
+    A holder that dies without releasing simply stops renewing, and the
+    lease is free again ``ttl`` seconds later.
+    """
+
+    def __init__(self, store: StateStore, name: str, ttl: float):
+        self.name = name
+        self.owner = uuid.uuid4().hex
+        self._store = store
+        self._ttl = ttl
+        self._held = False
+
+    @property
+    def held(self) -> bool:
+        """Whether the last acquire succeeded; it may have lapsed since."""
+        return self._held
+
+    async def acquire(self) -> bool:
+        self._held = await self._store.acquire(self.name, self.owner, self._ttl)
+        return self._held
+
+    def check(self) -> None:
+        """Raise ``LeaseLostError`` unless the lease is still held."""
+        if not self._held:
+            raise LeaseLostError(f"Lease {self.name} is no longer held")
+
+    async def release(self) -> None:
+        if self._held:
+            self._held = False
+            await self._store.release(self.name, self.owner)
+
+    @asynccontextmanager
+    async def renewing(self) -> AsyncIterator[None]:
+        """Keep an acquired lease alive for the duration of the block.
+
+        If a renewal finds another holder has taken the lease over, renewing
+        stops and ``held`` turns false; the block should ``check`` before
+        any step the other holder may also be taking.
+        """
+
+        done = asyncio.Event()
+
+        async def renew() -> None:
+            while True:
+                try:
+                    await asyncio.wait_for(done.wait(), self._ttl / 3)
+                    return
+                except TimeoutError:
+                    pass
+                try:
+                    if await self.acquire():
+                        continue
+                except sqlite3.Error:
+                    # Store busy; the next attempt still falls within the TTL
+                    continue
+                logger.error("Lease %s was taken over by another holder", self.name)
+                return
+
+        task = asyncio.create_task(renew())
+        try:
+            yield
+        finally:
+            # Not cancelled: a renewal already in its thread would still
+            # land, possibly after the release below
+            done.set()
+            await task
+            await self.release()
@@ -1,137 +1,623 @@
 """Sync service for XM to Spotify synchronization."""
 
+import asyncio
 import logging
 from datetime import datetime, timedelta
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable, Optional
+import pydantic_core
 from backend.config import Settings
 from backend.core.interfaces import MusicProviderInterface, TrackSourceInterface
-from backend.models import SyncResult, SyncStatus
+from backend.core.resilience import deadline, deadline_exceeded
+from backend.models import PlaylistWrite, SyncPlan, SyncResult, SyncStatus, Track
+from backend.services.catalog import CatalogIndex
+from backend.services.journal import SyncJournal
+from backend.services.match_cache import MatchCache
+from backend.services.polling import AdaptivePollingPolicy
+from backend.services.resolver import TrackResolver
+from backend.services.revalidation import MatchRevalidator
+from backend.services.state import Lease, StateStore
+
+if TYPE_CHECKING:
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 logger = logging.getLogger(__name__)
 
+# Spotify accepts at most 100 tracks per playlist write
+_WRITE_BATCH = 100
+# Replays of one interrupted plan before it is given up as unappliable
+_MAX_REPLAYS = 3
+# Untimestamped pushed plays remembered until a poll reports them
+_PUSHED_KEYS = 50
+
+
+def _batches(track_ids: list[str]) -> list[list[str]]:
+    return [
+        track_ids[i : i + _WRITE_BATCH] for i in range(0, len(track_ids), _WRITE_BATCH)
+    ]
+
+
+def _rolling_additions(
+    current: list[Optional[str]], played: list[str], max_size: int
+) -> list[str]:
+    """Return the played tracks to append to a rolling playlist, in play order.
+
+    A track already on the playlist is skipped only if its entry survives the
+    trim that makes room for the others; one whose entry is trimmed is
+    appended again. Each addition can trim another entry, so this repeats
+    until the trim stops growing.
+    """
+    latest = {tid: position for position, tid in enumerate(current) if tid}
+    played = list(dict.fromkeys(played))
+    excess = 0
+    while True:
+        to_add = [tid for tid in played if latest.get(tid, -1) < excess][-max_size:]
+        trimmed = len(current) + len(to_add) - max_size
+        if trimmed <= excess:
+            return to_add
+        excess = trimmed
+
+
+def _mark_plays(
+    plays: dict, station: str, tracks: list[Track], from_poll: bool
+) -> list[Track]:
+    """Mark ``tracks`` seen in the ``plays`` document; return those that are new.
+
+    A pushed play (``from_poll=False``) with no upstream timestamp is new
+    but leaves ``last_seen`` alone, since the time it was received says
+    nothing about what XM has played; the poll that later reports it with
+    XM's timestamp skips it instead.
+    """
+    new_tracks: list[Track] = []
+    last_seen = plays.get("last_seen", {}).get(station)
+    pushed = plays.setdefault("pushed_keys", {}).setdefault(station, [])
+    stamps = [t.timestamp for t in tracks if t.timestamp]
+    if stamps or not from_poll:
+        newer = datetime.fromisoformat(last_seen) if last_seen else None
+        for t in tracks:
+            if t.timestamp is None:
+                if not from_poll:
+                    new_tracks.append(t)
+                    pushed.append(str(t))
+            elif newer is None or t.timestamp > newer:
+                if from_poll and str(t) in pushed:
+                    pushed.remove(str(t))
+                else:
+                    new_tracks.append(t)
+        del pushed[:-_PUSHED_KEYS]
+        if stamps:
+            plays.setdefault("last_seen", {})[station] = max(stamps).isoformat()
+    else:
+        # No timestamps to compare; fall back to the set of tracks returned
+        seen = set(plays.get("last_keys", {}).get(station, []))
+        new_tracks.extend(t for t in tracks if (t.source_id or str(t)) not in seen)
+        plays.setdefault("last_keys", {})[station] = sorted(
+            {t.source_id or str(t) for t in tracks}
+        )
+    return new_tracks
+
+
+def stored_status(state: StateStore, playlist_id: str) -> dict:
+    """Status of the sync for ``playlist_id``, whichever process ran it."""
+    _, value = state.get(f"status:{playlist_id}")
+    status = SyncStatus.model_validate(value or {})
+    # A run whose process died keeps its flag until the lock expires
+    status.is_running = status.is_running and bool(state.holder(f"sync:{playlist_id}"))
+    return status.model_dump()
+
 
 class SyncService:
+    """Keeps one Spotify playlist in step with one XM station.
+
+    Status, recent plays and the run lock are kept in ``state``. When
+    several processes share a file-backed store, each can serve status and
+    take manual syncs, only one runs at a time, and only the holder of the
+    scheduler lease runs scheduled jobs; another takes over within
+    ``state_lease_ttl`` seconds if it goes away.
+    """
+
     def __init__(
         self,
         track_source: TrackSourceInterface,
         music_provider: MusicProviderInterface,
         settings: Settings,
+        match_cache: MatchCache | None = None,
+        catalog: CatalogIndex | None = None,
+        state: StateStore | None = None,
     ):
         self._track_source = track_source
         self._music_provider = music_provider
         self._settings = settings
-        self._scheduler = AsyncIOScheduler()
+        self._state = state or StateStore(settings.state_path)
+        self._journal = SyncJournal(settings.sync_journal_path)
+        playlist_id = settings.spotify_playlist_id
+        self._status_key = f"status:{playlist_id}"
+        self._plays_key = f"plays:{playlist_id}"
+        self._lock = Lease(self._state, f"sync:{playlist_id}", settings.state_lease_ttl)
+        self._leader = Lease(
+            self._state, f"scheduler:{playlist_id}", settings.state_lease_ttl
+        )
+        # An empty cache or catalog is falsy, so test for None explicitly
+        if match_cache is None:
+            match_cache = MatchCache(
+                settings.match_cache_path, settings.match_cache_miss_ttl
+            )
+        if catalog is None:
+            catalog = CatalogIndex(settings.catalog_path, settings.catalog_min_score)
+        self._resolver = TrackResolver(music_provider, match_cache, catalog)
+        self._revalidator: MatchRevalidator | None = None
+        if settings.match_revalidate_calls_per_hour > 0:
+            self._revalidator = MatchRevalidator(
+                music_provider,
+                match_cache,
+                calls_per_hour=settings.match_revalidate_calls_per_hour,
+                calls_per_run=round(
+                    settings.match_revalidate_calls_per_hour
+                    * settings.match_revalidate_interval
+                    / 3600
+                ),
+                max_age=settings.match_revalidate_after,
+                market=settings.spotify_market,
+                catalog=catalog,
+            )
+        self._scheduler: "AsyncIOScheduler | None" = None
         self._is_syncing = False
-        self._status = SyncStatus()
+        self._polling: AdaptivePollingPolicy | None = None
+        if settings.sync_adaptive:
+            self._polling = AdaptivePollingPolicy(
+                initial_interval=settings.sync_interval,
+                min_interval=settings.sync_min_interval,
+                max_interval=settings.sync_max_interval,
+                target_plays=max(settings.max_tracks_per_sync // 2, 1),
+                backoff_factor=settings.sync_backoff_factor,
+                jitter=settings.sync_jitter,
+            )
+
+    def _get_scheduler(self) -> "AsyncIOScheduler":
+        if self._scheduler is None:
+            # Imported on first use so one-shot runs never load APScheduler
+            from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+            self._scheduler = AsyncIOScheduler()
+        return self._scheduler
 
     async def start(self) -> None:
         if self._settings.sync_enabled:
             await self._music_provider.authenticate()
-            self._scheduler.add_job(
+            await self.resume()
+            scheduler = self._get_scheduler()
+            await self._renew_leadership()
+            scheduler.add_job(
+                self._renew_leadership,
+                "interval",
+                seconds=self._settings.state_lease_ttl / 3,
+                id="renew_leadership",
+            )
+            if self._revalidator:
+                scheduler.add_job(
+                    self._revalidate_matches,
+                    "interval",
+                    seconds=self._settings.match_revalidate_interval,
+                    id="revalidate_matches",
+                )
+            if self._polling:
+                scheduler.start()
+                logger.info("Sync service started with adaptive polling")
+                # Run initial sync, then let the policy pick each next run
+                await self._scheduled_sync()
+                return
+            scheduler.add_job(
                 self._scheduled_sync,
                 "interval",
                 seconds=self._settings.sync_interval,
                 id="sync_job",
             )
-            self._scheduler.start()
+            scheduler.start()
             logger.info(
-                f"Sync service started. Interval: {self._settings.sync_interval}s"
+                "Sync service started. Interval: %ss", self._settings.sync_interval
             )
             # Run initial sync
-            await self.sync()
+            if self._leader.held:
+                await self.sync()
         else:
             logger.info("Sync service disabled")
 
     async def stop(self) -> None:
-        if self._scheduler.running:
+        if self._scheduler and self._scheduler.running:
             self._scheduler.shutdown()
             logger.info("Sync service stopped")
+        await self._leader.release()
+        if self._resolver.catalog.pending:
+            await asyncio.to_thread(self._resolver.catalog.flush)
+
+    async def _renew_leadership(self) -> bool:
+        was_leader = self._leader.held
+        try:
+            is_leader = await self._leader.acquire()
+        except Exception as e:
+            logger.error("Failed to renew scheduler lease: %s", e)
+            is_leader = False
+        if is_leader != was_leader:
+            logger.info(
+                "%s scheduled syncs for %s",
+                "Running" if is_leader else "Another process runs",
+                self._settings.spotify_playlist_id,
+            )
+        return is_leader
 
     async def _scheduled_sync(self) -> None:
+        leader = await self._renew_leadership()
         try:
-            await self.sync()
+            if leader:
+                await self.sync()
         except Exception as e:
-            logger.error(f"Scheduled sync failed: {e}")
+            logger.error("Scheduled sync failed: %s", e)
         finally:
-            self._status.next_sync = datetime.utcnow() + timedelta(
-                seconds=self._settings.sync_interval
+            delay = self._settings.sync_interval
+            if self._polling:
+                delay = self._polling.next_delay(self._settings.xm_station)
+                self._get_scheduler().add_job(
+                    self._scheduled_sync,
+                    "date",
+                    run_date=datetime.now() + timedelta(seconds=delay),
+                    id="sync_job",
+                    replace_existing=True,
+                )
+            if leader:
+                next_sync = datetime.utcnow() + timedelta(seconds=delay)
+                await self._update_status(next_sync=next_sync)
+
+    async def _revalidate_matches(self) -> None:
+        if not await self._renew_leadership():
+            return
+        try:
+            await self._revalidator.run()
+        except Exception as e:
+            logger.error("Match revalidation failed: %s", e)
+
+    def _new_plays(
+        self, station: str, tracks: list[Track], from_poll: bool = True
+    ) -> list[Track]:
+        """Return plays not yet marked seen and feed the polling policy.
+
+        Pushed plays (``from_poll=False``) are not fed to the policy, which
+        measures how much each poll finds. Nothing is marked seen here; see
+        ``_mark_seen``.
+        """
+        _, plays = self._state.get(self._plays_key)
+        new_tracks = _mark_plays(plays or {}, station, tracks, from_poll)
+        if self._polling and from_poll:
+            self._polling.record(
+                station,
+                len(new_tracks),
+                window_full=bool(tracks) and len(new_tracks) >= len(tracks),
+            )
+            logger.debug(
+                "%s: %s new plays, interval now %.0fs",
+                station,
+                len(new_tracks),
+                self._polling.interval(station),
             )
+        return new_tracks
+
+    async def _mark_seen(
+        self, station: str, tracks: list[Track], from_poll: bool = True
+    ) -> None:
+        """Mark ``tracks`` seen, once the writes for the plays they bring landed.
+
+        A run that fails before then leaves the marker alone, so the next one
+        finds the same plays again instead of losing them.
+        """
+
+        def record(plays: dict) -> dict:
+            _mark_plays(plays, station, tracks, from_poll)
+            return plays
+
+        await self._state.update(self._plays_key, record)
 
     async def sync(self) -> dict:
         """Sync XM tracks to Spotify playlist.
 
-        This clears the playlist first, then adds the current XM tracks.
-        This ensures the playlist always reflects the current XM station state.
+        In ``mirror`` mode this resolves the current XM tracks, then clears the
+        playlist and adds them, so the playlist always reflects the current
+        station state. In ``rolling`` mode only newly played tracks are
+        appended and the oldest entries are trimmed once the playlist exceeds
+        its configured size. Either way the playlist writes are journaled
+        first, and a sync interrupted part-way is finished before the next.
+
+        Each run is bounded by ``sync_deadline``: searches still pending when it
+        passes are put off to the next run, while tracks already resolved are
+        still written. Rolling syncs leave those plays unseen so the next poll
+        finds them again; mirror syncs resolve the whole list every run.
+        """
+        return await self._run(self._poll_and_apply)
+
+    async def ingest(self, tracks: list[Track]) -> dict:
+        """Apply now-playing events pushed by a feeder, oldest first.
+
+        In ``rolling`` mode new plays are appended straight away without
+        polling XM. A mirrored playlist reflects the station's whole recent
+        list, so in ``mirror`` mode the events just trigger a regular sync.
+        Plays ingested here also count as seen by the next poll.
+        """
+        if self._settings.playlist_mode != "rolling":
+            return await self.sync()
+
+        async def apply(result: SyncResult) -> None:
+            result.tracks_found = len(tracks)
+            # Events arrive oldest first; rolling syncs take XM's newest-first order
+            plays = tracks[::-1]
+            station = self._settings.xm_station
+            left = await self._sync_rolling(
+                self._new_plays(station, plays, from_poll=False), result
+            )
+            # Plays left at the deadline stay unseen; the next poll finds them
+            await self._mark_seen(
+                station, [t for t in plays if t not in left], from_poll=False
+            )
+
+        return await self._run(apply)
+
+    async def resume(self) -> Optional[dict]:
+        """Finish the writes of an interrupted sync; None if there are none."""
+        if await self._journal.pending() is None:
+            return None
+        return await self._run(None)
+
+    async def _run(self, apply: Callable[[SyncResult], Awaitable[None]] | None) -> dict:
+        """Run one playlist update unless another is in progress.
+
+        The run lock is shared through the state store, so this also refuses
+        while another process is updating the same playlist. Writes left
+        over from an interrupted run are applied first.
         """
         if self._is_syncing:
             return {"error": "Sync already in progress"}
-
+        # Claimed before the lease: both runs of this process would hold it
         self._is_syncing = True
-        self._status.is_running = True
         result = SyncResult(success=False)
 
         try:
-            # 1. Fetch tracks from XM
-            xm_tracks = await self._track_source.get_recent_tracks(
-                station=self._settings.xm_station,
-                limit=self._settings.max_tracks_per_sync,
-            )
-            result.tracks_found = len(xm_tracks)
+            if not await self._lock.acquire():
+                return {"error": "Sync already in progress"}
+            async with self._lock.renewing():
+                await self._update_status(is_running=True)
+                try:
+                    with deadline(self._settings.sync_deadline):
+                        await self._replay_journal(result)
+                        if apply:
+                            await apply(result)
+                    result.success = True
+                except Exception as e:
+                    logger.error("Sync failed: %s", e)
+                    result.error = str(e)
+                finally:
+                    await self._update_status(
+                        is_running=False,
+                        last_sync=datetime.utcnow(),
+                        last_result=result,
+                        count=True,
+                    )
+        finally:
+            self._is_syncing = False
 
-            if not xm_tracks:
-                result.success = True
-                return result.model_dump()
+        try:
+            await self._resolver.catalog.save_if_due()
+        except Exception as e:
+            logger.error("Failed to save track catalog: %s", e)
+        return result.model_dump()
 
-            # 2. Get existing playlist tracks and CLEAR them
+    async def _poll_and_apply(self, result: SyncResult) -> None:
+        # 1. Fetch tracks from XM
+        xm_tracks = await self._track_source.get_recent_tracks(
+            station=self._settings.xm_station,
+            limit=self._settings.max_tracks_per_sync,
+        )
+        result.tracks_found = len(xm_tracks)
+        station = self._settings.xm_station
+        new_tracks = self._new_plays(station, xm_tracks)
+
+        left: list[Track] = []
+        if xm_tracks:
+            if self._settings.playlist_mode == "rolling":
+                left = await self._sync_rolling(new_tracks, result)
+            else:
+                await self._sync_mirror(xm_tracks, result)
+        await self._mark_seen(station, [t for t in xm_tracks if t not in left])
+
+    async def _sync_mirror(self, xm_tracks: list[Track], result: SyncResult) -> None:
+        # 2. Resolve XM tracks to Spotify IDs (match cache, catalog, then
+        #    search) before touching the playlist, so it is never left cleared
+        #    while searches run
+        new_track_ids = []
+        for i, track in enumerate(xm_tracks):
+            if deadline_exceeded():
+                self._drop_remaining(result, len(xm_tracks) - i)
+                break
+            spotify_id = await self._resolver.resolve(track)
+            if spotify_id:
+                result.tracks_matched += 1
+                new_track_ids.append(spotify_id)
+            else:
+                result.tracks_failed.append(str(track))
+
+        # 3. CLEAR the existing playlist tracks and add all matched ones
+        with deadline(None):
             existing_ids = await self._music_provider.get_playlist_tracks(
                 self._settings.spotify_playlist_id
             )
+        if existing_ids:
+            logger.info("Clearing %s existing tracks from playlist", len(existing_ids))
+        await self._write_playlist(
+            [PlaylistWrite(kind="remove", track_ids=b) for b in _batches(existing_ids)]
+            + [PlaylistWrite(kind="add", track_ids=b) for b in _batches(new_track_ids)],
+            result,
+        )
+        if new_track_ids:
+            logger.info("Added %s tracks to playlist", len(new_track_ids))
 
-            if existing_ids:
-                logger.info(
-                    f"Clearing {len(existing_ids)} existing tracks from playlist"
-                )
-                await self._music_provider.remove_tracks_from_playlist(
-                    self._settings.spotify_playlist_id, existing_ids
-                )
+    async def _sync_rolling(
+        self, new_tracks: list[Track], result: SyncResult
+    ) -> list[Track]:
+        """Append newly played tracks and trim the oldest entries by position.
 
-            # 3. Search for XM tracks on Spotify
-            new_track_ids = []
-            for track in xm_tracks:
-                spotify_id = await self._music_provider.search_track(
-                    track.title, track.primary_artist
+        Writes scale with the number of new plays rather than the playlist
+        size. The trim is applied against the snapshot the positions were read
+        from, so Spotify reconciles any concurrent edit instead of removing the
+        wrong entries. Returns the newest plays left unsearched at the
+        deadline, which must stay unseen for the next run to pick up.
+        """
+        playlist_id = self._settings.spotify_playlist_id
+        max_size = self._settings.rolling_playlist_size
+        if not new_tracks:
+            logger.info("No new plays since the last sync")
+            return []
+
+        snapshot = await self._music_provider.get_playlist_snapshot(playlist_id)
+
+        # Search in play order (XM lists newest first)
+        played: list[str] = []
+        left: list[Track] = []
+        for i, track in enumerate(reversed(new_tracks)):
+            if deadline_exceeded():
+                left = new_tracks[: len(new_tracks) - i]
+                self._drop_remaining(result, len(left))
+                break
+            spotify_id = await self._resolver.resolve(track)
+            if not spotify_id:
+                result.tracks_failed.append(str(track))
+                continue
+            result.tracks_matched += 1
+            played.append(spotify_id)
+        to_add = _rolling_additions(snapshot.track_ids, played, max_size)
+        result.tracks_skipped += len(played) - len(to_add)
+        if not to_add:
+            return left
+
+        writes = []
+        excess = len(snapshot.track_ids) + len(to_add) - max_size
+        if excess > 0:
+            positions: dict[str, list[int]] = {}
+            for position, tid in enumerate(snapshot.track_ids[:excess]):
+                if tid:
+                    positions.setdefault(tid, []).append(position)
+            logger.info("Trimming %s oldest tracks from playlist", excess)
+            writes.append(
+                PlaylistWrite(
+                    kind="remove_positions",
+                    positions=positions,
+                    snapshot_id=snapshot.snapshot_id,
                 )
-                if spotify_id:
-                    result.tracks_matched += 1
-                    new_track_ids.append(spotify_id)
+            )
+        writes += [PlaylistWrite(kind="add", track_ids=b) for b in _batches(to_add)]
+        await self._write_playlist(writes, result)
+        logger.info("Appended %s tracks to playlist", len(to_add))
+        return left
+
+    async def _write_playlist(
+        self, writes: list[PlaylistWrite], result: SyncResult
+    ) -> None:
+        """Journal the planned writes, apply them in order, then drop the journal."""
+        if not writes:
+            return
+        self._lock.check()
+        plan = SyncPlan(
+            playlist_id=self._settings.spotify_playlist_id,
+            created_at=datetime.utcnow(),
+            writes=writes,
+        )
+        await self._journal.begin(plan)
+        await self._apply_writes(plan, range(len(writes)), result)
+        await self._journal.finish()
+
+    async def _replay_journal(self, result: SyncResult) -> None:
+        pending = await self._journal.pending()
+        if pending is None:
+            return
+        if pending.replays >= _MAX_REPLAYS:
+            logger.error(
+                "Giving up on interrupted sync from %s after %s attempts",
+                pending.plan.created_at,
+                pending.replays,
+            )
+            await self._journal.finish()
+            return
+        logger.info(
+            "Resuming interrupted sync from %s: %s of %s writes left",
+            pending.plan.created_at,
+            len(pending.remaining),
+            len(pending.plan.writes),
+        )
+        await self._journal.replaying()
+        await self._apply_writes(pending.plan, pending.remaining, result)
+        await self._journal.finish()
+
+    async def _apply_writes(
+        self, plan: SyncPlan, indexes: Iterable[int], result: SyncResult
+    ) -> None:
+        """Make the given writes of ``plan``, journaling each one as it lands.
+
+        A failed write raises and leaves the journal in place, so the next
+        run retries from that write rather than reporting a half-written
+        playlist as synced. So does losing the run lock, since the process
+        that took it over may be writing the same playlist.
+        """
+        provider = self._music_provider
+        with deadline(None):
+            for index in indexes:
+                self._lock.check()
+                write = plan.writes[index]
+                if write.kind == "add":
+                    if not await provider.add_tracks_to_playlist(
+                        plan.playlist_id, write.track_ids
+                    ):
+                        raise RuntimeError("Failed to add tracks to playlist")
+                    result.tracks_added += len(write.track_ids)
+                elif write.kind == "remove":
+                    if not await provider.remove_tracks_from_playlist(
+                        plan.playlist_id, write.track_ids
+                    ):
+                        raise RuntimeError("Failed to remove tracks from playlist")
                 else:
-                    result.tracks_failed.append(str(track))
+                    await provider.remove_playlist_positions(
+                        plan.playlist_id, write.positions, write.snapshot_id
+                    )
+                await self._journal.applied(index)
 
-            # 4. Add all matched tracks to playlist
-            if new_track_ids:
-                if await self._music_provider.add_tracks_to_playlist(
-                    self._settings.spotify_playlist_id, new_track_ids
-                ):
-                    result.tracks_added = len(new_track_ids)
-                    logger.info(f"Added {len(new_track_ids)} tracks to playlist")
+    def _drop_remaining(self, result: SyncResult, remaining: int) -> None:
+        result.tracks_dropped = remaining
+        logger.warning(
+            "Sync deadline of %ss reached; leaving %s searches for the next run",
+            self._settings.sync_deadline,
+            remaining,
+        )
 
-            result.success = True
+    async def _update_status(self, count: bool = False, **changes: Any) -> None:
+        values = pydantic_core.to_jsonable_python(changes)
 
-        except Exception as e:
-            logger.error(f"Sync failed: {e}")
-            result.error = str(e)
-        finally:
-            self._is_syncing = False
-            self._status.is_running = False
-            self._status.last_sync = datetime.utcnow()
-            self._status.last_result = result
-            self._status.total_syncs += 1
+        def apply(status: dict) -> dict:
+            status.update(values)
+            if count:
+                status["total_syncs"] = status.get("total_syncs", 0) + 1
+            return status
 
-        return result.model_dump()
+        await self._state.update(self._status_key, apply)
 
     async def get_status(self) -> dict:
-        return self._status.model_dump()
+        return stored_status(self._state, self._settings.spotify_playlist_id)
 
     @property
     def is_running(self) -> bool:
-        return self._is_syncing
+        return self._is_syncing or self._state.holder(self._lock.name) is not None
+
+    @property
+    def scheduler_running(self) -> bool:
+        return self._scheduler is not None and self._scheduler.running
+
+    @property
+    def spotify_authenticated(self) -> bool:
+        return self._music_provider.is_authenticated()
+
+    @property
+    def status_version(self) -> int:
+        """Counter bumped whenever the status changes, for response caching."""
+        return self._state.version(self._status_key)
@@ -0,0 +1,203 @@
+"""Multi-account tenancy: per-user Spotify clients with fair scheduling."""
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from pathlib import Path
+from backend.config import Settings
+from backend.core.fairness import FairShareLimiter
+from backend.core.interfaces import TrackSourceInterface
+from backend.models import TenantConfig
+from backend.providers import SpotifyProvider
+from backend.services.catalog import CatalogIndex
+from backend.services.match_cache import MatchCache
+from backend.services.state import Lease, StateStore
+from backend.services.sync_service import SyncService, stored_status
+
+logger = logging.getLogger(__name__)
+
+
+def load_tenants(path: str) -> list[TenantConfig]:
+    """Read tenant definitions from a JSON list."""
+    data = json.loads(Path(path).read_text())
+    return [TenantConfig(**item) for item in data]
+
+
+class ActiveTenant:
+    def __init__(self, provider: SpotifyProvider, service: SyncService):
+        self.provider = provider
+        self.service = service
+        self.last_used = time.monotonic()
+
+
+class TenantRegistry:
+    """Serves many Spotify accounts from one process.
+
+    Each tenant gets its own SpotifyProvider and SyncService, built on first
+    use; only token state and rate limits are per tenant, while HTTP
+    connections come from the process-wide pool. All tenants share one
+    scheduler and one FairShareLimiter, so Spotify calls are interleaved
+    round-robin and a large sync cannot starve the others. Tenants idle for
+    longer than ``tenant_idle_ttl``, or beyond the ``max_active_tenants``
+    most recently used, are evicted down to their config; their status
+    stays in the state store.
+    """
+
+    def __init__(
+        self,
+        tenants: list[TenantConfig],
+        track_source: TrackSourceInterface,
+        settings: Settings,
+    ):
+        self._tenants = {t.id: t for t in tenants}
+        self._track_source = track_source
+        self._settings = settings
+        self._limiter = FairShareLimiter(settings.tenant_max_concurrency)
+        # Matches do not depend on the account, so every tenant shares them
+        self._match_cache = MatchCache(
+            settings.match_cache_path, settings.match_cache_miss_ttl
+        )
+        self._catalog = CatalogIndex(settings.catalog_path, settings.catalog_min_score)
+        self._state = StateStore(settings.state_path)
+        # With several API workers, only the lease holder runs tenant schedules
+        self._leader = Lease(self._state, "scheduler:tenants", settings.state_lease_ttl)
+        self._active: OrderedDict[str, ActiveTenant] = OrderedDict()
+        self._scheduler = None
+
+    @property
+    def tenant_ids(self) -> list[str]:
+        return list(self._tenants)
+
+    @property
+    def active_count(self) -> int:
+        return len(self._active)
+
+    def __contains__(self, tenant_id: str) -> bool:
+        return tenant_id in self._tenants
+
+    def _tenant_settings(self, tenant: TenantConfig) -> Settings:
+        update = {
+            "spotify_refresh_token": tenant.spotify_refresh_token,
+            "spotify_playlist_id": tenant.spotify_playlist_id,
+        }
+        if tenant.xm_station:
+            update["xm_station"] = tenant.xm_station
+        if tenant.sync_interval:
+            update["sync_interval"] = tenant.sync_interval
+        if self._settings.spotify_token_cache_path:
+            update["spotify_token_cache_path"] = (
+                f"{self._settings.spotify_token_cache_path}.{tenant.id}"
+            )
+        if self._settings.sync_journal_path:
+            update["sync_journal_path"] = (
+                f"{self._settings.sync_journal_path}.{tenant.id}"
+            )
+        return self._settings.model_copy(update=update)
+
+    async def get_service(self, tenant_id: str) -> SyncService:
+        """Return the tenant's SyncService, activating the tenant if needed."""
+        if tenant_id in self._active:
+            active = self._active[tenant_id]
+            self._active.move_to_end(tenant_id)
+        else:
+            settings = self._tenant_settings(self._tenants[tenant_id])
+            provider = SpotifyProvider(
+                settings, limiter=self._limiter, tenant_id=tenant_id
+            )
+            await provider.start_token_refresh()
+            active = ActiveTenant(
+                provider,
+                SyncService(
+                    self._track_source,
+                    provider,
+                    settings,
+                    self._match_cache,
+                    self._catalog,
+                    self._state,
+                ),
+            )
+            self._active[tenant_id] = active
+            logger.info("Activated tenant %s", tenant_id)
+            await self._evict_over_capacity()
+        active.last_used = time.monotonic()
+        return active.service
+
+    async def get_status(self, tenant_id: str) -> dict:
+        if tenant_id in self._active:
+            return await self._active[tenant_id].service.get_status()
+        return stored_status(self._state, self._tenants[tenant_id].spotify_playlist_id)
+
+    async def sync_tenant(self, tenant_id: str) -> dict:
+        service = await self.get_service(tenant_id)
+        return await service.sync()
+
+    async def _renew_leadership(self) -> bool:
+        try:
+            return await self._leader.acquire()
+        except Exception as e:
+            logger.error("Failed to renew tenant scheduler lease: %s", e)
+            return False
+
+    async def _scheduled_sync(self, tenant_id: str) -> None:
+        if not await self._renew_leadership():
+            return
+        try:
+            await self.sync_tenant(tenant_id)
+        except Exception as e:
+            logger.error("Scheduled sync for tenant %s failed: %s", tenant_id, e)
+
+    async def start(self) -> None:
+        from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+        self._scheduler = AsyncIOScheduler()
+        await self._renew_leadership()
+        self._scheduler.add_job(
+            self._renew_leadership,
+            "interval",
+            seconds=self._settings.state_lease_ttl / 3,
+            id="renew_leadership",
+        )
+        for tenant in self._tenants.values():
+            self._scheduler.add_job(
+                self._scheduled_sync,
+                "interval",
+                seconds=tenant.sync_interval or self._settings.sync_interval,
+                args=[tenant.id],
+                id=f"sync_{tenant.id}",
+            )
+        self._scheduler.add_job(
+            self.evict_idle,
+            "interval",
+            seconds=max(self._settings.tenant_idle_ttl // 2, 30),
+            id="evict_idle_tenants",
+        )
+        self._scheduler.start()
+        logger.info("Tenant registry started with %s tenants", len(self._tenants))
+
+    async def stop(self) -> None:
+        if self._scheduler and self._scheduler.running:
+            self._scheduler.shutdown()
+        await self._leader.release()
+        for tenant_id in list(self._active):
+            await self._evict(tenant_id)
+
+    async def evict_idle(self) -> None:
+        cutoff = time.monotonic() - self._settings.tenant_idle_ttl
+        for tenant_id, active in list(self._active.items()):
+            if active.last_used < cutoff and not active.service.is_running:
+                await self._evict(tenant_id)
+
+    async def _evict_over_capacity(self) -> None:
+        # Least recently used first, sparing the tenant just activated and
+        # any tenant mid-sync
+        for tenant_id, active in list(self._active.items())[:-1]:
+            if len(self._active) <= self._settings.max_active_tenants:
+                break
+            if not active.service.is_running:
+                await self._evict(tenant_id)
+
+    async def _evict(self, tenant_id: str) -> None:
+        active = self._active.pop(tenant_id)
+        await active.provider.close()
+        logger.info("Evicted idle tenant %s", tenant_id)
@@ -0,0 +1,78 @@
+"""XM Spotify Sync - standalone sync worker.
+
+Runs the scheduler and every sync outside the API process. The API relays
+status requests and manual triggers over ``WORKER_ADDRESS`` (a Unix socket
+path or ``host:port``).
+"""
+
+import asyncio
+import logging
+import signal
+from backend.config import Settings, get_settings
+from backend.log import configure_logging
+from backend.providers import SpotifyProvider, XMRadioProvider, close_transports
+from backend.services import (
+    LoopMonitor,
+    SyncService,
+    TenantRegistry,
+    WorkerServer,
+    load_tenants,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def run(settings: Settings) -> None:
+    xm_provider = XMRadioProvider()
+    spotify_provider = SpotifyProvider(settings)
+    service = SyncService(xm_provider, spotify_provider, settings)
+    server = WorkerServer(service, settings.worker_address)
+    registry: TenantRegistry | None = None
+    monitor = LoopMonitor(
+        threshold=settings.loop_lag_threshold, strict=settings.loop_monitor_strict
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    if settings.loop_monitor_enabled:
+        await monitor.start()
+    await server.start()
+    try:
+        await spotify_provider.start_token_refresh()
+        try:
+            await service.start()
+        except Exception as e:
+            logger.error("Failed to start sync service: %s", e)
+        if settings.tenants_file:
+            registry = TenantRegistry(
+                load_tenants(settings.tenants_file), xm_provider, settings
+            )
+            await registry.start()
+        await stop.wait()
+    finally:
+        logger.info("Stopping sync worker...")
+        await server.stop()
+        if registry:
+            await registry.stop()
+        await service.stop()
+        await spotify_provider.stop_token_refresh()
+        await xm_provider.close()
+        await close_transports()
+        await monitor.stop()
+
+
+def main():
+    settings = get_settings()
+    configure_logging(
+        settings.log_level, settings.log_format, settings.log_hot_path_rate
+    )
+    if not settings.worker_address:
+        raise SystemExit("WORKER_ADDRESS must be set to run the sync worker")
+    asyncio.run(run(settings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+import pytest
+from backend.config import Settings
+
+
+@pytest.fixture
+def settings() -> Settings:
+    """Settings with placeholder credentials, ignoring any local .env file."""
+    return Settings(
+        _env_file=None,
+        spotify_client_id="client-id",
+        spotify_client_secret="client-secret",
+        spotify_playlist_id="playlist",
+        sync_enabled=False,
+    )
@@ -0,0 +1,133 @@
+"""Catalog matching: spelling variants in, different tracks out."""
+
+import pytest
+from backend.models import SpotifyTrack, Track
+from backend.services.catalog import CatalogIndex, normalize_title
+from backend.services.match_cache import MatchCache
+from backend.services.resolver import TrackResolver
+from backend.services.revalidation import MatchRevalidator
+
+
+def _track(
+    track_id: str, title: str, artist: str = "Artist", duration_ms: int = 0
+) -> SpotifyTrack:
+    return SpotifyTrack(
+        track=Track(title=title, artists=[artist]),
+        spotify_id=track_id,
+        spotify_uri=f"spotify:track:{track_id}",
+        duration_ms=duration_ms or None,
+    )
+
+
+@pytest.fixture(params=["memory", "file"])
+def catalog(request, tmp_path) -> CatalogIndex:
+    """An empty catalog, in memory or backed by a file."""
+    path = str(tmp_path / "catalog.bin") if request.param == "file" else ""
+    return CatalogIndex(path)
+
+
+def _flushed(catalog: CatalogIndex, *tracks: SpotifyTrack) -> CatalogIndex:
+    catalog.add(tracks)
+    catalog.flush()
+    return catalog
+
+
+def test_bracketed_part_markers_survive_normalisation():
+    assert normalize_title("Intro (Pts. 6-9)") == "intro pts 6 9"
+    assert normalize_title("Song - Part II") == "song part ii"
+    assert normalize_title("Song (Remastered 2011)") == "song"
+    assert normalize_title("Song - Live at Wembley") == "song"
+
+
+@pytest.mark.parametrize(
+    ("known", "played"),
+    [
+        ("Symphony Pt. 1", "Symphony Pt. 2"),
+        ("Suite (Pts. 1-5)", "Suite (Pts. 6-9)"),
+        ("Daughters", "Daughter"),
+        ("Love Songs", "Love Song"),
+        ("Vultures 1", "Vultures 2"),
+        ("Chapter II", "Chapter III"),
+    ],
+)
+def test_similar_titles_of_different_tracks_do_not_match(catalog, known, played):
+    _flushed(catalog, _track("known", known))
+    assert catalog.match(played, "Artist") is None
+    assert catalog.match(known, "Artist").entry.track_id == "known"
+
+
+@pytest.mark.parametrize(
+    ("known", "played"),
+    [
+        ("Don't Stop Me Now - Remastered 2011", "Dont Stop Me Now"),
+        ("Señorita (feat. Somebody)", "Senorita"),
+        ("Rock & Roll (Pt. 2)", "Rock and Roll Pt 2"),
+    ],
+)
+def test_spelling_variants_match(catalog, known, played):
+    _flushed(catalog, _track("known", known))
+    assert catalog.match(played, "Artist").entry.track_id == "known"
+
+
+def test_known_durations_must_agree(catalog):
+    _flushed(catalog, _track("album", "Song", duration_ms=240_000))
+    assert catalog.match("Song", "Artist", duration_ms=242_000) is not None
+    assert catalog.match("Song", "Artist", duration_ms=200_000) is None
+    assert catalog.match("Song", "Artist") is not None
+
+
+def test_every_qualifying_record_is_a_candidate(catalog):
+    # Many records share the title; only the last by ID has the right artist
+    decoys = [_track(f"a{i:03}", "Same Title", f"Decoy {i}") for i in range(200)]
+    _flushed(catalog, *decoys, _track("zzz", "Same Title", "Wanted"))
+    assert catalog.match("Same Title", "Wanted").entry.track_id == "zzz"
+
+
+def test_removed_and_relinked_entries(catalog):
+    _flushed(catalog, _track("dead", "Gone Song"), _track("old", "Moved Song"))
+    catalog.remove(["dead"])
+    catalog.relink({"old": "new"})
+    assert catalog.match("Gone Song", "Artist") is None
+    assert catalog.match("Moved Song", "Artist").entry.track_id == "new"
+
+    catalog.flush()
+    assert catalog.pending == 0
+    assert catalog.match("Gone Song", "Artist") is None
+    assert catalog.match("Moved Song", "Artist").entry.track_id == "new"
+    assert len(catalog) == 1
+
+
+@pytest.mark.asyncio
+async def test_catalog_matches_are_not_cached_as_search_results():
+    cache = MatchCache("")
+    catalog = _flushed(CatalogIndex(), _track("known", "Dont Stop Me Now"))
+    resolver = TrackResolver(object(), cache, catalog)
+    play = Track(title="Don't Stop Me Now", artists=["Artist"])
+    assert await resolver.resolve(play) == "known"
+    found, _ = cache.lookup(play.title, play.primary_artist)
+    assert not found
+
+
+@pytest.mark.asyncio
+async def test_revalidation_updates_the_catalog():
+    class Checker:
+        async def check_tracks(self, track_ids, market):
+            return {"dead": None, "old": "new"}
+
+    cache = MatchCache("")
+    cache.put("Gone Song", "Artist", "dead")
+    cache.put("Moved Song", "Artist", "old")
+    catalog = _flushed(
+        CatalogIndex(), _track("dead", "Gone Song"), _track("old", "Moved Song")
+    )
+    revalidator = MatchRevalidator(
+        Checker(),
+        cache,
+        calls_per_hour=10,
+        calls_per_run=1,
+        max_age=-60,
+        catalog=catalog,
+    )
+    await revalidator.run()
+    assert catalog.match("Gone Song", "Artist") is None
+    assert catalog.match("Moved Song", "Artist").entry.track_id == "new"
@@ -0,0 +1,43 @@
+"""Every debug route sits behind the debug token."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from backend.api.debug import debug_router
+from backend.config import get_settings
+
+_ROUTES = [
+    ("GET", "/debug/loop"),
+    ("GET", "/debug/http"),
+    ("POST", "/debug/profile"),
+    ("POST", "/debug/memory/start"),
+    ("GET", "/debug/memory"),
+    ("POST", "/debug/memory/stop"),
+]
+
+
+def _client(settings) -> TestClient:
+    app = FastAPI()
+    app.include_router(debug_router)
+    app.dependency_overrides[get_settings] = lambda: settings
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(("method", "path"), _ROUTES)
+def test_debug_routes_are_hidden_without_a_token(settings, method, path):
+    assert _client(settings).request(method, path).status_code == 404
+
+
+@pytest.mark.parametrize(("method", "path"), _ROUTES)
+def test_debug_routes_need_the_token(settings, method, path):
+    settings.debug_token = "secret"
+    client = _client(settings)
+    assert client.request(method, path).status_code == 401
+    wrong = {"X-Debug-Token": "guess"}
+    assert client.request(method, path, headers=wrong).status_code == 401
+
+
+def test_debug_routes_answer_with_the_token(settings):
+    settings.debug_token = "secret"
+    response = _client(settings).get("/debug/http", headers={"X-Debug-Token": "secret"})
+    assert response.status_code == 200
@@ -0,0 +1,58 @@
+"""Which pushed and polled plays count as new."""
+
+from datetime import datetime, timedelta, timezone
+import pytest
+from backend.models import Track
+from backend.services.sync_service import SyncService
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _play(title: str, minutes: int | None = None) -> Track:
+    return Track(
+        title=title,
+        artists=["Artist"],
+        timestamp=None if minutes is None else T0 + timedelta(minutes=minutes),
+        source_id=None if minutes is None else f"xm-{title}",
+    )
+
+
+@pytest.fixture
+def service(settings) -> SyncService:
+    return SyncService(object(), object(), settings)
+
+
+async def _record(
+    service: SyncService, tracks: list[Track], from_poll: bool = True
+) -> list[Track]:
+    new_tracks = service._new_plays("st", tracks, from_poll)
+    await service._mark_seen("st", tracks, from_poll)
+    return new_tracks
+
+
+def _last_seen(service: SyncService) -> str | None:
+    _, plays = service._state.get(service._plays_key)
+    return plays.get("last_seen", {}).get("st")
+
+
+@pytest.mark.asyncio
+async def test_untimestamped_push_does_not_move_last_seen(service):
+    assert await _record(service, [_play("A", 1)]) == [_play("A", 1)]
+    pushed = _play("B")
+    assert await _record(service, [pushed], from_poll=False) == [pushed]
+    assert _last_seen(service) == (T0 + timedelta(minutes=1)).isoformat()
+
+    # The poll reporting B with XM's time skips it, but still finds C
+    polled = [_play("C", 3), _play("B", 2), _play("A", 1)]
+    assert await _record(service, polled) == [_play("C", 3)]
+    assert _last_seen(service) == (T0 + timedelta(minutes=3)).isoformat()
+    # B was matched once; a later play of it is new again
+    assert await _record(service, [_play("B", 4)]) == [_play("B", 4)]
+
+
+@pytest.mark.asyncio
+async def test_timestamped_push_moves_last_seen(service):
+    pushed = _play("A", 5)
+    assert await _record(service, [pushed], from_poll=False) == [pushed]
+    assert _last_seen(service) == pushed.timestamp.isoformat()
+    assert await _record(service, [_play("A", 5), _play("Z", 4)]) == []
@@ -0,0 +1,66 @@
+"""API process to sync worker round trips over a Unix socket."""
+
+import pytest
+import pytest_asyncio
+from backend.models import Track
+from backend.services.ipc import RemoteSyncService, WorkerServer, parse_address
+
+
+class Service:
+    scheduler_running = True
+    spotify_authenticated = True
+
+    def __init__(self):
+        self.syncs = 0
+        self.ingested: list[Track] = []
+
+    async def get_status(self) -> dict:
+        return {"is_running": False, "total_syncs": self.syncs}
+
+    async def sync(self) -> dict:
+        self.syncs += 1
+        return {"success": True}
+
+    async def ingest(self, tracks: list[Track]) -> dict:
+        self.ingested += tracks
+        return {"success": True, "tracks_found": len(tracks)}
+
+
+@pytest_asyncio.fixture
+async def worker(tmp_path):
+    service = Service()
+    server = WorkerServer(service, str(tmp_path / "worker.sock"))
+    await server.start()
+    yield service, RemoteSyncService(str(tmp_path / "worker.sock"), status_ttl=60)
+    await server.stop()
+    assert not (tmp_path / "worker.sock").exists()
+
+
+def test_addresses():
+    assert parse_address("127.0.0.1:8765") == ("127.0.0.1", 8765, None)
+    assert parse_address(":8765") == ("127.0.0.1", 8765, None)
+    assert parse_address("/run/worker.sock") == (None, None, "/run/worker.sock")
+
+
+@pytest.mark.asyncio
+async def test_status_sync_and_ingest_round_trip(worker):
+    service, remote = worker
+    assert await remote.get_status() == {"is_running": False, "total_syncs": 0}
+    assert remote.scheduler_running and remote.spotify_authenticated
+
+    assert await remote.sync() == {"success": True}
+    # A sync invalidates the cached status
+    assert (await remote.get_status())["total_syncs"] == 1
+
+    play = Track(title="Song", artists=["Artist"], source_id="xm-1")
+    assert (await remote.ingest([play]))["tracks_found"] == 1
+    assert service.ingested == [play]
+
+
+@pytest.mark.asyncio
+async def test_unknown_ops_are_reported_as_errors(worker):
+    _, remote = worker
+    with pytest.raises(RuntimeError, match="Unknown op: reboot"):
+        await remote._request("reboot", timeout=1)
+    # The connection handler survives a bad request
+    assert (await remote.get_status())["total_syncs"] == 0
@@ -0,0 +1,131 @@
+"""Resuming a sync that was interrupted between playlist writes."""
+
+from datetime import datetime, timedelta, timezone
+import pytest
+from backend.models import PlaylistWrite, SpotifyTrack, SyncPlan, Track
+from backend.services.journal import SyncJournal
+from backend.services.sync_service import SyncService
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class Crash(BaseException):
+    """Stands in for the process dying mid-sync; no handler catches it."""
+
+
+class Station:
+    def __init__(self, plays: int):
+        self._plays = plays
+
+    async def get_recent_tracks(self, station: str, limit: int = 50) -> list[Track]:
+        return [
+            Track(
+                title=f"Song {i}",
+                artists=["Artist"],
+                timestamp=T0 + timedelta(minutes=i),
+                source_id=f"xm-{i}",
+            )
+            for i in range(self._plays, 0, -1)
+        ][:limit]
+
+
+class Playlist:
+    def __init__(self, tracks: list[str]):
+        self.tracks = tracks
+        self.calls: list[tuple[str, int]] = []
+        self.crash_on_add: int | None = None
+        self.accept_adds = True
+
+    async def search_tracks(self, title: str, artist: str) -> list[SpotifyTrack]:
+        self.calls.append(("search", 1))
+        track_id = title.replace(" ", "")
+        return [
+            SpotifyTrack(
+                track=Track(title=title, artists=[artist]),
+                spotify_id=track_id,
+                spotify_uri=f"spotify:track:{track_id}",
+            )
+        ]
+
+    async def get_playlist_tracks(self, playlist_id: str) -> list[str]:
+        return list(self.tracks)
+
+    async def remove_tracks_from_playlist(self, playlist_id, track_ids) -> bool:
+        self.calls.append(("remove", len(track_ids)))
+        self.tracks = [t for t in self.tracks if t not in track_ids]
+        return True
+
+    async def add_tracks_to_playlist(self, playlist_id, track_ids) -> bool:
+        adds = sum(1 for call, _ in self.calls if call == "add")
+        if adds == self.crash_on_add:
+            raise Crash()
+        self.calls.append(("add", len(track_ids)))
+        if not self.accept_adds:
+            return False
+        self.tracks += track_ids
+        return True
+
+
+@pytest.fixture
+def journaled(settings, tmp_path):
+    settings.sync_journal_path = str(tmp_path / "sync.journal")
+    settings.max_tracks_per_sync = 250
+    settings.match_revalidate_calls_per_hour = 0
+    return settings
+
+
+@pytest.mark.asyncio
+async def test_resume_applies_only_the_writes_left(journaled):
+    playlist = Playlist([f"old{i}" for i in range(150)])
+    playlist.crash_on_add = 1
+    with pytest.raises(Crash):
+        await SyncService(Station(230), playlist, journaled).sync()
+    # Both removals and the first 100 adds landed before the crash
+    assert playlist.calls[-3:] == [("remove", 100), ("remove", 50), ("add", 100)]
+
+    playlist.crash_on_add = None
+    playlist.calls.clear()
+    # A new process: nothing carries over but the journal file
+    restarted = SyncService(Station(0), playlist, journaled)
+    result = await restarted.resume()
+    assert result["success"]
+    assert playlist.calls == [("add", 100), ("add", 30)]
+    assert playlist.tracks == [f"Song{i}" for i in range(230, 0, -1)]
+    assert await restarted.resume() is None
+
+
+@pytest.mark.asyncio
+async def test_unappliable_plan_is_given_up_after_three_replays(journaled):
+    journal = SyncJournal(journaled.sync_journal_path)
+    write = PlaylistWrite(kind="add", track_ids=["a", "b"])
+    await journal.begin(SyncPlan(playlist_id="playlist", created_at=T0, writes=[write]))
+    playlist = Playlist([])
+    playlist.accept_adds = False
+    service = SyncService(Station(0), playlist, journaled)
+
+    for _ in range(3):
+        assert not (await service.resume())["success"]
+        assert await journal.pending() is not None
+    # The fourth attempt drops the plan instead of writing again
+    playlist.calls.clear()
+    assert (await service.resume())["success"]
+    assert playlist.calls == []
+    assert await journal.pending() is None
+
+
+@pytest.mark.asyncio
+async def test_torn_and_unreadable_journals(tmp_path):
+    path = tmp_path / "sync.journal"
+    journal = SyncJournal(str(path))
+    writes = [PlaylistWrite(kind="add", track_ids=[str(i)]) for i in range(3)]
+    await journal.begin(SyncPlan(playlist_id="playlist", created_at=T0, writes=writes))
+    await journal.applied(0)
+    with open(path, "ab") as f:
+        f.write(b'{"applied": 1')
+    pending = await journal.pending()
+    # The torn record's write is redone rather than skipped
+    assert pending.remaining == [1, 2]
+
+    path.write_bytes(b"not json\n")
+    assert await journal.pending() is None
+    assert not path.exists()
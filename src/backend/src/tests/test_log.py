@@ -0,0 +1,36 @@
+"""Throttled logger tests."""
+
+import logging
+import pytest
+from backend.log import throttled
+
+
+class _Capture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+@pytest.fixture
+def capture():
+    handler = _Capture()
+    logger = logging.getLogger("tests.throttled")
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    yield handler
+    logger.removeHandler(handler)
+
+
+def test_records_point_at_the_caller(capture):
+    hot_logger = throttled("tests.throttled")
+    hot_logger.debug("via level method")
+    line = test_records_point_at_the_caller.__code__.co_firstlineno + 2
+    hot_logger.log(logging.INFO, "via log")
+
+    first, second = capture.records
+    assert first.funcName == second.funcName == "test_records_point_at_the_caller"
+    assert first.pathname == __file__
+    assert (first.lineno, second.lineno) == (line, line + 2)
@@ -0,0 +1,30 @@
+"""Event-loop stalls are measured and attributed to the blocking task."""
+
+import asyncio
+import time
+import pytest
+from backend.services.loop_monitor import LoopMonitor
+
+
+async def _blocks_the_loop() -> None:
+    time.sleep(0.2)
+
+
+@pytest.mark.asyncio
+async def test_a_blocking_call_is_recorded_as_a_stall():
+    monitor = LoopMonitor(threshold=0.05, interval=0.01)
+    await monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        await asyncio.create_task(_blocks_the_loop(), name="blocker")
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    report = monitor.report()
+    assert not report.running
+    assert report.max >= 0.15
+    # Sampled while the stall was in progress, so it names the culprit
+    [stall] = [s for s in report.stalls if s.task == "blocker (_blocks_the_loop)"]
+    assert stall.duration >= 0.15
+    assert any("time.sleep(0.2)" in line for line in stall.stack)
@@ -0,0 +1,82 @@
+"""Match cache hits and expiring misses, and pre-warming it in bulk."""
+
+import pytest
+from backend.models import SpotifyTrack, Track
+from backend.services.match_cache import MatchCache
+from backend.services.prewarm import Prewarmer, PrewarmStats
+from backend.services.resolver import TrackResolver
+
+
+@pytest.fixture(params=["memory", "file"])
+def cache(request, tmp_path) -> MatchCache:
+    path = str(tmp_path / "matches.db") if request.param == "file" else ""
+    cache = MatchCache(path, miss_ttl=60)
+    yield cache
+    cache.close()
+
+
+def test_hits_ignore_case_and_spacing(cache):
+    assert cache.lookup("Song", "Artist") == (False, None)
+    cache.put("Song", "Artist", "id1")
+    assert cache.lookup("  song ", "ARTIST") == (True, "id1")
+    assert ("Song", "Other") not in cache
+
+
+def test_misses_are_cached_until_they_expire(cache):
+    cache.put("Unknown", "Artist", None)
+    assert cache.lookup("Unknown", "Artist") == (True, None)
+    cache._conn.execute("UPDATE matches SET resolved_at = resolved_at - 61")
+    assert cache.lookup("Unknown", "Artist") == (False, None)
+
+
+def test_put_many_replaces_entries(cache):
+    cache.put("Song", "Artist", None)
+    cache.put_many([("Song", "Artist", "id1"), ("Other", "Artist", "id2")])
+    assert len(cache) == 2
+    assert cache.lookup("Song", "Artist") == (True, "id1")
+    assert cache.lookup("Other", "Artist") == (True, "id2")
+
+
+class Searcher:
+    def __init__(self):
+        self.searches: list[str] = []
+
+    async def search_tracks(self, title: str, artist: str) -> list[SpotifyTrack]:
+        self.searches.append(title)
+        if title == "Broken":
+            raise RuntimeError("circuit open")
+        if title == "Missing":
+            return []
+        return [
+            SpotifyTrack(
+                track=Track(title=title, artists=[artist]),
+                spotify_id=title.lower(),
+                spotify_uri=f"spotify:track:{title.lower()}",
+            )
+        ]
+
+
+@pytest.mark.asyncio
+async def test_prewarm_stats():
+    cache = MatchCache()
+    cache.put("Known", "Artist", "known")
+    searcher = Searcher()
+    reports: list[PrewarmStats] = []
+    prewarmer = Prewarmer(
+        TrackResolver(searcher, cache),
+        concurrency=2,
+        rate=0,
+        max_backoff=0,
+        progress=reports.append,
+    )
+    titles = ["Known", "Found", "Found", "Missing", "Broken"]
+    await prewarmer.run(Track(title=t, artists=["Artist"]) for t in titles)
+
+    stats = prewarmer.stats
+    assert (stats.seen, stats.cached) == (5, 2)
+    assert (stats.resolved, stats.missed, stats.errors) == (1, 1, 1)
+    assert sorted(searcher.searches) == ["Broken", "Found", "Missing"]
+    assert reports[-1] is stats
+    # Only the failed search is left to retry on the next run
+    await prewarmer.run(Track(title=t, artists=["Artist"]) for t in titles)
+    assert sorted(searcher.searches) == ["Broken", "Broken", "Found", "Missing"]
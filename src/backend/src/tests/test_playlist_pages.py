@@ -0,0 +1,76 @@
+"""Concurrent playlist page reads: order, growth and early close."""
+
+import asyncio
+import threading
+import time
+import pytest
+from backend.providers.spotify import PAGE_SIZE, SpotifyProvider
+
+
+class Client:
+    """``playlist_items`` over ``size`` tracks, reporting ``total`` as given."""
+
+    def __init__(self, size: int, total: int | None = None):
+        self.size = size
+        self.total = size if total is None else total
+        self.offsets: list[int] = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def playlist_items(self, playlist_id, offset, limit, fields):
+        self.offsets.append(offset)
+        if offset:
+            # Later pages finish first
+            time.sleep(0.05 / (offset // PAGE_SIZE))
+        if offset > PAGE_SIZE:
+            self.release.wait(5)
+        end = min(offset + limit, self.size)
+        items = [{"track": {"id": f"t{i}"}} for i in range(offset, end)]
+        return {"items": items, "total": self.total}
+
+
+def _provider(settings, client: Client) -> SpotifyProvider:
+    provider = SpotifyProvider(settings)
+    provider._client = client
+    return provider
+
+
+async def _read(provider: SpotifyProvider) -> list[str]:
+    return [
+        track_id
+        async for page in provider.iter_playlist_tracks("playlist")
+        for track_id in page
+    ]
+
+
+@pytest.mark.asyncio
+async def test_pages_completing_out_of_order_are_yielded_in_order(settings):
+    client = Client(5 * PAGE_SIZE + 20)
+    assert await _read(_provider(settings, client)) == [
+        f"t{i}" for i in range(client.size)
+    ]
+    assert sorted(client.offsets) == [i * PAGE_SIZE for i in range(6)]
+
+
+@pytest.mark.asyncio
+async def test_a_full_last_page_reads_on_until_a_short_one(settings):
+    # The playlist grew by a page and a half after the total was read
+    client = Client(3 * PAGE_SIZE + 50, total=2 * PAGE_SIZE)
+    track_ids = await _read(_provider(settings, client))
+    assert track_ids == [f"t{i}" for i in range(client.size)]
+
+
+@pytest.mark.asyncio
+async def test_closing_early_cancels_outstanding_reads(settings):
+    settings.spotify_page_concurrency = 3
+    client = Client(10 * PAGE_SIZE)
+    client.release.clear()
+    pages = _provider(settings, client).iter_playlist_tracks("playlist")
+    # The first page, then the first of the concurrent reads
+    assert len(await anext(pages)) == PAGE_SIZE
+    assert len(await anext(pages)) == PAGE_SIZE
+    await asyncio.sleep(0.05)
+    assert sorted(client.offsets) == [i * PAGE_SIZE for i in range(5)]
+    await pages.aclose()
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+    client.release.set()
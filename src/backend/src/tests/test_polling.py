@@ -0,0 +1,57 @@
+"""Adaptive polling intervals learned from each station's play rate."""
+
+import pytest
+from backend.services.polling import AdaptivePollingPolicy
+
+
+def _policy(**kwargs) -> AdaptivePollingPolicy:
+    defaults = dict(
+        initial_interval=60,
+        min_interval=10,
+        max_interval=600,
+        target_plays=5,
+        jitter=0,
+        smoothing=0.5,
+    )
+    return AdaptivePollingPolicy(**{**defaults, **kwargs})
+
+
+def test_interval_follows_the_smoothed_rate():
+    policy = _policy()
+    policy.record("st", 3, now=0)
+    # The first fetch only starts the clock
+    assert policy.interval("st") == 60
+    policy.record("st", 10, now=100)
+    assert policy.interval("st") == pytest.approx(50)
+    policy.record("st", 2, now=200)
+    # Rate is 0.5 * 0.02 + 0.5 * 0.1 plays per second
+    assert policy.interval("st") == pytest.approx(5 / 0.06)
+    assert policy.next_delay("st") == policy.interval("st")
+
+
+def test_empty_fetches_back_off():
+    policy = _policy(backoff_factor=2)
+    policy.record("st", 0, now=0)
+    policy.record("st", 0, now=60)
+    assert policy.interval("st") == 120
+    policy.record("st", 0, now=180)
+    assert policy.interval("st") == 240
+
+
+def test_a_full_window_at_least_divides_the_interval():
+    policy = _policy(backoff_factor=2)
+    policy.record("st", 0, now=0)
+    # One new play in 100s alone would suggest polling every 500s
+    policy.record("st", 1, window_full=True, now=100)
+    assert policy.interval("st") == 30
+
+
+def test_intervals_are_clamped():
+    policy = _policy()
+    policy.record("st", 0, now=0)
+    for now in range(100, 1000, 100):
+        policy.record("st", 0, now=now)
+    assert policy.interval("st") == 600
+    policy.record("st", 1000, now=1001)
+    assert policy.interval("st") == 10
+    assert _policy(initial_interval=1).interval("other") == 10
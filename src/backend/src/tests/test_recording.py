@@ -0,0 +1,57 @@
+"""Recording upstream HTTP traffic and replaying it without the network."""
+
+import httpx
+import pytest
+from backend.providers.recording import (
+    Cassette,
+    CassetteMissError,
+    RecordingTransport,
+    ReplayTransport,
+)
+
+
+def _upstream() -> httpx.MockTransport:
+    polls = 0
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        nonlocal polls
+        if request.url.path == "/api/token":
+            return httpx.Response(
+                200, json={"access_token": "secret", "expires_in": 60}
+            )
+        polls += 1
+        return httpx.Response(200, json={"poll": polls}, headers={"X-Poll": str(polls)})
+
+    return httpx.MockTransport(handle)
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay(tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    recording = RecordingTransport(Cassette(path, "record"), _upstream())
+    async with httpx.AsyncClient(transport=recording) as client:
+        token = await client.post(
+            "https://accounts.example/api/token",
+            headers={"Authorization": "Basic c2VjcmV0"},
+        )
+        # The caller still gets the live response
+        assert token.json()["access_token"] == "secret"
+        for _ in range(2):
+            await client.get("https://xm.example/recent?station=a&limit=5")
+
+    text = (tmp_path / "cassette.jsonl").read_text()
+    assert "secret" not in text and "c2VjcmV0" not in text
+
+    replay = ReplayTransport(Cassette(path, "replay"), speed=0)
+    async with httpx.AsyncClient(transport=replay) as client:
+        token = await client.post("https://accounts.example/api/token")
+        assert token.json() == {"access_token": "REDACTED", "expires_in": 60}
+        # Repeated requests replay in recorded order; query order does not matter
+        for poll in (1, 2):
+            response = await client.get("https://xm.example/recent?limit=5&station=a")
+            assert response.json() == {"poll": poll}
+            assert response.headers["X-Poll"] == str(poll)
+        with pytest.raises(CassetteMissError):
+            await client.get("https://xm.example/recent?limit=5&station=a")
+        with pytest.raises(CassetteMissError):
+            await client.get("https://xm.example/recent?station=b")
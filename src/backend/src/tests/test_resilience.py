@@ -0,0 +1,134 @@
+"""Circuit breaker and write-retry classification tests."""
+
+import asyncio
+import http.client
+import pytest
+import requests
+import spotipy
+import urllib3
+from backend.core.resilience import CircuitOpenError, ResiliencePolicy
+from backend.providers.spotify import _safe_to_retry
+
+
+def _policy(**kwargs) -> ResiliencePolicy:
+    defaults = dict(attempts=1, failure_threshold=1, reset_timeout=0.0, base_delay=0)
+    return ResiliencePolicy("test", **{**defaults, **kwargs})
+
+
+async def _fail():
+    raise RuntimeError("boom")
+
+
+async def _ok():
+    return "ok"
+
+
+@pytest.mark.asyncio
+async def test_half_open_lets_one_probe_through():
+    policy = _policy(reset_timeout=60.0)
+    with pytest.raises(RuntimeError):
+        await policy.call("ep", _fail)
+    breaker = policy.breaker("ep")
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        await policy.call("ep", _ok)
+
+    breaker._reset_timeout = 0.0
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    # The probe slot is taken until its outcome is recorded
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_reopens():
+    policy = _policy()
+    with pytest.raises(RuntimeError):
+        await policy.call("ep", _fail)
+    with pytest.raises(RuntimeError):
+        await policy.call("ep", _fail)
+    assert policy.breaker("ep").state != "closed"
+    assert await policy.call("ep", _ok) == "ok"
+    assert policy.breaker("ep").state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_frees_the_breaker():
+    policy = _policy()
+    with pytest.raises(RuntimeError):
+        await policy.call("ep", _fail)
+    started = asyncio.Event()
+
+    async def hang():
+        started.set()
+        await asyncio.sleep(3600)
+
+    probe = asyncio.create_task(policy.call("ep", hang))
+    await started.wait()
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    breaker = policy.breaker("ep")
+    # Cancellation is neither success nor failure: still half-open, slot free
+    assert breaker.state == "half_open"
+    assert await policy.call("ep", _ok) == "ok"
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_writes_retry_only_when_safe():
+    calls = 0
+
+    async def dropped_after_send():
+        nonlocal calls
+        calls += 1
+        raise requests.exceptions.ConnectionError(
+            urllib3.exceptions.ProtocolError(
+                "Connection aborted.", http.client.RemoteDisconnected("closed")
+            )
+        )
+
+    policy = _policy(attempts=3, failure_threshold=10, safe_to_retry=_safe_to_retry)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        await policy.call("write", dropped_after_send, idempotent=False)
+    assert calls == 1
+
+
+def test_connect_failures_are_safe_to_retry():
+    # Shaped as requests raises a refused connection
+    refused = requests.exceptions.ConnectionError(
+        urllib3.exceptions.MaxRetryError(
+            None,
+            "/v1/playlists",
+            urllib3.exceptions.NewConnectionError(None, "Connection refused"),
+        )
+    )
+    assert _safe_to_retry(refused)
+    assert _safe_to_retry(
+        requests.exceptions.ConnectionError(
+            urllib3.exceptions.NewConnectionError(None, "Connection refused")
+        )
+    )
+    assert _safe_to_retry(requests.exceptions.ConnectTimeout())
+
+
+def test_errors_after_send_are_not_safe_to_retry():
+    disconnected = requests.exceptions.ConnectionError(
+        urllib3.exceptions.ProtocolError(
+            "Connection aborted.", http.client.RemoteDisconnected("closed")
+        )
+    )
+    assert not _safe_to_retry(disconnected)
+    assert not _safe_to_retry(requests.exceptions.ReadTimeout())
+
+
+def test_status_codes_safe_to_retry():
+    assert _safe_to_retry(spotipy.SpotifyException(429, -1, "slow down"))
+    assert _safe_to_retry(
+        spotipy.SpotifyException(503, -1, "busy", headers={"Retry-After": "2"})
+    )
+    assert not _safe_to_retry(spotipy.SpotifyException(503, -1, "busy"))
+    assert not _safe_to_retry(spotipy.SpotifyException(500, -1, "error"))
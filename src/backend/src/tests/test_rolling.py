@@ -0,0 +1,153 @@
+"""Rolling playlists: append new plays, trim the oldest, skip what stays."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+import pytest
+from backend.models import PlaylistSnapshot, SpotifyTrack, Track
+from backend.services.sync_service import SyncService
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class Station:
+    def __init__(self):
+        self.plays: list[Track] = []
+
+    def play(self, *titles: str) -> None:
+        for title in titles:
+            self.plays.insert(
+                0,
+                Track(
+                    title=title,
+                    artists=["Artist"],
+                    timestamp=T0 + timedelta(minutes=len(self.plays)),
+                ),
+            )
+
+    async def get_recent_tracks(self, station: str, limit: int = 50) -> list[Track]:
+        return self.plays[:limit]
+
+
+class Playlist:
+    """Resolves each title to itself and keeps entries in position order."""
+
+    def __init__(self, tracks: list[str]):
+        self.tracks = tracks
+
+    async def search_tracks(self, title: str, artist: str) -> list[SpotifyTrack]:
+        return [
+            SpotifyTrack(
+                track=Track(title=title, artists=[artist]),
+                spotify_id=title,
+                spotify_uri=f"spotify:track:{title}",
+            )
+        ]
+
+    async def get_playlist_snapshot(self, playlist_id: str) -> PlaylistSnapshot:
+        return PlaylistSnapshot(snapshot_id="snap", track_ids=list(self.tracks))
+
+    async def remove_playlist_positions(self, playlist_id, positions, snapshot_id):
+        gone = {p for ps in positions.values() for p in ps}
+        self.tracks = [t for p, t in enumerate(self.tracks) if p not in gone]
+        return snapshot_id
+
+    async def add_tracks_to_playlist(self, playlist_id, track_ids) -> bool:
+        self.tracks += track_ids
+        return True
+
+
+@pytest.fixture
+def rolling(settings):
+    settings.playlist_mode = "rolling"
+    settings.rolling_playlist_size = 3
+    settings.match_revalidate_calls_per_hour = 0
+    return settings
+
+
+async def _sync(rolling, station: Station, playlist: Playlist) -> dict:
+    result = await SyncService(station, playlist, rolling).sync()
+    assert result["success"], result
+    return result
+
+
+@pytest.mark.asyncio
+async def test_new_plays_are_appended_and_the_oldest_trimmed(rolling):
+    station, playlist = Station(), Playlist(["A", "B"])
+    station.play("C", "D")
+    result = await _sync(rolling, station, playlist)
+    assert playlist.tracks == ["B", "C", "D"]
+    assert result["tracks_added"] == 2
+
+
+@pytest.mark.asyncio
+async def test_replay_of_a_surviving_entry_is_skipped(rolling):
+    station, playlist = Station(), Playlist(["A", "B", "C"])
+    station.play("B")
+    result = await _sync(rolling, station, playlist)
+    assert playlist.tracks == ["A", "B", "C"]
+    assert result["tracks_skipped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_replay_of_an_entry_the_trim_removes_is_appended(rolling):
+    station, playlist = Station(), Playlist(["A", "B", "C"])
+    station.play("D", "A")
+    result = await _sync(rolling, station, playlist)
+    # Adding D trims A, so the newest play must not be skipped as present
+    assert playlist.tracks == ["C", "D", "A"]
+    assert result["tracks_skipped"] == 0
+
+
+@pytest.mark.asyncio
+async def test_plays_of_a_failed_run_are_found_again(rolling):
+    class Broken(Playlist):
+        async def get_playlist_snapshot(self, playlist_id: str) -> PlaylistSnapshot:
+            raise RuntimeError("breaker open")
+
+    station, playlist = Station(), Playlist(["A", "B"])
+    station.play("C")
+    service = SyncService(station, Broken(playlist.tracks), rolling)
+    assert not (await service.sync())["success"]
+
+    # Same service and state: the failed run left the play unseen
+    service._music_provider = playlist
+    assert (await service.sync())["success"]
+    assert playlist.tracks == ["A", "B", "C"]
+
+
+@pytest.mark.asyncio
+async def test_plays_left_at_the_deadline_are_found_again(rolling):
+    class Slow(Playlist):
+        async def search_tracks(self, title: str, artist: str) -> list[SpotifyTrack]:
+            await asyncio.sleep(0.1)
+            return await super().search_tracks(title, artist)
+
+    rolling.sync_deadline = 0.05
+    station, playlist = Station(), Slow(["A", "B"])
+    station.play("C", "D")
+    service = SyncService(station, playlist, rolling)
+    result = await service.sync()
+    assert playlist.tracks == ["A", "B", "C"]
+    assert result["tracks_dropped"] == 1
+
+    rolling.sync_deadline = 0
+    assert (await service.sync())["success"]
+    assert playlist.tracks == ["B", "C", "D"]
+
+
+@pytest.mark.asyncio
+async def test_losing_the_run_lock_stops_the_writes(rolling):
+    class Stalled(Playlist):
+        async def search_tracks(self, title: str, artist: str) -> list[SpotifyTrack]:
+            # Another process takes the lock over while this run searches
+            service._state._conn.execute("UPDATE leases SET owner = 'other'")
+            await asyncio.sleep(0.1)
+            return await super().search_tracks(title, artist)
+
+    rolling.state_lease_ttl = 0.15
+    station, playlist = Station(), Stalled(["A", "B"])
+    station.play("C")
+    service = SyncService(station, playlist, rolling)
+    result = await service.sync()
+    assert not result["success"]
+    assert playlist.tracks == ["A", "B"]
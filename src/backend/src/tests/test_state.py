@@ -0,0 +1,109 @@
+"""Shared state store: atomic updates, leases, and never blocking the loop."""
+
+import asyncio
+import sqlite3
+import time
+import pytest
+from backend.services.state import Lease, LeaseLostError, StateStore
+
+
+@pytest.fixture(params=["memory", "file"])
+def store(request, tmp_path):
+    path = str(tmp_path / "state.db") if request.param == "file" else ""
+    store = StateStore(path)
+    yield store
+    store.close()
+
+
+def _increment(doc: dict) -> dict:
+    return {"n": doc.get("n", 0) + 1}
+
+
+@pytest.mark.asyncio
+async def test_updates_are_versioned(store):
+    assert store.get("doc") == (0, None)
+    assert await store.update("doc", _increment) == 1
+    assert await store.update("doc", _increment) == 2
+    assert store.get("doc") == (2, {"n": 2})
+    assert store.version("doc") == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_updates_from_two_processes_are_not_lost(tmp_path):
+    path = str(tmp_path / "state.db")
+    first, second = StateStore(path), StateStore(path)
+    await asyncio.gather(
+        *(store.update("doc", _increment) for store in [first, second] * 20)
+    )
+    assert first.get("doc") == (40, {"n": 40})
+    first.close()
+    second.close()
+
+
+@pytest.mark.asyncio
+async def test_leases(store):
+    mine, theirs = Lease(store, "job", ttl=0.2), Lease(store, "job", ttl=0.2)
+    assert await mine.acquire()
+    assert not await theirs.acquire()
+    assert store.holder("job") == mine.owner
+    await mine.release()
+    assert store.holder("job") is None
+    assert await theirs.acquire()
+
+    # A holder that stops renewing loses the lease once it expires
+    await asyncio.sleep(0.25)
+    assert await mine.acquire()
+
+
+@pytest.mark.asyncio
+async def test_renewing_outlives_the_ttl_then_releases(store):
+    lease = Lease(store, "job", ttl=0.15)
+    assert await lease.acquire()
+    async with lease.renewing():
+        await asyncio.sleep(0.4)
+        assert store.holder("job") == lease.owner
+    assert store.holder("job") is None
+    assert not lease.held
+
+
+@pytest.mark.asyncio
+async def test_renewing_notices_a_lost_lease(store):
+    lease = Lease(store, "job", ttl=0.15)
+    assert await lease.acquire()
+    async with lease.renewing():
+        lease.check()
+        # Another holder took over, e.g. after this one stalled past the TTL
+        store._conn.execute("UPDATE leases SET owner = 'other'")
+        await asyncio.sleep(0.1)
+        assert not lease.held
+        with pytest.raises(LeaseLostError):
+            lease.check()
+    # Leaving the block does not release the other holder's lease
+    assert store.holder("job") == "other"
+
+
+@pytest.mark.asyncio
+async def test_a_busy_database_does_not_block_the_loop(tmp_path):
+    path = str(tmp_path / "state.db")
+    store = StateStore(path, busy_timeout=5.0)
+    await store.update("doc", _increment)
+    # Another process holds the write lock
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+
+    update = asyncio.create_task(store.update("doc", _increment))
+    started = time.monotonic()
+    ticks = 0
+    while time.monotonic() - started < 0.3:
+        await asyncio.sleep(0.01)
+        ticks += 1
+    # The loop kept running, and reads answered from the last commit
+    assert ticks > 10
+    assert not update.done()
+    assert store.get("doc") == (1, {"n": 1})
+    assert store.holder("job") is None
+
+    other.execute("COMMIT")
+    assert await update == 2
+    other.close()
+    store.close()
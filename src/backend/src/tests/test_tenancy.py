@@ -0,0 +1,93 @@
+"""Fair sharing of Spotify calls and eviction of inactive tenants."""
+
+import asyncio
+import time
+import pytest
+from backend.core.fairness import FairShareLimiter
+from backend.models import TenantConfig
+from backend.providers import SpotifyProvider
+from backend.services.tenancy import TenantRegistry
+
+
+@pytest.mark.asyncio
+async def test_freed_slots_go_round_robin_across_tenants():
+    limiter = FairShareLimiter(1)
+    order: list[str] = []
+    release = asyncio.Event()
+
+    async def call(tenant_id: str) -> None:
+        async with limiter.slot(tenant_id):
+            order.append(tenant_id)
+            await release.wait()
+
+    holder = asyncio.create_task(call("busy"))
+    await asyncio.sleep(0)
+    # The busy tenant queues three more calls before the quiet one queues one
+    waiters = [asyncio.create_task(call(t)) for t in ["busy"] * 3 + ["quiet"]]
+    await asyncio.sleep(0)
+    assert limiter.queued() == {"busy": 3, "quiet": 1}
+
+    release.set()
+    await asyncio.gather(holder, *waiters)
+    assert order == ["busy", "busy", "quiet", "busy", "busy"]
+    assert limiter.queued() == {}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiters_give_up_their_turn():
+    limiter = FairShareLimiter(1)
+    async with limiter.slot("a"):
+        waiter = asyncio.create_task(limiter._acquire("b"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.queued() == {}
+    # The slot came back rather than going to the cancelled waiter
+    async with asyncio.timeout(1), limiter.slot("c"):
+        pass
+
+
+@pytest.fixture
+def registry(settings, monkeypatch) -> TenantRegistry:
+    async def no_refresh(self) -> None:
+        pass
+
+    monkeypatch.setattr(SpotifyProvider, "start_token_refresh", no_refresh)
+    settings.max_active_tenants = 2
+    settings.tenant_idle_ttl = 60
+    tenants = [
+        TenantConfig(
+            id=tenant_id,
+            spotify_refresh_token=f"token-{tenant_id}",
+            spotify_playlist_id=f"playlist-{tenant_id}",
+        )
+        for tenant_id in "abc"
+    ]
+    return TenantRegistry(tenants, object(), settings)
+
+
+def _active(registry: TenantRegistry) -> list[str]:
+    return list(registry._active)
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_tenant_is_evicted(registry):
+    first = await registry.get_service("a")
+    await registry.get_service("b")
+    assert await registry.get_service("a") is first
+    await registry.get_service("c")
+    assert _active(registry) == ["a", "c"]
+    # An evicted tenant still answers status from the state store
+    assert (await registry.get_status("b"))["total_syncs"] == 0
+
+
+@pytest.mark.asyncio
+async def test_idle_tenants_are_evicted(registry):
+    await registry.get_service("a")
+    await registry.get_service("b")
+    registry._active["a"].last_used = time.monotonic() - 61
+    await registry.evict_idle()
+    assert _active(registry) == ["b"]
+    await registry.stop()
+    assert registry.active_count == 0
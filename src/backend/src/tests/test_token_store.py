@@ -0,0 +1,50 @@
+"""Encrypted token files: salted key derivation and carrying old files over."""
+
+import base64
+import hashlib
+import json
+from cryptography.fernet import Fernet
+from backend.providers.token_store import (
+    EncryptedFileCacheHandler,
+    derive_key,
+    load_salt,
+    token_cache_keys,
+)
+
+TOKEN = {"access_token": "a", "refresh_token": "r", "expires_at": 1}
+
+
+def _handler(path, keys: list[bytes]) -> EncryptedFileCacheHandler:
+    return EncryptedFileCacheHandler(str(path), keys, "r", "client-id", "secret")
+
+
+def test_salt_is_created_once_and_private(tmp_path):
+    path = tmp_path / "token.salt"
+    salt = load_salt(str(path))
+    assert len(salt) == 16
+    assert load_salt(str(path)) == salt
+    assert path.stat().st_mode & 0o777 == 0o600
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_keys_depend_on_the_salt(tmp_path):
+    assert derive_key("secret", b"one") != derive_key("secret", b"two")
+    first = token_cache_keys("secret", str(tmp_path / "a.salt"))[0]
+    second = token_cache_keys("secret", str(tmp_path / "b.salt"))[0]
+    assert first != second
+    assert first == token_cache_keys("secret", str(tmp_path / "a.salt"))[0]
+
+
+def test_unsalted_token_files_carry_over(tmp_path):
+    path = tmp_path / "token"
+    legacy = base64.urlsafe_b64encode(hashlib.sha256(b"secret").digest())
+    path.write_bytes(Fernet(legacy).encrypt(json.dumps(TOKEN).encode()))
+
+    keys = token_cache_keys("secret", str(tmp_path / "token.salt"))
+    handler = _handler(path, keys)
+    assert handler.get_cached_token() == TOKEN
+    # The next save re-encrypts under the derived key alone
+    handler.save_token_to_cache({**TOKEN, "access_token": "b"})
+    current = json.loads(Fernet(keys[0]).decrypt(path.read_bytes()))
+    assert current["access_token"] == "b"
+    assert _handler(path, keys[:1]).get_cached_token() == current
@@ -0,0 +1,102 @@
+"""Cached DNS failover and proxy handling in the shared HTTP pools."""
+
+import socket
+import threading
+import httpx
+import pytest
+import requests
+from backend.providers import transport
+from backend.providers.transport import DnsCache, PooledAdapter, PooledTransport
+
+# Nothing listens on 127.0.0.2, so connecting there is refused at once
+_DEAD = "127.0.0.2"
+_LIVE = "127.0.0.3"
+
+
+class _Server:
+    """Accepts connections, records the first bytes and answers 204."""
+
+    def __init__(self, host: str = _LIVE):
+        self.requests: list[bytes] = []
+        self._sock = socket.create_server((host, 0))
+        self.port = self._sock.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            with conn:
+                self.requests.append(conn.recv(4096))
+                conn.sendall(b"HTTP/1.1 204 No Content\r\nConnection: close\r\n\r\n")
+
+    def close(self) -> None:
+        self._sock.close()
+
+
+@pytest.fixture
+def server():
+    server = _Server()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def dns(monkeypatch, server) -> DnsCache:
+    cache = DnsCache(ttl=60.0)
+    infos = [
+        (None, None, None, "", (address, server.port)) for address in (_DEAD, _LIVE)
+    ]
+    cache._put("upstream.test", server.port, infos)
+    monkeypatch.setattr(transport, "_dns", cache)
+    for name in ("HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY", "NO_PROXY"):
+        monkeypatch.delenv(name, raising=False)
+        monkeypatch.delenv(name.lower(), raising=False)
+    return cache
+
+
+def test_failed_address_moves_to_the_back():
+    cache = DnsCache(ttl=60.0)
+    infos = [(None, None, None, "", (address, 443)) for address in "abc"]
+    assert cache._put("host", 443, infos) == ["a", "b", "c"]
+    cache.failed("host", 443, "a")
+    assert cache.resolve("host", 443) == ["b", "c", "a"]
+    cache.forget("host", 443)
+    assert cache._get("host", 443) is None
+
+
+@pytest.mark.asyncio
+async def test_async_pool_tries_the_next_address(settings, server, dns):
+    pool = PooledTransport(settings)
+    url = f"http://upstream.test:{server.port}/"
+    async with httpx.AsyncClient(transport=pool) as client:
+        response = await client.get(url)
+    await pool.close_pool()
+    assert response.status_code == 204
+    assert dns.resolve("upstream.test", server.port) == [_LIVE, _DEAD]
+
+
+def test_requests_pool_tries_the_next_address(settings, server, dns):
+    session = requests.Session()
+    session.mount("http://", PooledAdapter(settings))
+    response = session.get(f"http://upstream.test:{server.port}/", timeout=5)
+    session.close()
+    assert response.status_code == 204
+    assert dns.resolve("upstream.test", server.port) == [_LIVE, _DEAD]
+
+
+@pytest.mark.asyncio
+async def test_async_pool_keeps_environment_proxies(settings, monkeypatch, server, dns):
+    monkeypatch.setenv("HTTP_PROXY", f"http://{_LIVE}:{server.port}")
+    monkeypatch.setenv("NO_PROXY", "exempt.test")
+    pool = PooledTransport(settings)
+    async with httpx.AsyncClient(transport=pool) as client:
+        response = await client.get("http://upstream.test/path")
+        with pytest.raises(httpx.ConnectError):
+            # Exempt hosts connect directly, and this one does not resolve
+            await client.get("http://exempt.test/")
+    await pool.close_pool()
+    assert response.status_code == 204
+    assert server.requests[0].startswith(b"GET http://upstream.test/path ")
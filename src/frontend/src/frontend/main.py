@@ -3,12 +3,19 @@
 import os
 import requests
 from flask import Flask, render_template, jsonify
+from requests.adapters import HTTPAdapter
 
 API_URL = os.getenv("API_URL", "http://localhost:22112")
 FRONTEND_PORT = int(os.getenv("FRONTEND_PORT", "22111"))
+API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "10"))
 
 app = Flask(__name__)
 
+# One keep-alive pool for every proxied call, sized for Flask's request threads
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_maxsize=API_POOL_SIZE))
+session.mount("https://", HTTPAdapter(pool_maxsize=API_POOL_SIZE))
+
 
 @app.route("/")
 def index():
@@ -23,7 +30,7 @@ def health():
 @app.route("/api/status")
 def api_status():
     try:
-        response = requests.get(f"{API_URL}/api/v1/status", timeout=5)
+        response = session.get(f"{API_URL}/api/v1/status", timeout=5)
         return jsonify(response.json()), response.status_code
     except Exception as e:
         return jsonify({"error": str(e)}), 503
@@ -32,7 +39,7 @@ def api_status():
 @app.route("/api/sync", methods=["POST"])
 def api_sync():
     try:
-        response = requests.post(f"{API_URL}/api/v1/sync", timeout=60)
+        response = session.post(f"{API_URL}/api/v1/sync", timeout=60)
         return jsonify(response.json()), response.status_code
     except Exception as e:
         return jsonify({"error": str(e)}), 503
@@ -41,7 +48,7 @@ def api_sync():
 @app.route("/api/tracks")
 def api_tracks():
     try:
-        response = requests.get(f"{API_URL}/api/v1/tracks", timeout=10)
+        response = session.get(f"{API_URL}/api/v1/tracks", timeout=10)
         return jsonify(response.json()), response.status_code
     except Exception as e:
         return jsonify({"error": str(e)}), 503